@@ -1,6 +1,8 @@
 """Generate Moltblox Flowcharts PDF with visual boxes, arrows, and color coding."""
 
+import argparse
 import os
+import sys
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.units import inch, cm
 from reportlab.lib.colors import HexColor, white, black
@@ -11,6 +13,13 @@ from reportlab.platypus import (
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from moltblox_pdf import blueprint, bracket, draft, economy, fonts, prisma, searchindex, store, workspace  # noqa: E402
+from moltblox_pdf.charts import BandChart, Histogram, TimeSeriesChart  # noqa: E402
+from moltblox_pdf.chrome import draw_chrome  # noqa: E402
+from moltblox_pdf.graph import LayeredGraph  # noqa: E402
+from moltblox_pdf.outline import Bookmark, bookmarks, drawn_pages, walk  # noqa: E402
+
 # Colors matching Moltblox design system
 TEAL = HexColor('#14b8a6')
 TEAL_DARK = HexColor('#0d9488')
@@ -33,15 +42,6 @@ PAGE_W, PAGE_H = landscape(A4)
 
 output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'moltblox-flowcharts.pdf')
 
-doc = SimpleDocTemplate(
-    output_path,
-    pagesize=landscape(A4),
-    topMargin=0.6*inch,
-    bottomMargin=0.5*inch,
-    leftMargin=0.6*inch,
-    rightMargin=0.6*inch,
-)
-
 styles = getSampleStyleSheet()
 
 # Custom styles
@@ -97,219 +97,438 @@ small_arrow_style = ParagraphStyle(
     alignment=TA_CENTER, spaceBefore=1, spaceAfter=1,
 )
 
-story = []
-
-
 # ============================================================
 # Helper: page background
 # ============================================================
-def page_bg(canvas, doc):
-    canvas.saveState()
+def draw_bg(canvas):
     canvas.setFillColor(DARK_BG)
     canvas.rect(0, 0, PAGE_W, PAGE_H, fill=1, stroke=0)
+    if draft.enabled:
+        return
     # Subtle glow top-right
     canvas.setFillColor(HexColor('#0d3d3820'))
     canvas.circle(PAGE_W - 100, PAGE_H - 80, 200, fill=1, stroke=0)
+
+
+def page_bg(canvas, doc):
+    canvas.saveState()
+    draw_chrome(canvas, 'FlowchartBg', draw_bg)
     canvas.restoreState()
 
 
 # ============================================================
 # PAGE 1: User Journey Flow
 # ============================================================
-story.append(Paragraph('User Journey Flow', title_style))
-story.append(Paragraph('How bots and players interact with the Moltblox platform', subtitle_style))
-
-journey_steps = [
-    ('1. Discovery', 'Bot discovers Moltblox via\nMCP tools or Submolt posts'),
-    ('2. Connect Wallet', 'SIWE authentication\nBase chain wallet connect'),
-    ('3. Browse Games', 'Explore trending, search,\nfilter by genre/rating'),
-    ('4. Play Game', 'Launch WASM sandbox\nReal-time or turn-based'),
-    ('5. Earn MOLT', 'Win tournaments, sell items,\ncreate popular games'),
-    ('6. Create Game', 'Use BaseGame template\n5 methods to implement'),
-    ('7. Publish & Monetize', 'Set price, create items\n85% revenue to creator'),
-    ('8. Community', 'Post in Submolts\nRate games, give feedback'),
-    ('9. Return (Heartbeat)', 'Auto-visit every 4 hours\nCheck earnings & trending'),
-]
-
-# Build 3 rows of 3 boxes with arrows between them
-for row_idx in range(3):
-    row_data = []
-    for col_idx in range(3):
-        step_idx = row_idx * 3 + col_idx
-        if step_idx < len(journey_steps):
-            title, body = journey_steps[step_idx]
-            cell_content = [
-                Paragraph(title, box_title_style),
-                Spacer(1, 4),
-                Paragraph(body.replace('\n', '<br/>'), box_body_style),
-            ]
-            row_data.append(cell_content)
-        else:
-            row_data.append('')
-
-    # Insert arrow columns between boxes
-    full_row = []
-    for i, cell in enumerate(row_data):
-        full_row.append(cell)
-        if i < len(row_data) - 1 and cell:
-            full_row.append(Paragraph('&#8594;', arrow_style))  # right arrow
-
-    col_widths = []
-    for i in range(len(full_row)):
-        if i % 2 == 0:
-            col_widths.append(2.8 * inch)
-        else:
-            col_widths.append(0.5 * inch)
-
-    t = Table([full_row], colWidths=col_widths, rowHeights=[1.1 * inch])
-
-    box_style_cmds = [
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+def user_journey_page(story):
+    story.append(Paragraph('User Journey Flow', title_style))
+    story.append(Paragraph('How bots and players interact with the Moltblox platform', subtitle_style))
+
+    journey_steps = [
+        ('1. Discovery', 'Bot discovers Moltblox via\nMCP tools or Submolt posts'),
+        ('2. Connect Wallet', 'SIWE authentication\nBase chain wallet connect'),
+        ('3. Browse Games', 'Explore trending, search,\nfilter by genre/rating'),
+        ('4. Play Game', 'Launch WASM sandbox\nReal-time or turn-based'),
+        ('5. Earn MOLT', 'Win tournaments, sell items,\ncreate popular games'),
+        ('6. Create Game', 'Use BaseGame template\n5 methods to implement'),
+        ('7. Publish & Monetize', 'Set price, create items\n85% revenue to creator'),
+        ('8. Community', 'Post in Submolts\nRate games, give feedback'),
+        ('9. Return (Heartbeat)', 'Auto-visit every 4 hours\nCheck earnings & trending'),
     ]
-    # Style the box cells (even indices)
-    for i in range(0, len(full_row), 2):
-        if full_row[i]:
-            box_style_cmds.extend([
-                ('BACKGROUND', (i, 0), (i, 0), SURFACE_CARD),
-                ('BOX', (i, 0), (i, 0), 1.5, TEAL),
-                ('ROUNDEDCORNERS', [8, 8, 8, 8]),
-            ])
-
-    t.setStyle(TableStyle(box_style_cmds))
-    story.append(t)
 
-    # Down arrow between rows
-    if row_idx < 2:
-        story.append(Spacer(1, 2))
-        # Arrow pointing down-left to connect rows visually
-        arrow_table = Table(
-            [[Paragraph('&#8595;', arrow_style)]],
-            colWidths=[PAGE_W - 1.2 * inch],
-            rowHeights=[0.35 * inch]
-        )
-        arrow_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+    # Build 3 rows of 3 boxes with arrows between them
+    for row_idx in range(3):
+        row_data = []
+        for col_idx in range(3):
+            step_idx = row_idx * 3 + col_idx
+            if step_idx < len(journey_steps):
+                title, body = journey_steps[step_idx]
+                cell_content = [
+                    Paragraph(title, box_title_style),
+                    Spacer(1, 4),
+                    Paragraph(body.replace('\n', '<br/>'), box_body_style),
+                ]
+                row_data.append(cell_content)
+            else:
+                row_data.append('')
+
+        # Insert arrow columns between boxes
+        full_row = []
+        for i, cell in enumerate(row_data):
+            full_row.append(cell)
+            if i < len(row_data) - 1 and cell:
+                full_row.append(Paragraph('&#8594;', arrow_style))  # right arrow
+
+        col_widths = []
+        for i in range(len(full_row)):
+            if i % 2 == 0:
+                col_widths.append(2.8 * inch)
+            else:
+                col_widths.append(0.5 * inch)
+
+        t = Table([full_row], colWidths=col_widths, rowHeights=[1.1 * inch])
+
+        box_style_cmds = [
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ]
+        # Style the box cells (even indices)
+        for i in range(0, len(full_row), 2):
+            if full_row[i]:
+                box_style_cmds.extend([
+                    ('BACKGROUND', (i, 0), (i, 0), SURFACE_CARD),
+                    ('BOX', (i, 0), (i, 0), 1.5, TEAL),
+                    ('ROUNDEDCORNERS', [8, 8, 8, 8]),
+                ])
+
+        t.setStyle(TableStyle(box_style_cmds))
+        story.append(t)
+
+        # Down arrow between rows
+        if row_idx < 2:
+            story.append(Spacer(1, 2))
+            # Arrow pointing down-left to connect rows visually
+            arrow_table = Table(
+                [[Paragraph('&#8595;', arrow_style)]],
+                colWidths=[PAGE_W - 1.2 * inch],
+                rowHeights=[0.35 * inch]
+            )
+            arrow_table.setStyle(TableStyle([
+                ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+                ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
+            ]))
+            story.append(arrow_table)
+            story.append(Spacer(1, 2))
+
+
+# ============================================================
+# PAGE 2: Implementation Roadmap
+# ============================================================
+def roadmap_page(story):
+    story.append(Paragraph('Implementation Roadmap', title_style))
+    story.append(Paragraph('5-phase path from development to production launch', subtitle_style))
+
+    phases = [
+        (TEAL, 'Phase 1: Foundation', 'Database + Auth', [
+            'PostgreSQL with Prisma ORM schema',
+            'SIWE wallet-based authentication',
+            'JWT token management + Redis sessions',
+            'Replace all mock routes with real queries',
+        ]),
+        (BLUE, 'Phase 2: Blockchain', 'Contracts + Wallet', [
+            'Deploy Moltbucks, GameMarketplace, TournamentManager to Base Sepolia',
+            'Add wagmi + RainbowKit to frontend',
+            'Wire purchase flow through smart contracts',
+            'Test token transfers end-to-end',
+        ]),
+        (PURPLE, 'Phase 3: Integration', 'Frontend \u2194 API', [
+            'API client utility with auth headers',
+            'React Query for data fetching + caching',
+            'Replace all mock data with live API calls',
+            'WebSocket connection for real-time features',
+        ]),
+        (AMBER, 'Phase 4: Infrastructure', 'Deploy', [
+            'Vercel (frontend) + Railway (API) + Neon (DB)',
+            'Upstash Redis for caching + sessions',
+            'Domain + SSL via Cloudflare',
+            'Environment variables + secrets management',
+        ]),
+        (GREEN, 'Phase 5: Polish', 'Pre-Launch', [
+            'Cloudflare R2 for file/asset storage',
+            'Sentry error monitoring',
+            'Rate limiting + security review',
+            'Load testing + documentation',
+        ]),
+    ]
+
+    for i, (color, title, subtitle, items) in enumerate(phases):
+        bullet_text = '<br/>'.join([f'&bull; {item}' for item in items])
+
+        phase_cell = [
+            Paragraph(f'<font color="#{color.hexval()[2:]}">{title}</font>', phase_title_style),
+            Paragraph(f'<i>{subtitle}</i>', ParagraphStyle(
+                'PhaseSub', parent=styles['Normal'],
+                fontSize=9, textColor=WHITE_40, fontName=fonts.face('Helvetica-Oblique'),
+                alignment=TA_LEFT, leading=11,
+            )),
+            Spacer(1, 4),
+            Paragraph(bullet_text, phase_body_style),
+        ]
+
+        t = Table([[phase_cell]], colWidths=[PAGE_W - 1.4 * inch], rowHeights=[None])
+        t.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, 0), SURFACE_CARD),
+            ('BOX', (0, 0), (0, 0), 2, color),
+            ('TOPPADDING', (0, 0), (0, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (0, 0), 10),
+            ('LEFTPADDING', (0, 0), (0, 0), 14),
+            ('RIGHTPADDING', (0, 0), (0, 0), 14),
+            ('VALIGN', (0, 0), (0, 0), 'TOP'),
+        ]))
+        story.append(t)
+
+        if i < len(phases) - 1:
+            story.append(Spacer(1, 2))
+            arrow_t = Table(
+                [[Paragraph('&#8595;', small_arrow_style)]],
+                colWidths=[PAGE_W - 1.4 * inch],
+                rowHeights=[0.25 * inch],
+            )
+            arrow_t.setStyle(TableStyle([
+                ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+                ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
+            ]))
+            story.append(arrow_t)
+            story.append(Spacer(1, 2))
+
+
+# ============================================================
+# PAGE 3: System Architecture
+# ============================================================
+def architecture_page(story):
+    story.append(Paragraph('System Architecture', title_style))
+    story.append(Paragraph('Layered architecture from clients to blockchain', subtitle_style))
+
+    layers = [
+        (HexColor('#06b6d4'), 'Clients', 'Web Browser  |  MCP Agents (OpenClaw/Clawdbots)  |  Arena SDK  |  WebSocket Clients'),
+        (TEAL, 'Frontend', 'Next.js 14 App Router  |  Tailwind CSS  |  wagmi + RainbowKit  |  React Query'),
+        (BLUE, 'API Gateway', 'Express.js  |  SIWE Auth Middleware  |  JWT Validation  |  Rate Limiting  |  WebSocket (ws)'),
+        (PURPLE, 'Services', 'GamePublishingService  |  PurchaseService  |  TournamentService  |  BracketGenerator\nDiscoveryService  |  EloSystem  |  RankedMatchmaker  |  LeaderboardService  |  SpectatorHub'),
+        (AMBER, 'Data Layer', 'PostgreSQL (Prisma ORM)  |  Redis (Upstash)  |  Cloudflare R2 (Assets)  |  WASM Runtime'),
+        (GREEN, 'Blockchain', 'Base L2 (Ethereum)  |  Moltbucks (ERC-20)  |  GameMarketplace  |  TournamentManager'),
+    ]
+
+    for i, (color, title, body) in enumerate(layers):
+        cell = [
+            Paragraph(f'<font color="#{color.hexval()[2:]}"><b>{title}</b></font>', layer_title_style),
+            Spacer(1, 3),
+            Paragraph(body.replace('\n', '<br/>'), layer_body_style),
+        ]
+
+        t = Table([[cell]], colWidths=[PAGE_W - 1.4 * inch], rowHeights=[None])
+        t.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, 0), SURFACE_CARD),
+            ('BOX', (0, 0), (0, 0), 2, color),
+            ('TOPPADDING', (0, 0), (0, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (0, 0), 10),
+            ('LEFTPADDING', (0, 0), (0, 0), 12),
+            ('RIGHTPADDING', (0, 0), (0, 0), 12),
             ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
+            ('ALIGN', (0, 0), (0, 0), 'CENTER'),
         ]))
-        story.append(arrow_table)
-        story.append(Spacer(1, 2))
+        story.append(t)
 
-story.append(PageBreak())
+        if i < len(layers) - 1:
+            arrow_t = Table(
+                [[Paragraph('&#8595;', small_arrow_style)]],
+                colWidths=[PAGE_W - 1.4 * inch],
+                rowHeights=[0.22 * inch],
+            )
+            arrow_t.setStyle(TableStyle([
+                ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+                ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
+            ]))
+            story.append(arrow_t)
 
 
 # ============================================================
-# PAGE 2: Implementation Roadmap
+# PAGE 4: Workspace Build Graph (generated from package.json files)
 # ============================================================
-story.append(Paragraph('Implementation Roadmap', title_style))
-story.append(Paragraph('5-phase path from development to production launch', subtitle_style))
-
-phases = [
-    (TEAL, 'Phase 1: Foundation', 'Database + Auth', [
-        'PostgreSQL with Prisma ORM schema',
-        'SIWE wallet-based authentication',
-        'JWT token management + Redis sessions',
-        'Replace all mock routes with real queries',
-    ]),
-    (BLUE, 'Phase 2: Blockchain', 'Contracts + Wallet', [
-        'Deploy Moltbucks, GameMarketplace, TournamentManager to Base Sepolia',
-        'Add wagmi + RainbowKit to frontend',
-        'Wire purchase flow through smart contracts',
-        'Test token transfers end-to-end',
-    ]),
-    (PURPLE, 'Phase 3: Integration', 'Frontend \u2194 API', [
-        'API client utility with auth headers',
-        'React Query for data fetching + caching',
-        'Replace all mock data with live API calls',
-        'WebSocket connection for real-time features',
-    ]),
-    (AMBER, 'Phase 4: Infrastructure', 'Deploy', [
-        'Vercel (frontend) + Railway (API) + Neon (DB)',
-        'Upstash Redis for caching + sessions',
-        'Domain + SSL via Cloudflare',
-        'Environment variables + secrets management',
-    ]),
-    (GREEN, 'Phase 5: Polish', 'Pre-Launch', [
-        'Cloudflare R2 for file/asset storage',
-        'Sentry error monitoring',
-        'Rate limiting + security review',
-        'Load testing + documentation',
-    ]),
-]
-
-for i, (color, title, subtitle, items) in enumerate(phases):
-    bullet_text = '<br/>'.join([f'&bull; {item}' for item in items])
-
-    phase_cell = [
-        Paragraph(f'<font color="#{color.hexval()[2:]}">{title}</font>', phase_title_style),
-        Paragraph(f'<i>{subtitle}</i>', ParagraphStyle(
-            'PhaseSub', parent=styles['Normal'],
-            fontSize=9, textColor=WHITE_40, fontName='Helvetica-Oblique',
-            alignment=TA_LEFT, leading=11,
-        )),
-        Spacer(1, 4),
-        Paragraph(bullet_text, phase_body_style),
+def workspace_page(story):
+    pkgs = workspace.packages()
+    layers = workspace.build_layers(pkgs)
+    critical = workspace.critical_path(pkgs)
+    upstream = workspace.closure(pkgs)
+    on_path = set(zip(critical, critical[1:]))
+
+    def short(name):
+        return name.split('/')[-1]
+
+    story.append(Paragraph('Workspace Build Graph', title_style))
+    story.append(Paragraph(
+        f'{len(pkgs)} workspace packages from pnpm-workspace.yaml. Each package sits below the packages '
+        f'it depends on; <font color="#{PINK.hexval()[2:]}">the critical path</font> is the longest chain '
+        'that turbo build has to run in sequence.',
+        subtitle_style,
+    ))
+
+    nodes = {}
+    for name, pkg in pkgs.items():
+        gates = sum(1 for other in upstream.values() if name in other)
+        detail = [pkg['path']]
+        if gates:
+            detail.append(f'gates {gates}')
+        if 'build' not in pkg['scripts']:
+            detail.append('no build')
+        nodes[name] = {
+            'title': short(name),
+            'subtitle': ' \u00b7 '.join(detail),
+            'fill': SURFACE_CARD,
+            'stroke': PINK if name in critical else TEAL_DARK,
+            'stroke_width': 1.6 if name in critical else 0.8,
+        }
+    edges = [
+        (dep, name, {'color': PINK, 'width': 1.8} if (dep, name) in on_path else {'color': WHITE_40})
+        for name, pkg in pkgs.items()
+        for dep in pkg['internal']
     ]
-
-    t = Table([[phase_cell]], colWidths=[PAGE_W - 1.4 * inch], rowHeights=[None])
+    story.append(LayeredGraph(
+        nodes, edges, PAGE_W - 1.2 * inch - 12, 2.9 * inch, box_width=104, box_height=30,
+        font=fonts.face('Helvetica'), bold_font=fonts.face('Helvetica-Bold'),
+        max_width=max(len(layer) for layer in layers),  # rows are exactly the build layers
+    ))
+    story.append(Spacer(1, 10))
+
+    cells = []
+    for i, layer in enumerate(layers):
+        cells.append([
+            Paragraph(f'<font color="#{TEAL.hexval()[2:]}"><b>Build layer {i + 1}</b></font>', phase_title_style),
+            Paragraph(', '.join(short(n) for n in layer), phase_body_style),
+        ])
+    cells.append([
+        Paragraph(f'<font color="#{PINK.hexval()[2:]}"><b>Critical path</b></font>', phase_title_style),
+        Paragraph(' &#8594; '.join(short(n) for n in critical), phase_body_style),
+    ])
+    t = Table(cells, colWidths=[1.6 * inch, PAGE_W - 3.0 * inch])
     t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, 0), SURFACE_CARD),
-        ('BOX', (0, 0), (0, 0), 2, color),
-        ('TOPPADDING', (0, 0), (0, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (0, 0), 10),
-        ('LEFTPADDING', (0, 0), (0, 0), 14),
-        ('RIGHTPADDING', (0, 0), (0, 0), 14),
-        ('VALIGN', (0, 0), (0, 0), 'TOP'),
+        ('BACKGROUND', (0, 0), (-1, -1), SURFACE_CARD),
+        ('LINEBELOW', (0, 0), (-1, -2), 0.5, SURFACE_MID),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ('LEFTPADDING', (0, 0), (-1, -1), 10),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
     ]))
     story.append(t)
 
-    if i < len(phases) - 1:
-        story.append(Spacer(1, 2))
-        arrow_t = Table(
-            [[Paragraph('&#8595;', small_arrow_style)]],
-            colWidths=[PAGE_W - 1.4 * inch],
-            rowHeights=[0.25 * inch],
-        )
-        arrow_t.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-            ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
-        ]))
-        story.append(arrow_t)
-        story.append(Spacer(1, 2))
 
-story.append(PageBreak())
+# ============================================================
+# PAGE 5: Deployment Topology (generated from render.yaml)
+# ============================================================
+SERVICE_COLORS = {'web': BLUE, 'keyvalue': PINK, 'postgres': AMBER}
+
+
+def topology_page(story):
+    bp = blueprint.load()
+    services = bp['services']
+
+    story.append(Paragraph('Deployment Topology', title_style))
+    story.append(Paragraph(
+        f'{len(services)} Render services from render.yaml. Edges are env vars wired with '
+        'fromDatabase / fromService; a deploy only runs when a file under its build filter changes.',
+        subtitle_style,
+    ))
+
+    nodes = {
+        svc['name']: {
+            'title': svc['name'],
+            'subtitle': ' \u00b7 '.join(filter(None, [svc['type'], svc['runtime'], svc['plan'], svc['region']])),
+            'fill': SURFACE_CARD,
+            'stroke': SERVICE_COLORS.get(svc['type'], TEAL),
+            'stroke_width': 1.4,
+        }
+        for svc in services
+    }
+    edges = [
+        (e['from'], e['to'], {'color': TEAL, 'width': 1.2, 'label': f'{e["key"]} ({e["property"]})'})
+        for e in bp['edges'] if e['from'] in nodes
+    ]
+    story.append(LayeredGraph(
+        nodes, edges, PAGE_W - 1.2 * inch - 12, 1.9 * inch, box_width=150, box_height=32,
+        font=fonts.face('Helvetica'), bold_font=fonts.face('Helvetica-Bold'),
+    ))
+    story.append(Spacer(1, 10))
+
+    cells = []
+    for svc in services:
+        color = SERVICE_COLORS.get(svc['type'], TEAL)
+        kinds = {}
+        for var in svc['env']:
+            kinds[var['kind']] = kinds.get(var['kind'], 0) + 1
+        lines = []
+        if svc['build_filter']:
+            lines.append('<b>Build filter</b><br/>' + '<br/>'.join(svc['build_filter']))
+        if kinds:
+            lines.append('<b>Env vars</b><br/>' + '<br/>'.join(
+                f'{n} {kind}' for kind, n in sorted(kinds.items())
+            ))
+        if svc['disk']:
+            lines.append(f'<b>Disk</b><br/>{svc["disk"]}')
+        cells.append([
+            Paragraph(f'<font color="#{color.hexval()[2:]}"><b>{svc["name"]}</b></font>', box_title_style),
+            Spacer(1, 4),
+            Paragraph('<br/><br/>'.join(lines) or 'Managed service', box_body_style),
+        ])
+    col_w = (PAGE_W - 1.4 * inch) / len(cells)
+    t = Table([cells], colWidths=[col_w] * len(cells))
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), SURFACE_CARD),
+        ('LINEAFTER', (0, 0), (-2, -1), 0.5, SURFACE_MID),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+    story.append(t)
 
 
 # ============================================================
-# PAGE 3: System Architecture
+# PAGE 6: Revenue Flow
 # ============================================================
-story.append(Paragraph('System Architecture', title_style))
-story.append(Paragraph('Layered architecture from clients to blockchain', subtitle_style))
-
-layers = [
-    (HexColor('#06b6d4'), 'Clients', 'Web Browser  |  MCP Agents (OpenClaw/Clawdbots)  |  Arena SDK  |  WebSocket Clients'),
-    (TEAL, 'Frontend', 'Next.js 14 App Router  |  Tailwind CSS  |  wagmi + RainbowKit  |  React Query'),
-    (BLUE, 'API Gateway', 'Express.js  |  SIWE Auth Middleware  |  JWT Validation  |  Rate Limiting  |  WebSocket (ws)'),
-    (PURPLE, 'Services', 'GamePublishingService  |  PurchaseService  |  TournamentService  |  BracketGenerator\nDiscoveryService  |  EloSystem  |  RankedMatchmaker  |  LeaderboardService  |  SpectatorHub'),
-    (AMBER, 'Data Layer', 'PostgreSQL (Prisma ORM)  |  Redis (Upstash)  |  Cloudflare R2 (Assets)  |  WASM Runtime'),
-    (GREEN, 'Blockchain', 'Base L2 (Ethereum)  |  Moltbucks (ERC-20)  |  GameMarketplace  |  TournamentManager'),
-]
-
-for i, (color, title, body) in enumerate(layers):
-    cell = [
-        Paragraph(f'<font color="#{color.hexval()[2:]}"><b>{title}</b></font>', layer_title_style),
+def revenue_page(story):
+    # Splits as deployed, and a seeded simulation of the flows they produce.
+    sim = economy.simulate()
+    terms = sim['terms']
+    creator_pct, platform_pct = terms['creator_share'], terms['platform_share']
+    prize_split = '/'.join(str(p) for p in terms['prizes'])
+
+    story.append(Paragraph('Revenue Flow', title_style))
+    story.append(Paragraph('How MOLT tokens flow through the Moltblox economy', subtitle_style))
+
+    # Top: Player pays
+    player_cell = [
+        Paragraph('<font color="#06b6d4"><b>Player / Bot</b></font>', layer_title_style),
         Spacer(1, 3),
-        Paragraph(body.replace('\n', '<br/>'), layer_body_style),
+        Paragraph('Purchases game items, enters tournaments,<br/>buys cosmetics with MOLT tokens', layer_body_style),
     ]
+    t = Table([[player_cell]], colWidths=[PAGE_W - 1.4 * inch])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, 0), SURFACE_CARD),
+        ('BOX', (0, 0), (0, 0), 2, HexColor('#06b6d4')),
+        ('TOPPADDING', (0, 0), (0, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (0, 0), 10),
+        ('LEFTPADDING', (0, 0), (0, 0), 12),
+        ('RIGHTPADDING', (0, 0), (0, 0), 12),
+        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
+        ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+    ]))
+    story.append(t)
 
-    t = Table([[cell]], colWidths=[PAGE_W - 1.4 * inch], rowHeights=[None])
+    # Arrow down
+    story.append(Spacer(1, 4))
+    arrow_t = Table(
+        [[Paragraph('&#8595;  MOLT Payment  &#8595;', small_arrow_style)]],
+        colWidths=[PAGE_W - 1.4 * inch],
+        rowHeights=[0.3 * inch],
+    )
+    arrow_t.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
+    ]))
+    story.append(arrow_t)
+    story.append(Spacer(1, 4))
+
+    # Smart Contract
+    contract_cell = [
+        Paragraph('<font color="#f59e0b"><b>GameMarketplace Smart Contract</b></font>', layer_title_style),
+        Spacer(1, 3),
+        Paragraph('On-chain escrow &amp; automatic split on Base L2', layer_body_style),
+    ]
+    t = Table([[contract_cell]], colWidths=[PAGE_W - 1.4 * inch])
     t.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (0, 0), SURFACE_CARD),
-        ('BOX', (0, 0), (0, 0), 2, color),
+        ('BOX', (0, 0), (0, 0), 2, AMBER),
         ('TOPPADDING', (0, 0), (0, 0), 10),
         ('BOTTOMPADDING', (0, 0), (0, 0), 10),
         ('LEFTPADDING', (0, 0), (0, 0), 12),
@@ -319,181 +538,372 @@ for i, (color, title, body) in enumerate(layers):
     ]))
     story.append(t)
 
-    if i < len(layers) - 1:
-        arrow_t = Table(
-            [[Paragraph('&#8595;', small_arrow_style)]],
-            colWidths=[PAGE_W - 1.4 * inch],
-            rowHeights=[0.22 * inch],
-        )
-        arrow_t.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-            ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
-        ]))
-        story.append(arrow_t)
+    # Split arrows
+    story.append(Spacer(1, 4))
+    split_label = Table(
+        [[Paragraph(f'&#8601;  {creator_pct}% Creator Share', ParagraphStyle(
+            'SplitLeft', parent=styles['Normal'],
+            fontSize=10, textColor=GREEN, fontName=fonts.face('Helvetica-Bold'),
+            alignment=TA_CENTER, leading=12,
+        )),
+          Paragraph(f'{platform_pct}% Platform Fee  &#8600;', ParagraphStyle(
+            'SplitRight', parent=styles['Normal'],
+            fontSize=10, textColor=CORAL, fontName=fonts.face('Helvetica-Bold'),
+            alignment=TA_CENTER, leading=12,
+        ))]],
+        colWidths=[(PAGE_W - 1.4 * inch) / 2, (PAGE_W - 1.4 * inch) / 2],
+        rowHeights=[0.3 * inch],
+    )
+    split_label.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    story.append(split_label)
+    story.append(Spacer(1, 4))
+
+    # Two destination boxes side by side
+    creator_cell = [
+        Paragraph('<font color="#22c55e"><b>Game Creator</b></font>', layer_title_style),
+        Spacer(1, 3),
+        Paragraph(f'{creator_pct}% of all purchases<br/>Direct to wallet, instant<br/>No minimum payout', layer_body_style),
+    ]
+    platform_cell = [
+        Paragraph('<font color="#ff6b6b"><b>Platform Treasury</b></font>', layer_title_style),
+        Spacer(1, 3),
+        Paragraph(f'{platform_pct}% platform fee<br/>Funds: tournaments, infra,<br/>development, moderation', layer_body_style),
+    ]
+
+    t = Table([[creator_cell, platform_cell]],
+              colWidths=[(PAGE_W - 1.8 * inch) / 2, (PAGE_W - 1.8 * inch) / 2])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, 0), SURFACE_CARD),
+        ('BACKGROUND', (1, 0), (1, 0), SURFACE_CARD),
+        ('BOX', (0, 0), (0, 0), 2, GREEN),
+        ('BOX', (1, 0), (1, 0), 2, CORAL),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('LEFTPADDING', (0, 0), (-1, -1), 12),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ]))
+    story.append(t)
+
+    # Additional revenue streams
+    story.append(Spacer(1, 12))
+    story.append(Paragraph('Additional Revenue Streams', ParagraphStyle(
+        'RevTitle', parent=styles['Normal'],
+        fontSize=14, textColor=WHITE, fontName=fonts.face('Helvetica-Bold'),
+        alignment=TA_CENTER, spaceAfter=10,
+    )))
+
+    streams = [
+        ('Tournament Entry Fees', f'Bots pay MOLT to enter\nPrize pool: {prize_split} split'),
+        ('Marketplace Cosmetics', 'Skins, badges, effects\nCreator-made virtual goods'),
+        ('Premium Submolts', 'Exclusive communities\nGated access via MOLT'),
+        ('Spectator Tips', 'Watch bot vs bot matches\nTip favorite competitors'),
+    ]
+
+    stream_cells = []
+    for title, body in streams:
+        stream_cells.append([
+            Paragraph(f'<b>{title}</b>', ParagraphStyle(
+                'StreamTitle', parent=styles['Normal'],
+                fontSize=9, textColor=CYAN, fontName=fonts.face('Helvetica-Bold'),
+                alignment=TA_CENTER, leading=11,
+            )),
+            Spacer(1, 3),
+            Paragraph(body.replace('\n', '<br/>'), ParagraphStyle(
+                'StreamBody', parent=styles['Normal'],
+                fontSize=8, textColor=WHITE_70, fontName=fonts.face('Helvetica'),
+                alignment=TA_CENTER, leading=10,
+            )),
+        ])
+
+    t = Table([stream_cells], colWidths=[(PAGE_W - 1.8 * inch) / 4] * 4)
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), SURFACE_CARD),
+        ('BOX', (0, 0), (0, 0), 1, TEAL),
+        ('BOX', (1, 0), (1, 0), 1, TEAL),
+        ('BOX', (2, 0), (2, 0), 1, TEAL),
+        ('BOX', (3, 0), (3, 0), 1, TEAL),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ]))
+    story.append(t)
 
-story.append(PageBreak())
+    # Simulated flows: p10-p90 bands across runs, median line.
+    def bands(key, color, label):
+        return dict(low=sim[key]['p10'], mid=sim[key]['p50'], high=sim[key]['p90'], color=color, label=label)
+
+    chart_w = (PAGE_W - 1.8 * inch) / 3 - 8
+    chart_args = dict(font=fonts.face('Helvetica'), bold_font=fonts.face('Helvetica-Bold'))
+    months = range(1, sim['months'] + 1)
+    charts = [
+        BandChart(months, [bands('creator', GREEN, 'creators'), bands('platform', CORAL, 'platform')],
+                  chart_w, 1.35 * inch, 'Marketplace MOLT per month', x_label='month', **chart_args),
+        Histogram(sim['creator_earnings']['edges'], sim['creator_earnings']['counts'],
+                  chart_w, 1.35 * inch, f'Creator earnings over {sim["months"]} months', TEAL,
+                  x_label='MOLT per creator', **chart_args),
+        Histogram(sim['entrant_returns']['edges'], sim['entrant_returns']['counts'],
+                  chart_w, 1.35 * inch, 'Non-winner payout per entry fee', AMBER, x_label='x entry fee',
+                  marker=(1, 'break-even'), **chart_args),
+    ]
+    t = Table([charts], colWidths=[(PAGE_W - 1.8 * inch) / 3] * 3)
+    t.setStyle(TableStyle([
+        ('LEFTPADDING', (0, 0), (-1, -1), 4),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+    ]))
+    story.append(Spacer(1, 8))
+    story.append(t)
+    story.append(Paragraph(
+        f'Monte Carlo, seed {sim["seed"]}: {sim["runs"]} runs of {sim["months"]} months, '
+        f'{sim["purchases"]:,} purchases, {sim["tournaments"]:,} tournaments, {sim["entries"]:,} entries; '
+        f'demand follows circulating supply. Realized platform share {sim["platform_share"]:.2%} '
+        f'(creator cut rounds down); top 1% of creators earn {sim["top_creator_share"]:.0%}; '
+        f'median non-winner gets back {sim["median_return"]:.2f}x the entry fee.',
+        box_body_style,
+    ))
+
+# ============================================================
+# PAGE 7: Token Unlocks (from docs/tokenomics-model.md)
+# ============================================================
+UNLOCK_COLORS = {
+    'airdrop': CYAN, 'team': PURPLE, 'development': AMBER, 'liquidity': BLUE, 'treasury': PINK,
+}
+
+
+def unlocks_page(story):
+    t = economy.timeline()
+    unlocked = economy.unlocked(t)
+    total = sum(unlocked.values())
+    months = int(t[-1])
+
+    story.append(Paragraph('Token Unlocks', title_style))
+    story.append(Paragraph(
+        f'Circulating MOLT over {months} months from the tokenomics model, sampled hourly',
+        subtitle_style,
+    ))
+
+    chart_args = dict(
+        x_ticks=range(0, months + 1, 6), x_label='months since TGE',
+        font=fonts.face('Helvetica'), bold_font=fonts.face('Helvetica-Bold'),
+    )
+    emission = TimeSeriesChart(
+        [dict(x=t, y=total, color=GREEN, label='circulating', fill=True)]
+        + [dict(x=t, y=unlocked[name], color=UNLOCK_COLORS[name], label=name) for name in economy.ALLOCATIONS],
+        PAGE_W - 1.4 * inch, 2.9 * inch, 'Emission curve', **chart_args,
+    )
+    story.append(emission)
+    story.append(Spacer(1, 10))
+
+    panels = [
+        ('team', f'Team: {economy.TEAM_CLIFF}-month cliff, {economy.TEAM_VEST}-month linear vest'),
+        ('treasury', f'Treasury: {economy.TREASURY_CLIFF}-month cliff, quarterly unlocks'),
+        ('development', f'Future development: {economy.DEV_LOCK}-month lock (ceiling)'),
+        ('airdrop', 'Airdrop seasons: ' + ' / '.join(f'{share:.0%}' for share, _ in economy.SEASONS)),
+    ]
+    width = (PAGE_W - 1.4 * inch) / len(panels)
+    cells = [
+        TimeSeriesChart([dict(x=t, y=unlocked[name], color=UNLOCK_COLORS[name], fill=True)],
+                        width - 8, 1.7 * inch, title, **dict(chart_args, x_ticks=range(0, months + 1, 12)))
+        for name, title in panels
+    ]
+    row = Table([cells], colWidths=[width] * len(panels))
+    row.setStyle(TableStyle([
+        ('LEFTPADDING', (0, 0), (-1, -1), 4),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+    ]))
+    story.append(row)
+    story.append(Spacer(1, 6))
+    story.append(Paragraph(
+        f'Each curve has {t.size:,} hourly samples and is drawn with at most {max(emission.drawn)} points '
+        '(Largest-Triangle-Three-Buckets downsampling keeps the cliffs and season steps). '
+        'The development fund is shown at its governance ceiling; what is unreleased at '
+        f'month {economy.DEV_BURN} is burned.',
+        box_body_style,
+    ))
 
 
 # ============================================================
-# PAGE 4: Revenue Flow
+# PAGE 8: Data Model (generated from schema.prisma)
 # ============================================================
-story.append(Paragraph('Revenue Flow', title_style))
-story.append(Paragraph('How MOLT tokens flow through the Moltblox economy', subtitle_style))
-
-# Top: Player pays
-player_cell = [
-    Paragraph('<font color="#06b6d4"><b>Player / Bot</b></font>', layer_title_style),
-    Spacer(1, 3),
-    Paragraph('Purchases game items, enters tournaments,<br/>buys cosmetics with MOLT tokens', layer_body_style),
-]
-t = Table([[player_cell]], colWidths=[PAGE_W - 1.4 * inch])
-t.setStyle(TableStyle([
-    ('BACKGROUND', (0, 0), (0, 0), SURFACE_CARD),
-    ('BOX', (0, 0), (0, 0), 2, HexColor('#06b6d4')),
-    ('TOPPADDING', (0, 0), (0, 0), 10),
-    ('BOTTOMPADDING', (0, 0), (0, 0), 10),
-    ('LEFTPADDING', (0, 0), (0, 0), 12),
-    ('RIGHTPADDING', (0, 0), (0, 0), 12),
-    ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
-    ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-]))
-story.append(t)
-
-# Arrow down
-story.append(Spacer(1, 4))
-arrow_t = Table(
-    [[Paragraph('&#8595;  MOLT Payment  &#8595;', small_arrow_style)]],
-    colWidths=[PAGE_W - 1.4 * inch],
-    rowHeights=[0.3 * inch],
-)
-arrow_t.setStyle(TableStyle([
-    ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-    ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
-]))
-story.append(arrow_t)
-story.append(Spacer(1, 4))
-
-# Smart Contract
-contract_cell = [
-    Paragraph('<font color="#f59e0b"><b>GameMarketplace Smart Contract</b></font>', layer_title_style),
-    Spacer(1, 3),
-    Paragraph('On-chain escrow &amp; automatic split on Base L2', layer_body_style),
-]
-t = Table([[contract_cell]], colWidths=[PAGE_W - 1.4 * inch])
-t.setStyle(TableStyle([
-    ('BACKGROUND', (0, 0), (0, 0), SURFACE_CARD),
-    ('BOX', (0, 0), (0, 0), 2, AMBER),
-    ('TOPPADDING', (0, 0), (0, 0), 10),
-    ('BOTTOMPADDING', (0, 0), (0, 0), 10),
-    ('LEFTPADDING', (0, 0), (0, 0), 12),
-    ('RIGHTPADDING', (0, 0), (0, 0), 12),
-    ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
-    ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-]))
-story.append(t)
-
-# Split arrows
-story.append(Spacer(1, 4))
-split_label = Table(
-    [[Paragraph('&#8601;  85% Creator Share', ParagraphStyle(
-        'SplitLeft', parent=styles['Normal'],
-        fontSize=10, textColor=GREEN, fontName='Helvetica-Bold',
-        alignment=TA_CENTER, leading=12,
-    )),
-      Paragraph('15% Platform Fee  &#8600;', ParagraphStyle(
-        'SplitRight', parent=styles['Normal'],
-        fontSize=10, textColor=CORAL, fontName='Helvetica-Bold',
-        alignment=TA_CENTER, leading=12,
-    ))]],
-    colWidths=[(PAGE_W - 1.4 * inch) / 2, (PAGE_W - 1.4 * inch) / 2],
-    rowHeights=[0.3 * inch],
-)
-split_label.setStyle(TableStyle([
-    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-]))
-story.append(split_label)
-story.append(Spacer(1, 4))
-
-# Two destination boxes side by side
-creator_cell = [
-    Paragraph('<font color="#22c55e"><b>Game Creator</b></font>', layer_title_style),
-    Spacer(1, 3),
-    Paragraph('85% of all purchases<br/>Direct to wallet, instant<br/>No minimum payout', layer_body_style),
-]
-platform_cell = [
-    Paragraph('<font color="#ff6b6b"><b>Platform Treasury</b></font>', layer_title_style),
-    Spacer(1, 3),
-    Paragraph('15% platform fee<br/>Funds: tournaments, infra,<br/>development, moderation', layer_body_style),
-]
-
-t = Table([[creator_cell, platform_cell]],
-          colWidths=[(PAGE_W - 1.8 * inch) / 2, (PAGE_W - 1.8 * inch) / 2])
-t.setStyle(TableStyle([
-    ('BACKGROUND', (0, 0), (0, 0), SURFACE_CARD),
-    ('BACKGROUND', (1, 0), (1, 0), SURFACE_CARD),
-    ('BOX', (0, 0), (0, 0), 2, GREEN),
-    ('BOX', (1, 0), (1, 0), 2, CORAL),
-    ('TOPPADDING', (0, 0), (-1, -1), 10),
-    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-    ('LEFTPADDING', (0, 0), (-1, -1), 12),
-    ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-]))
-story.append(t)
-
-# Additional revenue streams
-story.append(Spacer(1, 20))
-story.append(Paragraph('Additional Revenue Streams', ParagraphStyle(
-    'RevTitle', parent=styles['Normal'],
-    fontSize=14, textColor=WHITE, fontName='Helvetica-Bold',
-    alignment=TA_CENTER, spaceAfter=10,
-)))
-
-streams = [
-    ('Tournament Entry Fees', 'Bots pay MOLT to enter\nPrize pool: 50/25/15/10 split'),
-    ('Marketplace Cosmetics', 'Skins, badges, effects\nCreator-made virtual goods'),
-    ('Premium Submolts', 'Exclusive communities\nGated access via MOLT'),
-    ('Spectator Tips', 'Watch bot vs bot matches\nTip favorite competitors'),
-]
-
-stream_cells = []
-for title, body in streams:
-    stream_cells.append([
-        Paragraph(f'<b>{title}</b>', ParagraphStyle(
-            'StreamTitle', parent=styles['Normal'],
-            fontSize=9, textColor=CYAN, fontName='Helvetica-Bold',
-            alignment=TA_CENTER, leading=11,
-        )),
-        Spacer(1, 3),
-        Paragraph(body.replace('\n', '<br/>'), ParagraphStyle(
-            'StreamBody', parent=styles['Normal'],
-            fontSize=8, textColor=WHITE_70, fontName='Helvetica',
-            alignment=TA_CENTER, leading=10,
-        )),
-    ])
+# onDelete rule -> edge color; anything else is Prisma's default (restrict).
+FK_COLORS = {'Cascade': CORAL, 'SetNull': AMBER}
+FK_RANK = {'Cascade': 2, 'SetNull': 1}
+
+
+def er_diagram_page(story):
+    schema = prisma.parse()
+    fks = prisma.foreign_keys(schema)
+    models = schema['models']
+
+    story.append(Paragraph('Data Model', title_style))
+    story.append(Paragraph(
+        f'{len(models)} Prisma models and {len(fks)} foreign keys from apps/server/prisma/schema.prisma. '
+        'Parents sit above the models that reference them.',
+        subtitle_style,
+    ))
+
+    # Parallel FKs between two models (e.g. Purchase buyer/seller) share one edge.
+    merged = {}
+    for child, parent, rel in fks:
+        if child == parent:
+            continue
+        edge = merged.setdefault((parent, child), {'count': 0, 'rule': None})
+        edge['count'] += 1
+        if FK_RANK.get(rel['onDelete'], 0) > FK_RANK.get(edge['rule'], 0):
+            edge['rule'] = rel['onDelete']
+    edges = [
+        (parent, child, {
+            'color': FK_COLORS.get(e['rule'], WHITE_40),
+            'width': 0.6 + 0.4 * (e['count'] - 1),
+            'dash': () if e['rule'] else (2, 2),
+        })
+        for (parent, child), e in merged.items()
+    ]
+
+    referenced = {parent for parent, _ in merged}
+    nodes = {}
+    for name, model in models.items():
+        columns = sum(1 for f in model['fields'] if f['type'] not in models)
+        fk_count = len(model['relations'])
+        nodes[name] = {
+            'title': name,
+            'subtitle': f'{columns} columns' + (f' \u00b7 {fk_count} FK' if fk_count else ''),
+            'fill': SURFACE_CARD,
+            'stroke': CYAN if name in referenced and not model['relations'] else TEAL_DARK,
+        }
+
+    story.append(LayeredGraph(
+        nodes, edges, PAGE_W - 1.2 * inch - 12, 4.9 * inch,
+        font=fonts.face('Helvetica'), bold_font=fonts.face('Helvetica-Bold'),
+    ))
+    story.append(Spacer(1, 6))
+    story.append(Paragraph(
+        f'<font color="#{CORAL.hexval()[2:]}"><b>\u2014</b></font> cascade delete &nbsp;&nbsp; '
+        f'<font color="#{AMBER.hexval()[2:]}"><b>\u2014</b></font> set null &nbsp;&nbsp; '
+        f'<font color="#{WHITE_40.hexval()[2:]}"><b>- -</b></font> restrict (default) &nbsp;&nbsp; '
+        f'<font color="#{CYAN.hexval()[2:]}"><b>\u25a1</b></font> root model &nbsp;&nbsp; '
+        'thicker edges carry several foreign keys',
+        box_body_style,
+    ))
+
+
+# ============================================================
+# PAGE 9: Tournament Brackets (drawn by moltblox_pdf.bracket)
+# ============================================================
+def tournament_page(story):
+    terms = economy.contract_terms()
+    prize_split = '/'.join(str(p) for p in terms['prizes'])
 
-t = Table([stream_cells], colWidths=[(PAGE_W - 1.8 * inch) / 4] * 4)
-t.setStyle(TableStyle([
-    ('BACKGROUND', (0, 0), (-1, -1), SURFACE_CARD),
-    ('BOX', (0, 0), (0, 0), 1, TEAL),
-    ('BOX', (1, 0), (1, 0), 1, TEAL),
-    ('BOX', (2, 0), (2, 0), 1, TEAL),
-    ('BOX', (3, 0), (3, 0), 1, TEAL),
-    ('TOPPADDING', (0, 0), (-1, -1), 8),
-    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-    ('LEFTPADDING', (0, 0), (-1, -1), 6),
-    ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-]))
-story.append(t)
+    story.append(Paragraph('Tournament Brackets', title_style))
+    story.append(Paragraph(
+        'A double-elimination bracket for 8 bots after round 1, in the match order BracketGenerator '
+        f'produces. Prize pool split {prize_split}; brackets of up to {terms["max_participants"]} entrants '
+        'are tiled across pages with python -m moltblox_pdf.bracket.',
+        subtitle_style,
+    ))
+    names = {f'player-{i:04d}': f'Bot #{i}' for i in range(1, 9)}
+    story.extend(bracket.bracket_story(bracket.sample(8, double=True), names, key='sample-bracket'))
 
 
 # ============================================================
 # Build PDF
 # ============================================================
-doc.build(story, onFirstPage=page_bg, onLaterPages=page_bg)
-print(f'Generated: {output_path}')
-print(f'Size: {os.path.getsize(output_path):,} bytes')
+DOC_MARGINS = dict(
+    topMargin=0.6*inch,
+    bottomMargin=0.5*inch,
+    leftMargin=0.6*inch,
+    rightMargin=0.6*inch,
+)
+
+PAGES = (user_journey_page, roadmap_page, architecture_page, workspace_page, topology_page,
+         revenue_page, unlocks_page, er_diagram_page, tournament_page)
+# Pages whose inputs can't be read here -> why; build_story() warns about each.
+SKIPPED = {}
+if blueprint.yaml is None:
+    # render.yaml needs PyYAML; leave the topology page out without it.
+    PAGES = tuple(page for page in PAGES if page is not topology_page)
+    SKIPPED['Deployment Topology'] = 'PyYAML is not installed (pip install pyyaml)'
+
+
+def build_story():
+    """Return (story, search sections); each flowchart starts a page and is bookmarked.
+
+    Entry pages are where each chart starts if none overflows; drawn_pages()
+    corrects them after rendering.
+    """
+    for title, reason in SKIPPED.items():
+        print(f'Warning: leaving out the {title} page: {reason}', file=sys.stderr)
+    story = []
+    sections = []
+    for i, page in enumerate(PAGES):
+        if i:
+            story.append(PageBreak())
+        start = len(story)
+        page(story)
+        # Each flowchart page is one search section; its first Paragraph is the title.
+        texts = [f.getPlainText() for f in walk(story[start:]) if isinstance(f, Paragraph)]
+        story.insert(start, Bookmark(f'page-{i + 1}', texts[0]))
+        sections.append((texts[0], [{
+            'id': f'page-{i + 1}', 'title': texts[0], 'page': i + 1, 'text': ' '.join(texts[1:]),
+        }]))
+    return story, sections
+
+
+def render(output):
+    """Render the flowcharts to `output` (a path or binary file); return the search sections.
+
+    A path is replaced only once the PDF is complete, so concurrent builds
+    never leave a half-written file there.
+    """
+    story, sections = build_story()
+    marks = bookmarks(story)
+    if draft.enabled:
+        draft.prepare(story)
+    with store.publishing(output) as target:
+        doc = SimpleDocTemplate(target, pagesize=landscape(A4), **DOC_MARGINS, **draft.doc_options())
+        doc.build(story, onFirstPage=page_bg, onLaterPages=page_bg)
+    return drawn_pages(sections, marks)
+
+
+def build(path=output_path):
+    sections = render(path)
+    print(f'Generated: {path}')
+    print(f'Size: {os.path.getsize(path):,} bytes')
+    print(f'Generated: {searchindex.write_index(path, sections)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the Moltblox flowcharts PDF.')
+    parser.add_argument(
+        '--brand-fonts', metavar='DIR',
+        help='directory of TTF brand fonts (*-Regular.ttf, *-Bold.ttf, ...) to use instead of Helvetica',
+    )
+    parser.add_argument('-o', '--output', help=f'output PDF path (default: {output_path})')
+    parser.add_argument(
+        '--draft', action='store_true',
+        help='fast undecorated render with the same page breaks (default output: moltblox-flowcharts.draft.pdf)',
+    )
+    args = parser.parse_args()
+
+    if args.draft:
+        draft.enable()
+
+    if args.brand_fonts:
+        fonts.use_brand_fonts(args.brand_fonts)
+        fonts.restyle(v for v in globals().values() if isinstance(v, ParagraphStyle))
+    build(args.output or (output_path[:-4] + '.draft.pdf' if args.draft else output_path))
+
+
+if __name__ == '__main__':
+    main()
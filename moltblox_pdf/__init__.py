@@ -0,0 +1,11 @@
+"""
+Shared helpers for the Moltblox PDF generators
+(moltblox_testnet_launch.py and docs/generate_flowcharts_pdf.py).
+"""
+
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# On-disk cache for parsed fonts and other build artifacts.
+CACHE_DIR = os.environ.get('MOLTBLOX_PDF_CACHE') or os.path.join(REPO_ROOT, '.cache', 'moltblox-pdf')
@@ -0,0 +1,80 @@
+"""
+Render Blueprint (render.yaml) summary for the topology page.
+
+Reduces the Blueprint to what the diagram shows: each service and
+database with its type, runtime, plan, region, buildFilter paths and env
+vars, plus the env-var edges declared with fromDatabase / fromService.
+The summary is cached by the file's content hash, so unchanged YAML is
+never parsed again.
+
+PyYAML is optional: without it `yaml` is None and callers skip the page.
+"""
+
+import hashlib
+import json
+import os
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from . import CACHE_DIR, REPO_ROOT, store
+
+BLUEPRINT_PATH = os.path.join(REPO_ROOT, 'render.yaml')
+BLUEPRINT_CACHE_DIR = os.path.join(CACHE_DIR, 'blueprint')
+SUMMARY_VERSION = 1
+
+
+def _env_kind(var):
+    if 'fromDatabase' in var or 'fromService' in var or 'fromGroup' in var:
+        return 'linked'
+    if var.get('generateValue'):
+        return 'generated'
+    if var.get('sync') is False:
+        return 'secret'
+    return 'value'
+
+
+def summarize(data):
+    """Plain-data summary of a parsed Blueprint."""
+    services, edges = [], []
+    entries = [(s, s.get('type', 'web')) for s in data.get('services') or []]
+    entries += [(d, 'postgres') for d in data.get('databases') or []]
+    for spec, kind in entries:
+        env = [dict(key=var['key'], kind=_env_kind(var)) for var in spec.get('envVars') or []]
+        services.append({
+            'name': spec['name'],
+            'type': kind,
+            'runtime': spec.get('runtime') or spec.get('env'),
+            'plan': spec.get('plan'),
+            'region': spec.get('region'),
+            'build_filter': list((spec.get('buildFilter') or {}).get('paths') or []),
+            'disk': (spec.get('disk') or {}).get('mountPath'),
+            'env': env,
+        })
+        for var in spec.get('envVars') or []:
+            source = var.get('fromDatabase') or var.get('fromService')
+            if source:
+                edges.append({
+                    'from': source['name'], 'to': spec['name'], 'key': var['key'],
+                    'property': source.get('property') or source.get('envVarKey'),
+                })
+    return {'services': services, 'edges': edges}
+
+
+def load(path=BLUEPRINT_PATH, cache_dir=BLUEPRINT_CACHE_DIR):
+    """Summary of the Blueprint at `path`, from the cache when unchanged."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    key = hashlib.sha256(raw).hexdigest()
+    cache_path = os.path.join(cache_dir, f'{key}-v{SUMMARY_VERSION}.json')
+    cached = store.load_json(cache_path)
+    if cached:
+        return cached
+
+    if yaml is None:
+        raise RuntimeError('PyYAML is required to read render.yaml (pip install pyyaml)')
+    summary = summarize(yaml.safe_load(raw))
+    store.write_atomic(cache_path, json.dumps(summary, separators=(',', ':')))
+    return summary
@@ -0,0 +1,502 @@
+"""
+Tournament bracket pages: single and double elimination.
+
+Brackets come as the match list packages/tournaments' BracketGenerator
+produces (round, matchNumber, bracket, player1Id, player2Id, plus
+winnerId and score once played), either a plain list, {"matches": [...]}
+or a TournamentBracket ({"rounds": [{"matches": [...]}]}). A double
+elimination bracket is drawn as three sections (winners, losers, grand
+finals), a single elimination bracket as one.
+
+Layout is linear in the number of matches: the first round of a section
+is stacked top to bottom and every later match sits level with the
+middle of the matches feeding it, so each match is placed once.
+
+Sections too big for a page (the first round of a 256-1024 entrant
+bracket) are tiled. A tile is the subtree under a few matches of a later
+round: up to MAX_ROWS first-round matches and MAX_COLS rounds. The next
+band of rounds is tiled the same way, with the earlier tiles' winners as
+its entrants. Tiles of a tiled section get a page each, so continuation
+markers can give page numbers. A marker at a tile's last round points
+to the page the winners continue on, and a marker at its first round
+points back to the pages they came from. Both markers are links.
+
+Every match cell is the same box, so its frame is drawn once per
+document as a form XObject (see chrome.draw_chrome) and each cell only
+adds its names and scores. Connectors are one path per tile.
+
+    python -m moltblox_pdf.bracket bracket.json -o bracket.pdf
+    python -m moltblox_pdf.bracket --sample 1024 --double -o bracket.pdf
+"""
+
+import argparse
+import json
+import sys
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable, PageBreak, SimpleDocTemplate, Spacer
+
+from . import fonts, store
+from .chrome import draw_chrome
+
+# Geometry, in points.
+CELL_W = 114
+CELL_H = 22
+SCORE_W = 16
+ROW = 28  # vertical pitch of first-round matches
+COL_GAP = 22
+MARKER_W = 36  # room for continuation markers either side
+CAPTION_H = 14
+HEADER_H = 12
+# Largest tile: first-round matches and rounds.
+MAX_ROWS = 16
+MAX_COLS = 5
+
+CARD = HexColor('#1a2332')
+EDGE = HexColor('#0d9488')
+TEAL = HexColor('#14b8a6')
+LINE = HexColor('#4d5766')
+TEXT = HexColor('#ffffff')
+MUTED = HexColor('#b3b3b3')
+FAINT = HexColor('#666666')
+PAGE = HexColor('#0A1A1A')
+
+PAGE_SIZE = landscape(A4)
+DOC_MARGINS = dict(topMargin=0.6 * inch, bottomMargin=0.5 * inch, leftMargin=0.6 * inch, rightMargin=0.6 * inch)
+
+
+# ----------------------------------------------------------------
+# Bracket data
+# ----------------------------------------------------------------
+def _next_power_of_two(n):
+    size = 1
+    while size < n:
+        size *= 2
+    return size
+
+
+def _match(round, number, bracket, p1='', p2=''):
+    return {'round': round, 'matchNumber': number, 'bracket': bracket, 'player1Id': p1, 'player2Id': p2}
+
+
+def single_elimination(players):
+    """Matches for `players`, as BracketGenerator.generateSingleElimination() makes them."""
+    if len(players) < 2:
+        raise ValueError('At least 2 players are required for a single elimination bracket')
+    size = _next_power_of_two(len(players))
+    padded = list(players) + [''] * (size - len(players))  # byes
+    rounds = size.bit_length() - 1
+    matches = [_match(1, i // 2 + 1, 'winners', padded[i], padded[i + 1]) for i in range(0, size, 2)]
+    for round in range(2, rounds + 1):
+        for _ in range(size >> round):
+            matches.append(_match(round, len(matches) + 1, 'finals' if round == rounds else 'winners'))
+    return matches
+
+
+def double_elimination(players):
+    """Matches for `players`, as BracketGenerator.generateDoubleElimination() makes them."""
+    if len(players) < 2:
+        raise ValueError('At least 2 players are required for a double elimination bracket')
+    size = _next_power_of_two(len(players))
+    padded = list(players) + [''] * (size - len(players))
+    winners_rounds = size.bit_length() - 1
+    matches = [_match(1, i // 2 + 1, 'winners', padded[i], padded[i + 1]) for i in range(0, size, 2)]
+    for round in range(2, winners_rounds + 1):
+        for _ in range(size >> round):
+            matches.append(_match(round, len(matches) + 1, 'winners'))
+    losers_rounds = (winners_rounds - 1) * 2
+    in_round = size // 4
+    for round in range(1, losers_rounds + 1):
+        # Odd rounds after the first halve; even rounds take the winners' losers.
+        if round > 1 and round % 2 == 1:
+            in_round = max(1, in_round // 2)
+        for _ in range(max(1, in_round)):
+            matches.append(_match(winners_rounds + round, len(matches) + 1, 'losers'))
+    for round in (1, 2):  # grand final and the reset if the losers' champion wins it
+        matches.append(_match(winners_rounds + losers_rounds + round, len(matches) + 1, 'finals'))
+    return matches
+
+
+def sample(entrants, double=False):
+    """A bracket for `entrants` numbered players with its first round played (top seed wins)."""
+    players = [f'player-{i + 1:04d}' for i in range(entrants)]
+    matches = (double_elimination if double else single_elimination)(players)
+    columns = {}
+    for m in matches:
+        columns.setdefault((m['bracket'], m['round']), []).append(m)
+    first = columns[('winners', 1)]
+    second = columns.get(('winners', 2)) or columns.get(('finals', 2), [])
+    losers = [c for key, c in sorted(columns.items()) if key[0] == 'losers']
+    for i, m in enumerate(first):
+        winner, loser = m['player1Id'], m['player2Id']
+        m['winnerId'] = winner
+        if loser:
+            m['score'] = {'player1': 2, 'player2': i % 2}
+        if second:
+            second[i // 2]['player1Id' if i % 2 == 0 else 'player2Id'] = winner
+        if losers and loser:
+            losers[0][i // 2]['player1Id' if i % 2 == 0 else 'player2Id'] = loser
+    return matches
+
+
+def load(path):
+    """Matches from a bracket JSON file (a list, {"matches": [...]} or {"rounds": [...]})."""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('matches') or [m for r in data.get('rounds', []) for m in r['matches']]
+    return data
+
+
+def _columns(matches, name):
+    """Matches grouped by round, in play order; each round must split evenly over the next."""
+    by_round = {}
+    for m in matches:
+        by_round.setdefault(m['round'], []).append(m)
+    columns = [sorted(by_round[r], key=lambda m: m['matchNumber']) for r in sorted(by_round)]
+    for prev, col in zip(columns, columns[1:]):
+        if len(prev) % len(col):
+            raise ValueError(f'{name}: a round of {len(col)} matches cannot follow one of {len(prev)}; '
+                             f'only elimination brackets can be drawn')
+    return columns
+
+
+def sections(matches):
+    """[(kind, title, columns)] for `matches`: one section, or winners, losers and grand finals."""
+    kinds = {'winners': [], 'losers': [], 'finals': []}
+    for m in matches:
+        kinds[m.get('bracket', 'winners')].append(m)
+    if not kinds['losers']:
+        return [('single', 'Bracket', _columns(kinds['winners'] + kinds['finals'], 'Bracket'))]
+    return [
+        ('winners', 'Winners bracket', _columns(kinds['winners'], 'Winners bracket')),
+        ('losers', 'Losers bracket', _columns(kinds['losers'], 'Losers bracket')),
+        ('finals', 'Grand finals', _columns(kinds['finals'], 'Grand finals')),
+    ]
+
+
+def round_titles(kind, count):
+    if kind == 'finals':
+        return ['Grand final', 'Reset (if needed)'][:count] + [f'Final {i + 3}' for i in range(count - 2)]
+    if kind == 'single':
+        ends = ['Final', 'Semifinals', 'Quarterfinals']
+        return [ends[count - 1 - i] if count - 1 - i < len(ends) else f'Round {i + 1}' for i in range(count)]
+    prefix = 'Winners' if kind == 'winners' else 'Losers'
+    return [f'{prefix} round {i + 1}' for i in range(count - 1)] + [f'{prefix} final']
+
+
+def _placeholders(kind, col):
+    """What an empty slot of a match in `col` is waiting for."""
+    if kind == 'finals':
+        return ('Winners champion', 'Losers champion') if col == 0 else ('', '')
+    if kind == 'losers':
+        if col == 0:
+            return ('Loser, winners round 1',) * 2
+        if col % 2 == 1:  # even losers rounds take the losers of the next winners round
+            return ('', f'Loser, winners round {col // 2 + 2}')
+        return ('', '')
+    return ('BYE', 'BYE') if col == 0 else ('', '')
+
+
+# ----------------------------------------------------------------
+# Tiling
+# ----------------------------------------------------------------
+class Tile:
+    """Columns `first`..`last` of a section under last-column matches `start`..`start + count`."""
+
+    __slots__ = ('index', 'first', 'last', 'start', 'count')
+
+    def __init__(self, index, first, last, start, count):
+        self.index = index
+        self.first = first
+        self.last = last
+        self.start = start
+        self.count = count
+
+    def __repr__(self):
+        return f'Tile({self.index}, rounds {self.first + 1}-{self.last + 1}, matches {self.start}+{self.count})'
+
+
+class Tiling:
+    """A section's tiles, and which tile holds any match."""
+
+    def __init__(self, columns, max_rows=MAX_ROWS, max_cols=MAX_COLS):
+        self.columns = columns
+        self.tiles = []
+        self.bands = []  # (first column, last column, end matches per tile, first tile)
+        self.band_of = []
+        first = 0
+        while first < len(columns):
+            last = first
+            while (last + 1 < len(columns) and last + 1 - first < max_cols
+                   and len(columns[first]) // len(columns[last + 1]) <= max_rows):
+                last += 1
+            per_tile = max(1, max_rows // (len(columns[first]) // len(columns[last])))
+            self.bands.append((first, last, per_tile, len(self.tiles)))
+            self.band_of += [len(self.bands) - 1] * (last - first + 1)
+            for start in range(0, len(columns[last]), per_tile):
+                self.tiles.append(Tile(len(self.tiles), first, last, start, min(per_tile, len(columns[last]) - start)))
+            first = last + 1
+
+    def ratio(self, col, last):
+        """Matches in column `col` per match of column `last`."""
+        return len(self.columns[col]) // len(self.columns[last])
+
+    def tile_of(self, col, match):
+        first, last, per_tile, first_tile = self.bands[self.band_of[col]]
+        return first_tile + match // self.ratio(col, last) // per_tile
+
+
+# ----------------------------------------------------------------
+# Drawing
+# ----------------------------------------------------------------
+def _draw_cell(canvas):
+    canvas.setFillColor(CARD)
+    canvas.setStrokeColor(EDGE)
+    canvas.setLineWidth(0.6)
+    canvas.roundRect(0, 0, CELL_W, CELL_H, 3, stroke=1, fill=1)
+    canvas.setStrokeColor(LINE)
+    canvas.setLineWidth(0.4)
+    canvas.line(0, CELL_H / 2, CELL_W, CELL_H / 2)
+    canvas.line(CELL_W - SCORE_W, 0, CELL_W - SCORE_W, CELL_H)
+
+
+def _fit(text, font, size, width):
+    if stringWidth(text, font, size) <= width:
+        return text
+    while text and stringWidth(text + '…', font, size) > width:
+        text = text[:-1]
+    return text + '…'
+
+
+class BracketTile(Flowable):
+    """One tile of a bracket section; `height` (a page frame's) gives it a page of its own."""
+
+    def __init__(self, kind, title, tiling, tile, names=None, key='bracket', height=None):
+        Flowable.__init__(self)
+        self.kind = kind
+        self.title = title
+        self.tiling = tiling
+        self.tile = tile
+        self.names = names or {}
+        self.key = key
+        cols = tile.last - tile.first + 1
+        self.rows = tile.count * tiling.ratio(tile.first, tile.last)
+        self.width = 2 * MARKER_W + cols * CELL_W + (cols - 1) * COL_GAP
+        content = CAPTION_H + HEADER_H + self.rows * ROW
+        self.height = max(content, height or 0)
+        self.top = self.height - CAPTION_H - HEADER_H
+        self.ys = self._layout()
+
+    def _layout(self):
+        """Cell centre heights per column, each match level with the middle of its feeders."""
+        tile, tiling = self.tile, self.tiling
+        ys = [[self.top - (r + 0.5) * ROW for r in range(self.rows)]]
+        for col in range(tile.first + 1, tile.last + 1):
+            prev = ys[-1]
+            k = len(tiling.columns[col - 1]) // len(tiling.columns[col])
+            ys.append([sum(prev[i:i + k]) / k for i in range(0, len(prev), k)])
+        return ys
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def _matches(self, col):
+        ratio = self.tiling.ratio(col, self.tile.last)
+        return self.tiling.columns[col][self.tile.start * ratio:(self.tile.start + self.tile.count) * ratio]
+
+    def _x(self, col):
+        return MARKER_W + (col - self.tile.first) * (CELL_W + COL_GAP)
+
+    def _name(self, player_id):
+        return self.names.get(player_id, player_id)
+
+    def _anchor(self, index):
+        return f'{self.key}-{index}'
+
+    def draw(self):
+        canv = self.canv
+        tile, tiling = self.tile, self.tiling
+        regular, bold = fonts.face('Helvetica'), fonts.face('Helvetica-Bold')
+        page = canv.getPageNumber()
+        canv.bookmarkPage(self._anchor(tile.index))
+
+        canv.setFillColor(TEXT)
+        canv.setFont(bold, 9)
+        caption = self.title
+        if len(tiling.tiles) > 1:
+            caption += (f'  ·  rounds {tile.first + 1}–{tile.last + 1}  ·  '
+                        f'part {tile.index + 1} of {len(tiling.tiles)}')
+        canv.drawString(MARKER_W, self.height - 10, caption)
+        titles = round_titles(self.kind, len(tiling.columns))
+        canv.setFillColor(MUTED)
+        canv.setFont(regular, 6.5)
+        for col in range(tile.first, tile.last + 1):
+            canv.drawString(self._x(col), self.top + 3, titles[col])
+
+        # Connectors from each pair of feeders to the match they feed.
+        canv.setStrokeColor(LINE)
+        canv.setLineWidth(0.6)
+        path = canv.beginPath()
+        for col in range(tile.first + 1, tile.last + 1):
+            x0 = self._x(col - 1) + CELL_W
+            x1 = self._x(col)
+            mid = (x0 + x1) / 2
+            prev, ys = self.ys[col - 1 - tile.first], self.ys[col - tile.first]
+            k = len(prev) // len(ys)
+            for i, y in enumerate(ys):
+                if k == 1:
+                    y += CELL_H / 4  # a lone feeder goes to the top slot; a drop-in takes the other
+                for y0 in prev[i * k:(i + 1) * k]:
+                    path.moveTo(x0, y0)
+                    path.lineTo(mid, y0)
+                    path.lineTo(mid, y)
+                path.moveTo(mid, y)
+                path.lineTo(x1, y)
+        canv.drawPath(path, stroke=1, fill=0)
+
+        for col in range(tile.first, tile.last + 1):
+            x = self._x(col)
+            waiting = _placeholders(self.kind, col)
+            for m, y in zip(self._matches(col), self.ys[col - tile.first]):
+                canv.saveState()
+                canv.translate(x, y - CELL_H / 2)
+                draw_chrome(canv, 'BracketCell', _draw_cell)
+                canv.restoreState()
+                score = m.get('score') or {}
+                for slot, (field, placeholder) in enumerate(zip(('player1Id', 'player2Id'), waiting)):
+                    base = y + (2 if slot == 0 else -CELL_H / 2 + 3.5)
+                    player = m.get(field) or ''
+                    if player:
+                        won = player == m.get('winnerId')
+                        font = bold if won else regular
+                        canv.setFillColor(TEAL if won else TEXT)
+                        canv.setFont(font, 6.5)
+                        canv.drawString(x + 4, base, _fit(self._name(player), font, 6.5, CELL_W - SCORE_W - 7))
+                    elif placeholder:
+                        canv.setFillColor(FAINT)
+                        canv.setFont(regular, 6)
+                        canv.drawString(x + 4, base, _fit(placeholder, regular, 6, CELL_W - SCORE_W - 7))
+                    value = score.get(f'player{slot + 1}')
+                    if value is not None:
+                        canv.setFillColor(MUTED)
+                        canv.setFont(regular, 6.5)
+                        canv.drawCentredString(x + CELL_W - SCORE_W / 2, base, str(value))
+
+        self._markers(page, regular)
+
+    def _marker(self, text, font, x, y, target, align):
+        canv = self.canv
+        width = stringWidth(text, font, 6)
+        left = x - width if align == 'right' else x
+        canv.drawString(left, y - 2, text)
+        canv.linkRect('', target, (left, y - 3, left + width, y + 4), relative=1, thickness=0)
+
+    def _markers(self, page, font):
+        """Page references to the tiles before and after this one in the section."""
+        canv = self.canv
+        tile, tiling = self.tile, self.tiling
+        if len(tiling.tiles) == 1:
+            return
+        canv.setFillColor(TEAL)
+        canv.setFont(font, 6)
+        if tile.last + 1 < len(tiling.columns):
+            k = len(tiling.columns[tile.last]) // len(tiling.columns[tile.last + 1])
+            x = self._x(tile.last) + CELL_W + 4
+            for m, y in zip(range(tile.start, tile.start + tile.count), self.ys[-1]):
+                target = tiling.tile_of(tile.last + 1, m // k)
+                self._marker(f'p. {page + target - tile.index} »', font, x, y, self._anchor(target), 'left')
+        if tile.first:
+            k = len(tiling.columns[tile.first - 1]) // len(tiling.columns[tile.first])
+            first = tile.start * tiling.ratio(tile.first, tile.last)
+            for m, y in zip(range(first, first + self.rows), self.ys[0]):
+                # Feeders fill the slots from the top.
+                for slot, f in enumerate(range(m * k, (m + 1) * k)):
+                    source = tiling.tile_of(tile.first - 1, f)
+                    self._marker(f'« p. {page + source - tile.index}', font, MARKER_W - 4,
+                                 y + CELL_H / 4 - slot * CELL_H / 2, self._anchor(source), 'right')
+
+
+def bracket_story(matches, names=None, height=None, key='bracket'):
+    """Flowables drawing `matches`; `height` is the page frame's, for tiled sections.
+
+    Sections that fit one tile flow with the rest of the story. The tiles
+    of a larger section take a page each, in reading order: the earliest
+    rounds first, then each later band of rounds.
+    """
+    story = []
+    for kind, title, columns in sections(matches):
+        tiling = Tiling(columns)
+        tiled = len(tiling.tiles) > 1
+        for tile in tiling.tiles:
+            if tiled and height is None:
+                raise ValueError(f'{title} needs {len(tiling.tiles)} pages; pass the frame height')
+            if tiled and story:
+                story.append(PageBreak())
+            story.append(BracketTile(kind, title, tiling, tile, names, f'{key}-{kind}',
+                                     height if tiled else None))
+        if tiled:
+            story.append(PageBreak())
+        else:
+            story.append(Spacer(1, 10))
+    if story and isinstance(story[-1], PageBreak):
+        story.pop()
+    return story
+
+
+# ----------------------------------------------------------------
+# Standalone PDF
+# ----------------------------------------------------------------
+def _page(title):
+    def chrome(canvas):
+        canvas.setFillColor(PAGE)
+        canvas.rect(0, 0, PAGE_SIZE[0], PAGE_SIZE[1], fill=1, stroke=0)
+        canvas.setFillColor(FAINT)
+        canvas.setFont(fonts.face('Helvetica'), 7)
+        canvas.drawCentredString(PAGE_SIZE[0] / 2, 0.3 * inch, title)
+
+    def draw(canvas, doc):
+        canvas.saveState()
+        draw_chrome(canvas, 'BracketPage', chrome)
+        canvas.setFillColor(FAINT)
+        canvas.setFont(fonts.face('Helvetica'), 7)
+        canvas.drawRightString(PAGE_SIZE[0] - 0.6 * inch, 0.3 * inch, f'Page {doc.page}')
+        canvas.restoreState()
+    return draw
+
+
+def render(matches, output, title='Moltblox tournament bracket', names=None):
+    """Render `matches` to `output`, a path or a binary file."""
+    with store.publishing(output) as target:
+        doc = SimpleDocTemplate(target, pagesize=PAGE_SIZE, title=title, **DOC_MARGINS)
+        story = bracket_story(matches, names, doc.height - 12)
+        doc.build(story, onFirstPage=_page(title), onLaterPages=_page(title))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Draw a single or double elimination bracket as a PDF.')
+    parser.add_argument('bracket', nargs='?', help='bracket JSON (BracketGenerator matches or a TournamentBracket)')
+    parser.add_argument('--sample', type=int, metavar='N', help='draw a generated bracket of N entrants instead')
+    parser.add_argument('--double', action='store_true', help='with --sample: double elimination')
+    parser.add_argument('--names', metavar='JSON', help='player id -> display name')
+    parser.add_argument('--title', default='Moltblox tournament bracket')
+    parser.add_argument('-o', '--output', default='bracket.pdf')
+    args = parser.parse_args(argv)
+    if not args.bracket and not args.sample:
+        parser.error('give a bracket file or --sample N')
+
+    matches = sample(args.sample, args.double) if args.sample else load(args.bracket)
+    names = None
+    if args.names:
+        with open(args.names) as f:
+            names = json.load(f)
+    render(matches, args.output, args.title, names)
+    print(f'Generated: {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
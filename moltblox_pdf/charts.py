@@ -0,0 +1,301 @@
+"""
+Small chart flowables for the generated pages.
+
+BandChart draws percentile bands over a shared x axis (a shaded p10-p90
+band under a median line, one per series); Histogram draws binned counts
+on log-spaced edges; TimeSeriesChart draws dense series after reducing
+each to a few hundred points with Largest-Triangle-Three-Buckets, which
+keeps the peaks, cliffs and steps a plain stride would skip. All of them
+size to the width and height they are given and take their colours from
+the caller, so they sit on either document's palette.
+"""
+
+import math
+
+import numpy as np
+from reportlab.lib.colors import HexColor
+from reportlab.platypus import Flowable
+
+_AXIS = HexColor('#4d5766')
+_LABEL = HexColor('#b3b3b3')
+
+
+def compact(value):
+    """1234 -> '1.2K', 2500000 -> '2.5M'."""
+    for size, suffix in ((1e9, 'B'), (1e6, 'M'), (1e3, 'K')):
+        if abs(value) >= size:
+            return f'{value / size:.3g}{suffix}'
+    return f'{value:.3g}'
+
+
+def _nice_ticks(top, count=4):
+    """Round tick values from 0 up to at least `top`."""
+    if top <= 0:
+        return [0, 1]
+    raw = top / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    ticks = [0]
+    while ticks[-1] < top:
+        ticks.append(ticks[-1] + step)
+    return ticks
+
+
+def kept(n, threshold):
+    """How many of `n` points lttb() keeps for `threshold`."""
+    return n if threshold >= n or threshold < 3 else threshold
+
+
+def lttb(x, y, threshold):
+    """Indices of `threshold` points of (x, y) chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept; every bucket in between keeps the
+    point forming the largest triangle with the point kept before it and
+    the mean of the next bucket.
+    """
+    n = len(x)
+    if kept(n, threshold) == n:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+class _Chart(Flowable):
+    """Plot area, title and axes shared by the chart flowables."""
+
+    left, bottom, top = 26, 14, 14
+
+    def __init__(self, width, height, title, font='Helvetica', bold_font='Helvetica-Bold', text=None):
+        Flowable.__init__(self)
+        self.width = width
+        self.height = height
+        self.title = title
+        self.font = font
+        self.bold_font = bold_font
+        self.text = text or HexColor('#ffffff')
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def _plot_box(self):
+        x0, y0 = self.left, self.bottom
+        return x0, y0, self.width - x0 - 4, self.height - y0 - self.top
+
+    def _axes(self, y_ticks, y_scale):
+        canv = self.canv
+        x0, y0, w, h = self._plot_box()
+        canv.setFillColor(self.text)
+        canv.setFont(self.bold_font, 7)
+        canv.drawString(0, self.height - 8, self.title)
+        canv.setStrokeColor(_AXIS)
+        canv.setLineWidth(0.3)
+        canv.setFillColor(_LABEL)
+        canv.setFont(self.font, 5)
+        for tick in y_ticks:
+            y = y0 + tick * y_scale
+            canv.line(x0, y, x0 + w, y)
+            canv.drawRightString(x0 - 2, y - 1.5, compact(tick))
+
+    def _legend(self, series):
+        """Colour key for the labelled series, right-aligned with the title."""
+        canv = self.canv
+        canv.setFont(self.font, 5)
+        right = self.width - 4
+        for s in reversed(series):
+            if not s.get('label'):
+                continue
+            right -= canv.stringWidth(s['label'], self.font, 5)
+            canv.setFillColor(_LABEL)
+            canv.drawString(right, self.height - 8, s['label'])
+            canv.setFillColor(s['color'])
+            canv.rect(right - 7, self.height - 8, 5, 4, stroke=0, fill=1)
+            right -= 12
+
+
+class BandChart(_Chart):
+    """Percentile bands over `x`.
+
+    `series` is a list of dict(low, mid, high, color, label): three
+    sequences the length of `x`, the band drawn from low to high.
+    """
+
+    def __init__(self, x, series, width, height, title, x_label='', **kwargs):
+        _Chart.__init__(self, width, height, title, **kwargs)
+        self.x = list(x)
+        self.series = series
+        self.x_label = x_label
+
+    def draw(self):
+        canv = self.canv
+        x0, y0, w, h = self._plot_box()
+        ticks = _nice_ticks(max(max(s['high']) for s in self.series))
+        sy = h / ticks[-1]
+        first, last = self.x[0], self.x[-1]
+        sx = w / ((last - first) or 1)
+
+        canv.saveState()
+        self._axes(ticks, sy)
+        for s in self.series:
+            points = [x0 + (v - first) * sx for v in self.x]
+            band = canv.beginPath()
+            band.moveTo(points[0], y0 + s['low'][0] * sy)
+            for px, v in zip(points[1:], s['low'][1:]):
+                band.lineTo(px, y0 + v * sy)
+            for px, v in zip(points[::-1], s['high'][::-1]):
+                band.lineTo(px, y0 + v * sy)
+            band.close()
+            canv.setFillColor(s['color'], alpha=0.25)
+            canv.drawPath(band, stroke=0, fill=1)
+            line = canv.beginPath()
+            line.moveTo(points[0], y0 + s['mid'][0] * sy)
+            for px, v in zip(points[1:], s['mid'][1:]):
+                line.lineTo(px, y0 + v * sy)
+            canv.setStrokeColor(s['color'])
+            canv.setLineWidth(0.9)
+            canv.drawPath(line, stroke=1, fill=0)
+
+        canv.setFillColor(_LABEL)
+        canv.setFont(self.font, 5)
+        for v in (first, (first + last) // 2, last):
+            canv.drawCentredString(x0 + (v - first) * sx, y0 - 7, str(v))
+        canv.drawRightString(x0 + w, y0 - 13, self.x_label)
+        self._legend(self.series)
+        canv.restoreState()
+
+
+class Histogram(_Chart):
+    """Bars of `counts` over log-spaced `edges` (len(counts) + 1 values).
+
+    With no counts (nothing to bin) only the axes and "no data" are drawn.
+    """
+
+    def __init__(self, edges, counts, width, height, title, color, x_label='', marker=None, **kwargs):
+        _Chart.__init__(self, width, height, title, **kwargs)
+        self.edges = list(edges)
+        self.counts = list(counts)
+        self.color = color
+        self.x_label = x_label
+        self.marker = marker  # (value, label) drawn as a vertical rule
+
+    def draw(self):
+        canv = self.canv
+        x0, y0, w, h = self._plot_box()
+        ticks = _nice_ticks(max(self.counts, default=0))
+        sy = h / ticks[-1]
+        if not self.counts:
+            canv.saveState()
+            self._axes(ticks, sy)
+            canv.setFillColor(_LABEL)
+            canv.setFont(self.font, 6)
+            canv.drawCentredString(x0 + w / 2, y0 + h / 2, 'no data')
+            canv.restoreState()
+            return
+        lo, hi = math.log10(self.edges[0]), math.log10(self.edges[-1])
+
+        def px(value):
+            return x0 + (math.log10(value) - lo) / ((hi - lo) or 1) * w
+
+        canv.saveState()
+        self._axes(ticks, sy)
+        canv.setFillColor(self.color)
+        for a, b, count in zip(self.edges, self.edges[1:], self.counts):
+            if count:
+                canv.rect(px(a) + 0.3, y0, px(b) - px(a) - 0.6, count * sy, stroke=0, fill=1)
+
+        canv.setFillColor(_LABEL)
+        canv.setFont(self.font, 5)
+        decade = 10 ** math.floor(lo)
+        while decade <= self.edges[-1]:
+            if decade >= self.edges[0]:
+                canv.drawCentredString(px(decade), y0 - 7, compact(decade))
+            decade *= 10
+        canv.drawRightString(x0 + w, y0 - 13, self.x_label)
+        if self.marker:
+            value, label = self.marker
+            canv.setStrokeColor(self.text)
+            canv.setLineWidth(0.6)
+            canv.setDash(2, 1.5)
+            canv.line(px(value), y0, px(value), y0 + h)
+            canv.setDash()
+            canv.setFillColor(self.text)
+            canv.drawString(px(value) + 2, y0 + h - 5, label)
+        canv.restoreState()
+
+
+class TimeSeriesChart(_Chart):
+    """Dense series over a numeric x axis, each downsampled before drawing.
+
+    `series` is a list of dict(x, y, color, label) and optionally
+    fill=True to shade under the line. Each keeps at most `points` points;
+    `drawn` holds how many are kept per series. Series are downsampled
+    when the chart is first drawn, not when it is made. `x_ticks` are
+    the x values to label.
+    """
+
+    def __init__(self, series, width, height, title, x_ticks=(), x_label='', points=300, **kwargs):
+        _Chart.__init__(self, width, height, title, **kwargs)
+        self.raw = list(series)
+        self.points = points
+        self.drawn = [kept(len(s['x']), points) for s in self.raw]
+        self.x_ticks = list(x_ticks)
+        self.x_label = x_label
+        self._series = None
+
+    @property
+    def series(self):
+        if self._series is None:
+            self._series = []
+            for s in self.raw:
+                keep = lttb(s['x'], s['y'], self.points)
+                self._series.append(dict(s, x=np.asarray(s['x'])[keep].tolist(), y=np.asarray(s['y'])[keep].tolist()))
+        return self._series
+
+    def draw(self):
+        canv = self.canv
+        x0, y0, w, h = self._plot_box()
+        ticks = _nice_ticks(max(max(s['y']) for s in self.series))
+        sy = h / ticks[-1]
+        first = min(s['x'][0] for s in self.series)
+        last = max(s['x'][-1] for s in self.series)
+        sx = w / ((last - first) or 1)
+
+        canv.saveState()
+        self._axes(ticks, sy)
+        for s in self.series:
+            points = [(x0 + (vx - first) * sx, y0 + vy * sy) for vx, vy in zip(s['x'], s['y'])]
+            if s.get('fill'):
+                area = canv.beginPath()
+                area.moveTo(points[0][0], y0)
+                for px, py in points:
+                    area.lineTo(px, py)
+                area.lineTo(points[-1][0], y0)
+                area.close()
+                canv.setFillColor(s['color'], alpha=0.2)
+                canv.drawPath(area, stroke=0, fill=1)
+            line = canv.beginPath()
+            line.moveTo(*points[0])
+            for px, py in points[1:]:
+                line.lineTo(px, py)
+            canv.setStrokeColor(s['color'])
+            canv.setLineWidth(0.9)
+            canv.drawPath(line, stroke=1, fill=0)
+
+        canv.setFillColor(_LABEL)
+        canv.setFont(self.font, 5)
+        for v in self.x_ticks:
+            canv.drawCentredString(x0 + (v - first) * sx, y0 - 7, compact(v))
+        canv.drawRightString(x0 + w, y0 - 13, self.x_label)
+        self._legend(self.series)
+        canv.restoreState()
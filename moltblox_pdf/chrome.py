@@ -0,0 +1,17 @@
+"""
+Page chrome drawn once per document.
+
+Backgrounds and fixed footer captions are identical on every page, so they
+are recorded as a form XObject the first time they're drawn and every
+later page just references it. In the combined handbook each part's chrome
+is its own form, embedded once for the whole book.
+"""
+
+
+def draw_chrome(canvas, name, draw):
+    """Draw `draw(canvas)` via the shared form `name`, recording it on first use."""
+    if not canvas.hasForm(name):
+        canvas.beginForm(name)
+        draw(canvas)
+        canvas.endForm()
+    canvas.doForm(name)
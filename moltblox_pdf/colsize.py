@@ -0,0 +1,91 @@
+"""
+Automatic column widths for reference tables.
+
+Each column is described by groups of (texts, style): the cell texts that
+are set in that style. A column's extent is its narrowest usable width
+(the longest unbreakable word, since Paragraphs only wrap at spaces) and
+its natural width (the longest cell set on one line). Widths are then
+solved under the frame width the way browsers size auto-layout tables:
+every column gets its minimum, and the remaining space is shared in
+proportion to how much more each column would like.
+
+Text is measured a whole column at a time: the texts are joined into one
+array of code points, each code point is mapped to its glyph width
+through a per-font lookup of the distinct characters, and word and cell
+widths are summed with NumPy rather than per-cell loops, so tables with
+tens of thousands of rows size in milliseconds.
+"""
+
+import numpy as np
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+# Left + right padding of a default table cell.
+CELL_PADDING = 12
+
+_NEWLINE, _SPACE = 10, 32
+
+# Font name -> {code point: width at 1pt}.
+_glyph_widths = {}
+
+
+def _widths(codes, font_name):
+    """Glyph widths at 1pt for an array of code points."""
+    if not codes.size:
+        return np.zeros(0)
+    known = _glyph_widths.setdefault(font_name, {})
+    present = np.flatnonzero(np.bincount(codes))
+    lookup = np.zeros(present[-1] + 1)
+    for cp in present.tolist():
+        if cp not in known:
+            known[cp] = stringWidth(chr(cp), font_name, 1) if cp != _NEWLINE else 0.0
+        lookup[cp] = known[cp]
+    return lookup[codes]
+
+
+def extent(texts, font_name, font_size):
+    """(longest word, longest cell) widths in points for plain `texts`."""
+    joined = '\n'.join(t.replace('\n', ' ') for t in texts)
+    if not joined:
+        return 0.0, 0.0  # no texts, or a single empty one
+    codes = np.frombuffer(joined.encode('utf-32-le'), dtype='<u4')
+    widths = _widths(codes, font_name) * font_size
+
+    breaks = (codes == _NEWLINE) | (codes == _SPACE)
+    cells = np.bincount(np.cumsum(codes == _NEWLINE), weights=widths)
+    words = np.bincount(np.cumsum(breaks), weights=np.where(breaks, 0.0, widths))
+    return float(words.max()), float(cells.max())
+
+
+def column_extent(groups, padding=CELL_PADDING):
+    """(min, max) width of a column given [(texts, ParagraphStyle), ...]."""
+    lo = hi = 0.0
+    for texts, style in groups:
+        a, b = extent(list(texts), style.fontName, style.fontSize)
+        lo, hi = max(lo, a), max(hi, b)
+    return lo + padding, hi + padding
+
+
+def solve(mins, maxs, avail):
+    """Column widths summing to `avail` from per-column (min, max) extents."""
+    mins = np.asarray(mins, dtype=float)
+    maxs = np.maximum(np.asarray(maxs, dtype=float), mins)
+    if mins.sum() >= avail:
+        # Too narrow even for the longest words; shrink and let them split.
+        widths = mins * (avail / mins.sum())
+    elif maxs.sum() <= avail:
+        widths = maxs * (avail / maxs.sum())
+    else:
+        slack = maxs - mins
+        widths = mins + slack * ((avail - mins.sum()) / slack.sum())
+    return widths.tolist()
+
+
+def auto_widths(columns, avail, padding=CELL_PADDING):
+    """Column widths for `columns`, each a list of (texts, style) groups.
+
+    `padding` is the horizontal cell padding, a number or one per column.
+    """
+    if np.isscalar(padding):
+        padding = [padding] * len(columns)
+    extents = [column_extent(groups, pad) for groups, pad in zip(columns, padding)]
+    return solve([e[0] for e in extents], [e[1] for e in extents], avail)
@@ -0,0 +1,105 @@
+"""
+Draft renders: the same pages without the decoration.
+
+An author checking copy and page breaks doesn't need cell backgrounds,
+table rules, rounded corners, the page glow, the charts, the diagrams or
+the bracket drawings. In draft mode the generators strip table
+backgrounds, rules and corner clipping, draw charts, layered graphs and
+bracket tiles as outlined placeholders of their final size (so graph
+layouts and chart downsampling, which only run when those are drawn,
+never run), keep only a flat page background and write the PDF
+uncompressed.
+
+Text is laid out once: tables and KeepTogether wrap their Paragraphs
+again every time they are measured or drawn, and a draft Paragraph
+keeps the lines of its last wrap for as long as it is offered the same
+width.
+
+Only drawing changes. Padding, spans, fonts and every flowable's size
+stay as they are, and the story is prepared after pagination, so page
+breaks are the ones the full render gets; the guide's layout cache is
+shared with full builds for the same reason.
+"""
+
+from reportlab.platypus import Paragraph, Table
+
+from .bracket import BracketTile
+from .charts import _Chart
+from .graph import LayeredGraph
+from .lazy import LazyFlowable
+from .outline import walk
+
+enabled = False
+
+
+def enable():
+    """Switch this process's builds to draft renders."""
+    global enabled
+    enabled = True
+
+
+def doc_options():
+    """Extra document template arguments for the current mode."""
+    return {'pageCompression': 0} if enabled else {}
+
+
+def strip(table):
+    """Drop the backgrounds, rules and rounded corners of `table`, in place."""
+    table._bkgrndcmds = []
+    table._linecmds = []
+    table._cornerRadii = None
+    return table
+
+
+def _placeholder(self):
+    canv = self.canv
+    canv.saveState()
+    canv.setStrokeColorRGB(0.4, 0.4, 0.4)
+    canv.setFillColorRGB(0.6, 0.6, 0.6)
+    canv.setLineWidth(0.5)
+    canv.rect(0, 0, self.width, self.height, stroke=1, fill=0)
+    canv.setFont('Helvetica', 7)
+    canv.drawString(4, self.height - 10, f'[{type(self).__name__}] {getattr(self, "title", "")}')
+    canv.restoreState()
+
+
+def _wrap_once(self, availWidth, availHeight):
+    # A Paragraph's lines depend only on the width it is given.
+    if self._draft_wrap is None or self._draft_wrap[0] != availWidth:
+        self._draft_wrap = availWidth, type(self).wrap(self, availWidth, availHeight)
+    return self._draft_wrap[1]
+
+
+def _prepare(f):
+    if isinstance(f, Table):
+        strip(f)
+    elif isinstance(f, Paragraph):
+        f._draft_wrap = None
+        f.wrap = _wrap_once.__get__(f)
+    elif isinstance(f, (_Chart, LayeredGraph, BracketTile)):
+        f.draw = _placeholder.__get__(f)
+    elif isinstance(f, LazyFlowable) and not isinstance(f.record, _Stripped):
+        f.record = _Stripped(f.record)
+
+
+class _Stripped:
+    """Lazy-flowable record whose built flowable is stripped on build."""
+
+    def __init__(self, record):
+        self.record = record
+
+    def __getattr__(self, name):
+        return getattr(self.record, name)
+
+    def build(self):
+        built = self.record.build()
+        for f in walk([built]):
+            _prepare(f)
+        return built
+
+
+def prepare(story):
+    """Strip the decoration from a paginated story, in place; returns it."""
+    for f in walk(story):
+        _prepare(f)
+    return story
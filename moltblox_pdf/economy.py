@@ -0,0 +1,290 @@
+"""
+Monte Carlo model of the MOLT economy for the Revenue Flow page.
+
+The revenue rules come from the contracts: GameMarketplace's creator /
+platform split (floor division, remainder to the treasury) and
+TournamentManager's prize presets, including its 2- and 3-player cases
+and the participation pool shared by non-winners with the remainder going
+to first place. Circulating supply comes from the allocation and unlock
+schedule in docs/tokenomics-model.md and scales how much the economy
+trades each month; unlocked() evaluates the same schedule at any time
+resolution for the unlock charts.
+
+Every run, month, purchase and tournament is a row in a NumPy array; runs
+are processed in batches so memory stays bounded, and nothing loops per
+transaction. A seeded run is reproducible (for a given NumPy version) and
+its summary is cached under the parameters that produced it.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+from . import CACHE_DIR, REPO_ROOT, store
+
+CONTRACTS_DIR = os.path.join(REPO_ROOT, 'contracts', 'src')
+ECONOMY_CACHE_DIR = os.path.join(CACHE_DIR, 'economy')
+MODEL_VERSION = 1
+
+# Allocation (docs/tokenomics-model.md, section 1).
+TOTAL_SUPPLY = 1_000_000_000
+ALLOCATIONS = {
+    'airdrop': 650_000_000,
+    'team': 150_000_000,
+    'development': 100_000_000,
+    'liquidity': 50_000_000,
+    'treasury': 50_000_000,
+}
+# Season share of the airdrop pool and the month its distribution lands.
+SEASONS = ((0.10, 3), (0.15, 6), (0.30, 12), (0.45, 24))
+TEAM_CLIFF, TEAM_VEST = 12, 24
+TREASURY_CLIFF, TREASURY_UNLOCK, TREASURY_FULL = 6, 4_166_667, 36
+DEV_LOCK, DEV_QUARTERLY_MAX, DEV_BURN = 18, 10_000_000, 48
+HOURS_PER_MONTH = 730
+
+# Demand assumptions; the tokenomics doc sets supply, not trading volume.
+SEED = 2026
+MONTHS = 24
+RUNS = 256
+BATCH_RUNS = 32
+PURCHASES_PER_MONTH = 120  # at TGE circulating supply
+TOURNAMENTS_PER_MONTH = 12
+DEMAND_ELASTICITY = 0.8  # volume ~ circulating ** elasticity
+DEMAND_SIGMA = 0.35  # run-to-run spread of demand (lognormal)
+CREATORS = 2000
+CREATOR_ZIPF = 1.1  # popularity of the creator at rank r ~ r ** -s
+ITEM_PRICE, ITEM_SIGMA = 100, 1.0  # median MOLT per purchase
+ENTRY_FEE, ENTRY_SIGMA = 25, 0.8
+SPONSOR_PRIZE, SPONSOR_SIGMA = 1000, 1.0
+MEAN_EXTRA_ENTRANTS = 24  # entrants beyond the minimum of two (geometric)
+
+PERCENTILES = (10, 50, 90)
+HISTOGRAM_BINS = 24
+
+
+def contract_terms(src=CONTRACTS_DIR):
+    """Revenue constants read from the Solidity sources."""
+    with open(os.path.join(src, 'GameMarketplace.sol')) as f:
+        market = f.read()
+    with open(os.path.join(src, 'TournamentManager.sol')) as f:
+        tournament = f.read()
+
+    def constant(text, name):
+        return int(re.search(rf'\b{name}\s*=\s*(\d+)', text).group(1))
+
+    preset = re.search(r'PrizeDistribution\(\{([^}]*)\}\)', tournament).group(1)
+    prizes = {k: int(v) for k, v in re.findall(r'(\w+)\s*:\s*(\d+)', preset)}
+    return {
+        'creator_share': constant(market, 'CREATOR_SHARE'),
+        'platform_share': constant(market, 'PLATFORM_SHARE'),
+        'share_denominator': constant(market, 'SHARE_DENOMINATOR'),
+        'prizes': [prizes['first'], prizes['second'], prizes['third'], prizes['participation']],
+        'max_participants': constant(tournament, 'MAX_PARTICIPANTS_CAP'),
+    }
+
+
+def unlock_schedule(months=MONTHS):
+    """{allocation: tokens unlocked in each month 1..months} (numpy arrays)."""
+    horizon = max(months, DEV_BURN)
+    month = np.arange(1, horizon + 1)
+    out = {name: np.zeros(horizon) for name in ALLOCATIONS}
+    out['liquidity'][0] = ALLOCATIONS['liquidity']
+    for share, at in SEASONS:
+        out['airdrop'][at - 1] += ALLOCATIONS['airdrop'] * share
+    vesting = (month > TEAM_CLIFF) & (month <= TEAM_CLIFF + TEAM_VEST)
+    out['team'][vesting] = ALLOCATIONS['team'] / TEAM_VEST
+    # Quarterly after the cliff; whatever is left lands at the full-unlock month.
+    quarters = (month > TREASURY_CLIFF) & (month < TREASURY_FULL) & ((month - TREASURY_CLIFF - 1) % 3 == 0)
+    out['treasury'][quarters] = TREASURY_UNLOCK
+    out['treasury'][TREASURY_FULL - 1] = ALLOCATIONS['treasury'] - out['treasury'].sum()
+    # The governance ceiling: the most the development fund can release.
+    quarters = (month > DEV_LOCK) & (month <= DEV_BURN) & ((month - DEV_LOCK - 1) % 3 == 0)
+    released = np.minimum(np.cumsum(quarters * DEV_QUARTERLY_MAX), ALLOCATIONS['development'])
+    out['development'] = np.diff(released, prepend=0)
+    return {name: tokens[:months] for name, tokens in out.items()}
+
+
+def circulating(months=MONTHS):
+    """Cumulative circulating supply at the end of each month."""
+    return np.cumsum(sum(unlock_schedule(months).values()))
+
+
+def unlocked(t):
+    """{allocation: tokens unlocked by time `t`} for an array of months since TGE.
+
+    Month m's unlocks land at t = m, except the liquidity pool (at TGE)
+    and the team allocation, which the vesting contract releases
+    continuously between the end of the cliff and the end of the vest.
+    """
+    t = np.asarray(t, dtype=float)
+    horizon = int(np.ceil(t.max())) if t.size else 0
+    schedule = unlock_schedule(max(horizon, DEV_BURN))
+    index = np.clip(np.floor(t).astype(int), 0, None)
+    out = {}
+    for name, monthly in schedule.items():
+        cumulative = np.concatenate([[0.0], np.cumsum(monthly)])
+        out[name] = cumulative[np.minimum(index, len(monthly))]
+    out['liquidity'] = np.where(t >= 0, ALLOCATIONS['liquidity'], 0.0)
+    out['team'] = np.clip((t - TEAM_CLIFF) / TEAM_VEST, 0, 1) * ALLOCATIONS['team']
+    return out
+
+
+def timeline(months=DEV_BURN, samples_per_month=HOURS_PER_MONTH):
+    """Sample times (months since TGE) at `samples_per_month` resolution."""
+    return np.arange(months * samples_per_month + 1) / samples_per_month
+
+
+def _lognormal(rng, median, sigma, size):
+    # Whole tokens, at least one.
+    return np.maximum(1, rng.lognormal(np.log(median), sigma, size)).astype(np.int64)
+
+
+def _purchases(rng, rates, terms, popularity):
+    """Per-run monthly creator / platform totals and per-creator earnings."""
+    runs, months = rates.shape
+    counts = rng.poisson(rates)
+    slot = np.repeat(np.arange(runs * months), counts.ravel())
+    price = _lognormal(rng, ITEM_PRICE, ITEM_SIGMA, slot.size)
+    creator_cut = price * terms['creator_share'] // terms['share_denominator']
+    platform_cut = price - creator_cut
+
+    creator = np.searchsorted(popularity, rng.random(slot.size) * popularity[-1])
+    earner = slot // months * CREATORS + creator
+    return {
+        'creator': np.bincount(slot, creator_cut, runs * months).reshape(runs, months),
+        'platform': np.bincount(slot, platform_cut, runs * months).reshape(runs, months),
+        'earnings': np.bincount(earner, creator_cut, runs * CREATORS).reshape(runs, CREATORS),
+        'count': int(slot.size),
+    }
+
+
+def _tournaments(rng, rates, terms):
+    """Per-run monthly payouts, pool shares by place and non-winner returns."""
+    runs, months = rates.shape
+    counts = rng.poisson(rates)
+    slot = np.repeat(np.arange(runs * months), counts.ravel())
+    size = slot.size
+    n = np.minimum(1 + rng.geometric(1 / (MEAN_EXTRA_ENTRANTS + 1), size), terms['max_participants'])
+    fee = _lognormal(rng, ENTRY_FEE, ENTRY_SIGMA, size)
+    pool = _lognormal(rng, SPONSOR_PRIZE, SPONSOR_SIGMA, size) + fee * n
+
+    first_pct, second_pct, third_pct, _ = terms['prizes']
+    # TournamentManager._distributePrizes, all three branches at once.
+    first = pool * first_pct // 100
+    second = pool * second_pct // 100
+    third = pool * third_pct // 100
+    rest = pool - first - second - third
+    others = np.maximum(n - 3, 1)
+    reward = np.where(n > 3, rest // others, 0)
+    first = np.where(n > 3, first + rest - reward * others, first)
+    two = n == 2
+    first = np.where(two, pool * first_pct // (first_pct + second_pct), first)
+    second = np.where(two, pool - first, second)
+    third = np.where(two, 0, np.where(n == 3, pool - first - second, third))
+    participation = np.where(n > 3, reward * (n - 3), 0)
+
+    paid = first + second + third + participation
+    return {
+        'payouts': np.bincount(slot, paid, runs * months).reshape(runs, months),
+        'places': np.array([first.sum(), second.sum(), third.sum(), participation.sum()], dtype=float),
+        'returns': reward[n > 3] / fee[n > 3],
+        'return_weights': (n - 3)[n > 3],
+        'count': int(size),
+        'entries': int(n.sum()),
+    }
+
+
+def _bands(values):
+    return {f'p{p}': v.tolist() for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES, axis=0))}
+
+
+def _log_histogram(values, weights=None):
+    values = np.asarray(values, dtype=float)
+    keep = values > 0
+    values = values[keep]
+    weights = None if weights is None else np.asarray(weights, dtype=float)[keep]
+    if not values.size:
+        return {'edges': [], 'counts': []}  # e.g. a cohort with no purchases
+    lo, hi = np.log10(values.min()), np.log10(values.max())
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5  # one distinct value: a decade around it
+    edges = np.logspace(lo, hi, HISTOGRAM_BINS + 1)
+    counts, _ = np.histogram(values, edges, weights=weights)
+    return {'edges': edges.tolist(), 'counts': counts.tolist()}
+
+
+def run(seed=SEED, runs=RUNS, months=MONTHS, terms=None):
+    """Simulate `runs` economies for `months` months; plain-data summary."""
+    terms = terms or contract_terms()
+    rng = np.random.default_rng(seed)
+    supply = circulating(months)
+    scale = (supply / supply[0]) ** DEMAND_ELASTICITY
+    ranks = np.arange(1, CREATORS + 1)
+    popularity = np.cumsum(ranks ** -CREATOR_ZIPF)
+
+    creator, platform, payouts, earnings, returns, weights = [], [], [], [], [], []
+    places = np.zeros(4)
+    purchases = tournaments = entries = 0
+    for start in range(0, runs, BATCH_RUNS):
+        batch = min(BATCH_RUNS, runs - start)
+        demand = rng.lognormal(0, DEMAND_SIGMA, (batch, 1)) * scale
+        bought = _purchases(rng, PURCHASES_PER_MONTH * demand, terms, popularity)
+        played = _tournaments(rng, TOURNAMENTS_PER_MONTH * demand, terms)
+        creator.append(bought['creator'])
+        platform.append(bought['platform'])
+        earnings.append(bought['earnings'].ravel())
+        payouts.append(played['payouts'])
+        places += played['places']
+        returns.append(played['returns'])
+        weights.append(played['return_weights'])
+        purchases += bought['count']
+        tournaments += played['count']
+        entries += played['entries']
+
+    creator, platform = np.vstack(creator), np.vstack(platform)
+    earnings = np.concatenate(earnings)
+    returns, weights = np.concatenate(returns), np.concatenate(weights)
+    top = np.sort(earnings.reshape(runs, CREATORS), axis=1)[:, -CREATORS // 100:].sum(axis=1)
+    order = np.argsort(returns)
+    cumulative = np.cumsum(weights[order])
+    return {
+        'seed': seed,
+        'runs': runs,
+        'months': months,
+        'terms': terms,
+        'circulating': supply.tolist(),
+        'purchases': purchases,
+        'tournaments': tournaments,
+        'entries': entries,
+        'creator': _bands(creator),
+        'platform': _bands(platform),
+        'payouts': _bands(np.vstack(payouts)),
+        'platform_share': float(platform.sum() / (creator.sum() + platform.sum())),
+        'place_shares': (places / places.sum()).tolist(),
+        'creator_earnings': _log_histogram(earnings),
+        'top_creator_share': float(np.median(top / earnings.reshape(runs, CREATORS).sum(axis=1))),
+        'entrant_returns': _log_histogram(returns, weights),
+        'median_return': float(returns[order][np.searchsorted(cumulative, cumulative[-1] / 2)]),
+    }
+
+
+def _params(seed, runs, months, terms):
+    model = {k: v for k, v in globals().items() if k.isupper() and k not in ('CONTRACTS_DIR', 'ECONOMY_CACHE_DIR')}
+    return json.dumps([model, seed, runs, months, terms, np.__version__], sort_keys=True, default=str)
+
+
+def simulate(seed=SEED, runs=RUNS, months=MONTHS, cache_dir=ECONOMY_CACHE_DIR):
+    """run() summary, from the cache when these parameters ran before."""
+    terms = contract_terms()
+    key = hashlib.sha256(_params(seed, runs, months, terms).encode()).hexdigest()
+    cache_path = os.path.join(cache_dir, f'{key}.json')
+    cached = store.load_json(cache_path)
+    if cached:
+        return cached
+
+    summary = run(seed, runs, months, terms)
+    store.write_atomic(cache_path, json.dumps(summary, separators=(',', ':')))
+    return summary
@@ -0,0 +1,134 @@
+"""
+Brand fonts for the PDF generators.
+
+By default both generators use the built-in Helvetica/Courier faces. Calling
+use_brand_fonts() registers a directory of TTF files in their place. Parsed
+fonts are pickled into a cache keyed by the font file hash, so only the
+first run pays for parsing; reportlab still subsets each document to the
+glyphs it actually uses.
+"""
+
+import functools
+import glob
+import hashlib
+import operator
+import os
+import pickle
+from weakref import WeakKeyDictionary
+
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from . import CACHE_DIR, store
+
+FONT_CACHE_DIR = os.path.join(CACHE_DIR, 'fonts')
+
+# Built-in face -> registered brand face. Empty means "use the built-ins".
+_substitutes = {}
+# Registered brand face -> font file hash, for layout cache keys.
+_digests = {}
+
+# Filename style suffix -> built-in face it replaces.
+_TEXT_FACES = {
+    'regular': 'Helvetica',
+    'bold': 'Helvetica-Bold',
+    'italic': 'Helvetica-Oblique',
+    'regularitalic': 'Helvetica-Oblique',
+    'oblique': 'Helvetica-Oblique',
+    'bolditalic': 'Helvetica-BoldOblique',
+    'boldoblique': 'Helvetica-BoldOblique',
+}
+_MONO_FACES = {
+    'regular': 'Courier',
+    'bold': 'Courier-Bold',
+}
+
+
+def face(name):
+    """Return the font to use in place of built-in face `name`."""
+    return _substitutes.get(name, name)
+
+
+def signature():
+    """Identifies the active fonts; layout measured under other fonts is stale."""
+    return ','.join(f'{name}={digest}' for name, digest in sorted(_digests.items()))
+
+
+def restyle(styles):
+    """Point each ParagraphStyle at the brand faces, in place."""
+    for style in styles:
+        style.fontName = face(style.fontName)
+
+
+def _digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_font(name, path, cache_dir=FONT_CACHE_DIR):
+    """Load a TTF, reusing the parsed metrics and glyph data from the cache."""
+    digest = _digest(path)
+    key = f'{digest}-rl{reportlab.Version}'
+    cache_path = os.path.join(cache_dir, key + '.pickle')
+    try:
+        with open(cache_path, 'rb') as f:
+            font = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        font = TTFont(name, path)
+        # The face keeps its units-per-em scale as a lambda, which can't be
+        # pickled; swap in an equivalent partial.
+        font.face._pdfScale = functools.partial(operator.mul, 1000 / font.face.unitsPerEm)
+        # Per-document subset state is a WeakKeyDictionary and is never cached.
+        state, font.state = font.state, None
+        store.write_atomic(cache_path, pickle.dumps(font, protocol=pickle.HIGHEST_PROTOCOL))
+        font.state = state
+    else:
+        font.fontName = name
+        font.state = WeakKeyDictionary()
+    _digests[name] = digest
+    return font
+
+
+def _classify(path):
+    """Map e.g. Inter-Bold.ttf or JetBrainsMono-Regular.ttf to a built-in face."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    family, _, style = stem.rpartition('-')
+    faces = _MONO_FACES if ('Mono' in family or 'Code' in family) else _TEXT_FACES
+    return faces.get(style.lower())
+
+
+def use_brand_fonts(font_dir, prefix='Brand', cache_dir=FONT_CACHE_DIR):
+    """Register the TTFs in `font_dir` as replacements for the built-in faces.
+
+    Files are matched by their style suffix (-Regular, -Bold, -Italic,
+    -BoldItalic); families with Mono or Code in the name replace Courier.
+    Returns the built-in -> brand face mapping.
+    """
+    found = {}
+    for path in sorted(glob.glob(os.path.join(font_dir, '*.ttf'))):
+        builtin = _classify(path)
+        if builtin and builtin not in found:
+            found[builtin] = path
+    if 'Helvetica' not in found:
+        raise ValueError(f'no *-Regular.ttf brand font found in {font_dir}')
+
+    for builtin, path in found.items():
+        name = f'{prefix}-{builtin}'
+        pdfmetrics.registerFont(load_font(name, path, cache_dir))
+        _substitutes[builtin] = name
+
+    # Let <b> and <i> markup resolve to the brand faces too.
+    for regular, bold, italic, bold_italic in (
+        ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique'),
+        ('Courier', 'Courier-Bold', 'Courier-Oblique', 'Courier-BoldOblique'),
+    ):
+        if regular in _substitutes:
+            pdfmetrics.registerFontFamily(
+                face(regular), normal=face(regular), bold=face(bold),
+                italic=face(italic), boldItalic=face(bold_italic),
+            )
+    return dict(_substitutes)
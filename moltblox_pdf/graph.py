@@ -0,0 +1,312 @@
+"""
+Layered graph layout and drawing for the generated diagram pages.
+
+A small Sugiyama-style pipeline: break cycles, assign layers by longest
+path (parents above children), cap each layer's width by pushing down the
+nodes with the most room below them, route long edges through dummy
+nodes, order each layer by barycenter sweeps (keeping the ordering with
+the fewest crossings), then place nodes by relaxing them toward their
+neighbours while keeping boxes apart. LayeredGraph draws the result.
+"""
+
+from reportlab.lib.colors import HexColor
+from reportlab.platypus import Flowable
+
+# Sweeps of the barycenter ordering and of coordinate relaxation.
+ORDER_SWEEPS = 12
+PLACE_SWEEPS = 8
+
+# Dummy nodes are edge bends, not boxes: thin and packed close.
+_DUMMY_WIDTH = 2
+_DUMMY_GAP = 2
+
+# Share of a layer's width left free for the edges passing through it.
+EDGE_ROOM = 0.1
+
+
+def _edge_lists(nodes, edges):
+    parents = {n: [] for n in nodes}
+    children = {n: [] for n in nodes}
+    for u, v in edges:
+        children[u].append(v)
+        parents[v].append(u)
+    return parents, children
+
+
+def acyclic(nodes, edges):
+    """Edges with self-loops dropped and back edges (found by DFS) reversed."""
+    children = {n: [] for n in nodes}
+    for u, v in edges:
+        if u != v:
+            children[u].append(v)
+    state, back = {}, set()
+    for root in nodes:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(children[root]))]
+        while stack:
+            node, it = stack[-1]
+            for child in it:
+                if state.get(child) == 1:
+                    back.add((node, child))
+                elif child not in state:
+                    state[child] = 1
+                    stack.append((child, iter(children[child])))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+    return [(v, u) if (u, v) in back else (u, v) for u, v in edges if u != v]
+
+
+def topological(nodes, edges):
+    """Nodes in dependency order (parents first), stable in input order."""
+    parents, children = _edge_lists(nodes, edges)
+    pending = {n: len(parents[n]) for n in nodes}
+    ready = [n for n in nodes if not pending[n]]
+    out = []
+    while ready:
+        n = ready.pop(0)
+        out.append(n)
+        for c in children[n]:
+            pending[c] -= 1
+            if not pending[c]:
+                ready.append(c)
+    return out
+
+
+def assign_layers(nodes, edges, max_width=None):
+    """{node: layer} with every edge pointing to a lower layer."""
+    parents, children = _edge_lists(nodes, edges)
+    order = topological(nodes, edges)
+    layer = {}
+    for n in order:
+        layer[n] = max((layer[p] + 1 for p in parents[n]), default=0)
+    if not max_width:
+        return layer
+
+    def room(n, current):
+        # Layers a node can drop before it collides with its nearest child.
+        return min((layer[c] for c in children[n]), default=float('inf')) - current - 1
+
+    current = 0
+    while current <= max(layer.values()):
+        members = [n for n in order if layer[n] == current]
+        if len(members) > max_width:
+            members.sort(key=lambda n: room(n, current))
+            for n in members[max_width:]:
+                layer[n] = current + 1
+            for n in order:
+                layer[n] = max([layer[n]] + [layer[p] + 1 for p in parents[n]])
+        current += 1
+    return layer
+
+
+def _crossings(upper, lower, links):
+    pos_u = {n: i for i, n in enumerate(upper)}
+    pos_l = {n: i for i, n in enumerate(lower)}
+    pairs = sorted((pos_u[u], pos_l[v]) for u, v in links if u in pos_u and v in pos_l)
+    count = 0
+    for i, (a, b) in enumerate(pairs):
+        for c, d in pairs[i + 1:]:
+            if c > a and d < b:
+                count += 1
+    return count
+
+
+class Layout:
+    """Result of layered_layout(): layers of node ids and x positions."""
+
+    __slots__ = ('layers', 'x', 'routes', 'widths')
+
+    def __init__(self, layers, x, routes, widths):
+        self.layers = layers  # [[node or dummy id, ...], ...] top to bottom
+        self.x = x  # id -> centre x
+        self.routes = routes  # (u, v) -> [ids from u to v, dummies between]
+        self.widths = widths  # id -> box width
+
+    def layer_of(self):
+        return {n: i for i, members in enumerate(self.layers) for n in members}
+
+
+def layered_layout(nodes, edges, width, box_width, gap=10, max_width=None):
+    """Lay out `nodes` with `edges` (parent, child) pairs across `width` points."""
+    nodes = list(nodes)
+    edges = acyclic(nodes, list(dict.fromkeys(edges)))
+    if max_width is None:
+        max_width = max(1, int((width * (1 - EDGE_ROOM) + gap) // (box_width + gap)))
+    layer = assign_layers(nodes, edges, max_width)
+
+    # Long edges go through one dummy per layer they cross.
+    levels = [[] for _ in range(max(layer.values(), default=-1) + 1)]
+    for n in topological(nodes, edges):
+        levels[layer[n]].append(n)
+    widths = {n: box_width for n in nodes}
+    routes, links = {}, []
+    for u, v in edges:
+        path = [u]
+        for k in range(layer[u] + 1, layer[v]):
+            dummy = ('dummy', u, v, k)
+            levels[k].append(dummy)
+            widths[dummy] = _DUMMY_WIDTH
+            path.append(dummy)
+        path.append(v)
+        routes[(u, v)] = path
+        links.extend(zip(path, path[1:]))
+
+    up = {}
+    down = {}
+    for a, b in links:
+        down.setdefault(a, []).append(b)
+        up.setdefault(b, []).append(a)
+
+    def total_crossings(ls):
+        return sum(_crossings(ls[i], ls[i + 1], links) for i in range(len(ls) - 1))
+
+    best, best_cost = [list(level) for level in levels], total_crossings(levels)
+    for sweep in range(ORDER_SWEEPS):
+        downward = sweep % 2 == 0
+        indices = range(1, len(levels)) if downward else range(len(levels) - 2, -1, -1)
+        for i in indices:
+            ref = {n: j for j, n in enumerate(levels[i - 1 if downward else i + 1])}
+            neighbours = up if downward else down
+            current = {n: j for j, n in enumerate(levels[i])}
+
+            def barycenter(n):
+                linked = [ref[m] for m in neighbours.get(n, ()) if m in ref]
+                return sum(linked) / len(linked) if linked else current[n]
+
+            levels[i].sort(key=barycenter)
+        cost = total_crossings(levels)
+        if cost < best_cost:
+            best, best_cost = [list(level) for level in levels], cost
+    levels = best
+
+    # Pack each layer centred, then relax toward neighbours.
+    x = {}
+    for level in levels:
+        span = sum(widths[n] for n in level) + gap * (len(level) - 1)
+        cursor = (width - span) / 2
+        for n in level:
+            x[n] = cursor + widths[n] / 2
+            cursor += widths[n] + gap
+    for _ in range(PLACE_SWEEPS):
+        for level in levels:
+            for n in level:
+                linked = up.get(n, []) + down.get(n, [])
+                if linked:
+                    x[n] = (x[n] + sum(x[m] for m in linked) / len(linked)) / 2
+            _separate(level, x, widths, gap, width, set(nodes))
+    return Layout(levels, x, routes, widths)
+
+
+def _separate(level, x, widths, gap, width, real):
+    """Push boxes apart in layer order and back inside [0, width]."""
+    if not level:
+        return
+
+    def sep(a, b):
+        space = gap if a in real and b in real else _DUMMY_GAP
+        return (widths[a] + widths[b]) / 2 + space
+
+    x[level[0]] = max(x[level[0]], widths[level[0]] / 2)
+    for a, b in zip(level, level[1:]):
+        x[b] = max(x[b], x[a] + sep(a, b))
+    x[level[-1]] = min(x[level[-1]], width - widths[level[-1]] / 2)
+    for a, b in zip(reversed(level[:-1]), reversed(level[1:])):
+        x[a] = min(x[a], x[b] - sep(a, b))
+
+
+class LayeredGraph(Flowable):
+    """Boxes-and-edges diagram drawn from layered_layout().
+
+    `nodes` maps id -> dict(title, subtitle, fill, stroke, text); `edges`
+    is a list of (parent, child, dict(color, width, dash, label)).
+    """
+
+    def __init__(self, nodes, edges, width, height, box_width=86, box_height=26,
+                 font='Helvetica', bold_font='Helvetica-Bold', max_width=None):
+        Flowable.__init__(self)
+        self.nodes = nodes
+        self.edges = edges
+        self.width = width
+        self.height = height
+        self.box_width = box_width
+        self.box_height = box_height
+        self.font = font
+        self.bold_font = bold_font
+        self.max_width = max_width
+        self._layout = None
+
+    @property
+    def layout(self):
+        """The layered_layout() of the graph, computed when first drawn."""
+        if self._layout is None:
+            self._layout = layered_layout(
+                list(self.nodes), [(u, v) for u, v, _ in self.edges], self.width, self.box_width,
+                max_width=self.max_width,
+            )
+        return self._layout
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def _y(self, layer):
+        count = len(self.layout.layers)
+        step = self.height / max(count, 1)
+        return self.height - step * (layer + 0.5)
+
+    def draw(self):
+        canv = self.canv
+        layout = self.layout
+        layer = layout.layer_of()
+        bh = min(self.box_height, self.height / max(len(layout.layers), 1) * 0.6)
+
+        canv.saveState()
+        for u, v, style in self.edges:
+            path = layout.routes.get((u, v)) or layout.routes.get((v, u))
+            if not path:
+                continue
+            points = [(layout.x[n], self._y(layer[n])) for n in path]
+            points[0] = (points[0][0], points[0][1] - bh / 2)
+            points[-1] = (points[-1][0], points[-1][1] + bh / 2)
+            canv.setStrokeColor(style.get('color', HexColor('#666666')))
+            canv.setLineWidth(style.get('width', 0.6))
+            canv.setDash(*style.get('dash', ()))
+            p = canv.beginPath()
+            p.moveTo(*points[0])
+            for (x0, y0), (x1, y1) in zip(points, points[1:]):
+                mid = (y0 + y1) / 2
+                p.curveTo(x0, mid, x1, mid, x1, y1)
+            canv.drawPath(p, stroke=1, fill=0)
+            # Dot on the child (many) end.
+            canv.setFillColor(style.get('color', HexColor('#666666')))
+            canv.circle(points[-1][0], points[-1][1], 1.4, stroke=0, fill=1)
+            if style.get('label'):
+                # Near the parent end, where edges into one child are still apart.
+                (x0, y0), (x1, y1) = points[0], points[1]
+                t = 0.3
+                lx = x0 + (x1 - x0) * (3 * t * t - 2 * t ** 3)
+                ly = y0 + (y1 - y0) * t
+                canv.setFont(self.font, 5.5)
+                canv.drawCentredString(lx, ly - 2, style['label'])
+        canv.setDash()
+
+        for n, node in self.nodes.items():
+            cx, cy = layout.x[n], self._y(layer[n])
+            w = layout.widths[n]
+            canv.setFillColor(node.get('fill', HexColor('#1a2332')))
+            canv.setStrokeColor(node.get('stroke', HexColor('#14b8a6')))
+            canv.setLineWidth(node.get('stroke_width', 0.8))
+            canv.roundRect(cx - w / 2, cy - bh / 2, w, bh, 3, stroke=1, fill=1)
+            canv.setFillColor(node.get('text', HexColor('#ffffff')))
+            subtitle = node.get('subtitle')
+            title_y = cy + (1 if subtitle else -2.5)
+            canv.setFont(self.bold_font, 6.5)
+            canv.drawCentredString(cx, title_y, node['title'])
+            if subtitle:
+                canv.setFillColor(node.get('muted', HexColor('#b3b3b3')))
+                canv.setFont(self.font, 5)
+                canv.drawCentredString(cx, cy - 6.5, subtitle)
+        canv.restoreState()
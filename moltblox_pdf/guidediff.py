@@ -0,0 +1,222 @@
+"""
+Structural diff of the launch guide's step data between git revisions.
+
+Step data is read straight from the source of moltblox_testnet_launch.py
+at each revision (make_step() calls, section headings and the env_data
+table), so any two commits can be compared without running their code.
+
+Each revision is hashed into a Merkle tree: step and env-var leaves,
+section nodes over their steps' hashes, and a root. Comparing two trees
+walks down only where hashes differ, so the cost is proportional to what
+changed rather than to the size of the guide. Leaves hash a step's
+content but not its number, and section nodes hash each step's number
+next to its leaf, so inserting a step reports one addition and a set of
+renumbered ("moved") steps instead of editing everything after it.
+Steps are matched by section, title and occurrence, so two steps with
+the same title stay apart.
+
+    python -m moltblox_pdf.guidediff HEAD~3 HEAD -o changes.json
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import re
+import subprocess
+import sys
+
+from . import REPO_ROOT
+
+GUIDE_PATH = 'moltblox_testnet_launch.py'
+WORKTREE = 'WORKTREE'
+
+STEP_FIELDS = ('title', 'body', 'owner', 'code')
+_SECTION = re.compile(r'^[A-Z]\. [A-Z]')
+
+
+def _hash(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+class Node:
+    """Merkle node: hash over ordered children, keyed for matching.
+
+    A leaf hashes its value only; its `num` (a step's number) goes into
+    its parent's hash instead, so a renumbered step changes its section
+    without looking edited.
+    """
+
+    __slots__ = ('key', 'hash', 'children', 'value', 'num')
+
+    def __init__(self, key, children=None, value=None, num=None):
+        self.key = key
+        self.value = value
+        self.num = num
+        self.children = children or {}
+        if value is not None:
+            self.hash = _hash(json.dumps(value, sort_keys=True))
+        else:
+            self.hash = _hash(str(key), *(f'{c.hash}:{c.num}' for c in self.children.values()))
+
+
+def read_source(rev, path=GUIDE_PATH):
+    """Source of the guide at `rev` (WORKTREE for the file on disk)."""
+    if rev == WORKTREE:
+        with open(f'{REPO_ROOT}/{path}') as f:
+            return f.read()
+    return subprocess.run(
+        ['git', 'show', f'{rev}:{path}'], cwd=REPO_ROOT,
+        capture_output=True, text=True, check=True,
+    ).stdout
+
+
+def _literal(node):
+    # Translatable text is wrapped in _() (see moltblox_pdf.i18n); the
+    # English source is what gets compared.
+    if isinstance(node, ast.Call) and getattr(node.func, 'id', None) in ('_', 'N_') and len(node.args) == 1:
+        node = node.args[0]
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def _call_name(call):
+    func = call.func
+    return getattr(func, 'id', None) or getattr(func, 'attr', None)
+
+
+def extract(source):
+    """Return ({section: [step dict, ...]}, {env var: (where, value)})."""
+    tree = ast.parse(source)
+    calls = sorted(
+        (n for n in ast.walk(tree) if isinstance(n, ast.Call)),
+        key=lambda n: (n.lineno, n.col_offset),
+    )
+
+    sections = {}
+    current = None
+    for call in calls:
+        name = _call_name(call)
+        args = [_literal(a) for a in call.args]
+        if name == 'Paragraph' and args and isinstance(args[0], str) and _SECTION.match(args[0]):
+            current = sections.setdefault(args[0], [])
+        elif name == 'make_step' and current is not None and len(args) >= 2:
+            kwargs = {k.arg: _literal(k.value) for k in call.keywords}
+            values = dict(zip(('num',) + STEP_FIELDS, args))
+            values.update(kwargs)
+            values.setdefault('owner', 'you')
+            values.setdefault('code', None)
+            current.append(values)
+
+    env = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'env_data' for t in node.targets):
+            rows = [_literal(elt) for elt in getattr(node.value, 'elts', [])]
+            env = {row[0]: tuple(row[1:]) for row in rows if isinstance(row, list) and len(row) == 3}
+    return sections, env
+
+
+def merkle(sections, env):
+    """Build the tree: root -> sections -> steps, plus an env node."""
+    children = {}
+    for title, steps in sections.items():
+        leaves, seen = {}, {}
+        for step in steps:
+            occurrence = seen[step['title']] = seen.get(step['title'], 0) + 1
+            key = (title, step['title'], occurrence)
+            leaves[key] = Node(key, value={f: step.get(f) for f in STEP_FIELDS}, num=step['num'])
+        children[title] = Node(title, leaves)
+    env_leaves = {name: Node(name, value=list(row)) for name, row in env.items()}
+    children['env'] = Node('env', env_leaves)
+    return Node('root', children)
+
+
+def diff_trees(old, new):
+    """Changelog dict for two Merkle roots, descending only into changed nodes."""
+    changes = {'sections': [], 'steps': [], 'env': []}
+    if old.hash == new.hash:
+        return changes
+
+    for key in list(old.children) + [k for k in new.children if k not in old.children]:
+        a, b = old.children.get(key), new.children.get(key)
+        if a is not None and b is not None and a.hash == b.hash:
+            continue
+        if key == 'env':
+            changes['env'] = _diff_env(a, b)
+            continue
+        status = 'added' if a is None else 'removed' if b is None else 'changed'
+        changes['sections'].append({'section': key, 'status': status})
+        changes['steps'].extend(_diff_steps(key, a, b))
+    return changes
+
+
+def _diff_steps(section, a, b):
+    old = a.children if a else {}
+    new = b.children if b else {}
+    out = []
+    for key in list(new) + [k for k in old if k not in new]:
+        x, y = old.get(key), new.get(key)
+        entry = {'section': section, 'title': key[1]}
+        if x is None:
+            entry.update(status='added', step=y.num)
+        elif y is None:
+            entry.update(status='removed', old_step=x.num)
+        elif x.hash != y.hash:
+            fields = [f for f in STEP_FIELDS if x.value.get(f) != y.value.get(f)]
+            entry.update(status='edited', step=y.num, old_step=x.num, fields=fields)
+        elif x.num != y.num:
+            entry.update(status='moved', step=y.num, old_step=x.num)
+        else:
+            continue
+        out.append(entry)
+    return out
+
+
+def _diff_env(a, b):
+    old = a.children if a else {}
+    new = b.children if b else {}
+    out = []
+    for name in list(new) + [n for n in old if n not in new]:
+        x, y = old.get(name), new.get(name)
+        if x is None:
+            out.append({'name': name, 'status': 'added', 'where': y.value[0], 'value': y.value[1]})
+        elif y is None:
+            out.append({'name': name, 'status': 'removed', 'where': x.value[0], 'value': x.value[1]})
+        elif x.hash != y.hash:
+            out.append({'name': name, 'status': 'edited', 'where': y.value[0], 'value': y.value[1],
+                        'old': x.value})
+    return out
+
+
+def compare(old_rev, new_rev=WORKTREE):
+    """Changelog between two revisions of the guide's step data."""
+    old = merkle(*extract(read_source(old_rev)))
+    new = merkle(*extract(read_source(new_rev)))
+    changes = {'from': old_rev, 'to': new_rev, 'root': [old.hash, new.hash]}
+    changes.update(diff_trees(old, new))
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Diff the launch guide step data between two git revisions.')
+    parser.add_argument('old', help='base revision')
+    parser.add_argument('new', nargs='?', default=WORKTREE, help=f'revision to compare (default: {WORKTREE})')
+    parser.add_argument('-o', '--output', help='write the JSON changelog here instead of stdout')
+    args = parser.parse_args()
+
+    text = json.dumps(compare(args.old, args.new), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        sys.stdout.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Combined Moltblox handbook: the testnet launch guide followed by the
+flowchart pages, in one PDF.
+
+Both parts keep their own page geometry (portrait letter for the guide,
+landscape A4 for the flowcharts) through separate page templates, page
+numbers run continuously through the book, and fonts and page chrome are
+embedded once for the whole document. The guide is paginated with the
+same planner and layout cache as its standalone build, so parts that
+haven't changed are not measured again.
+
+    python -m moltblox_pdf.handbook [-o MOLTBLOX_HANDBOOK.pdf] [--brand-fonts DIR]
+"""
+
+import argparse
+import importlib.util
+import os
+
+from reportlab.lib.pagesizes import A4, landscape, letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import BaseDocTemplate, Frame, NextPageTemplate, PageBreak, PageTemplate
+
+from . import REPO_ROOT, fonts, paginate, searchindex, store
+from .outline import bookmarks, drawn_pages
+
+import moltblox_testnet_launch as guide
+
+FLOWCHARTS_SCRIPT = os.path.join(REPO_ROOT, 'docs', 'generate_flowcharts_pdf.py')
+
+
+def _load_flowcharts():
+    # docs/ is not a package; load the generator script by path.
+    spec = importlib.util.spec_from_file_location('generate_flowcharts_pdf', FLOWCHARTS_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _frame(pagesize, margins, id):
+    width, height = pagesize
+    return Frame(
+        margins['leftMargin'], margins['bottomMargin'],
+        width - margins['leftMargin'] - margins['rightMargin'],
+        height - margins['topMargin'] - margins['bottomMargin'],
+        id=id,
+    )
+
+
+def build(output='MOLTBLOX_HANDBOOK.pdf', brand_fonts=None):
+    flowcharts = _load_flowcharts()
+    if brand_fonts:
+        fonts.use_brand_fonts(brand_fonts)
+        for module in (guide, flowcharts):
+            fonts.restyle(v for v in vars(module).values() if isinstance(v, ParagraphStyle))
+
+    chart_size = landscape(A4)
+
+    def flowchart_page(canvas, doc):
+        flowcharts.page_bg(canvas, doc)
+        canvas.saveState()
+        canvas.setFillColor(flowcharts.WHITE_40)
+        canvas.setFont(fonts.face('Helvetica'), 7)
+        canvas.drawRightString(
+            chart_size[0] - flowcharts.DOC_MARGINS['rightMargin'], 0.25 * inch, f'Page {doc.page}'
+        )
+        canvas.restoreState()
+
+    # The document's own geometry is the guide's, so paginate() plans
+    # against the same frame as the standalone guide build.
+    with store.publishing(output) as target:
+        doc = BaseDocTemplate(
+            target, pagesize=letter, title='Moltblox Handbook', **guide.DOC_MARGINS,
+        )
+        doc.addPageTemplates([
+            PageTemplate(
+                id='guide', frames=[_frame(letter, guide.DOC_MARGINS, 'guide')],
+                onPage=guide.on_page, pagesize=letter,
+            ),
+            PageTemplate(
+                id='flowcharts', frames=[_frame(chart_size, flowcharts.DOC_MARGINS, 'flowcharts')],
+                onPage=flowchart_page, pagesize=chart_size,
+            ),
+        ])
+
+        guide_story, env_data = guide.guide_story()
+        guide_story = paginate.paginate(guide_story, doc)
+        chart_story, chart_sections = flowcharts.build_story()
+        guide_marks, chart_marks = bookmarks(guide_story), bookmarks(chart_story)
+
+        story = guide_story + [NextPageTemplate('flowcharts'), PageBreak()] + chart_story
+        doc.build(story)
+    sections = guide.search_sections(guide_marks, env_data[1:]) + drawn_pages(chart_sections, chart_marks)
+    print(f'Generated: {output}')
+    print(f'Size: {os.path.getsize(output):,} bytes')
+    print(f'Generated: {searchindex.write_index(output, sections)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the combined Moltblox handbook PDF.')
+    parser.add_argument('-o', '--output', default='MOLTBLOX_HANDBOOK.pdf', help='output PDF path')
+    parser.add_argument(
+        '--brand-fonts', metavar='DIR',
+        help='directory of TTF brand fonts (*-Regular.ttf, *-Bold.ttf, ...) to use instead of Helvetica/Courier',
+    )
+    args = parser.parse_args()
+    build(args.output, args.brand_fonts)
+
+
+if __name__ == '__main__':
+    main()
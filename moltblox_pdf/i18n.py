@@ -0,0 +1,323 @@
+"""
+Localized editions of the guide.
+
+The guide's source text is the English catalog. Strings meant for
+translation are marked in moltblox_testnet_launch.py with _() (or N_()
+for module-level constants, translated where they are drawn); step
+titles and bodies are translated by make_step(), so its literal
+arguments stay readable for guidediff and linkcheck. Code, URLs and env
+var names are never translated.
+
+Translations live in gettext PO files, docs/locales/<locale>.po, which
+translators edit with their usual tools. update() merges the guide's
+current strings into a catalog: an entry whose msgid is unchanged keeps
+its translation, a new or reworded msgid is filled from the translation
+memory, which remembers every translation any catalog of that locale has
+had (exact matches as translated, close matches marked fuzzy for review),
+and entries that are no longer used are dropped from the file but kept in
+the memory. Fuzzy and empty entries fall back to English in the PDF.
+
+The en-XA pseudo-locale needs no catalog: it accents every marked string
+and lengthens phrases by about a third, so truncation, overflow and
+untranslated text show up before a real catalog arrives.
+
+    python -m moltblox_pdf.i18n update de       # create or refresh docs/locales/de.po
+    python -m moltblox_pdf.i18n status
+    python -m moltblox_pdf.i18n extract -o guide.pot
+"""
+
+import argparse
+import ast
+import difflib
+import os
+import re
+import sys
+
+from . import CACHE_DIR, REPO_ROOT, store
+
+SOURCE_LOCALE = 'en'
+PSEUDO_LOCALE = 'en-XA'
+LOCALES_DIR = os.path.join(REPO_ROOT, 'docs', 'locales')
+GUIDE_PATH = 'moltblox_testnet_launch.py'
+MEMORY_PATH = os.path.join(CACHE_DIR, 'i18n', 'memory.json')
+# Translation memory matches at least this similar are offered as fuzzy.
+FUZZY_CUTOFF = 0.8
+
+# What pseudo() leaves alone: code set in the monospace face, markup,
+# entities, {placeholders}, URLs, hosts and paths (render.com,
+# Halldon-Inc/moltblox, contracts/.env, /health), env vars with any
+# assigned value (NODE_ENV=production, PORT=3001) and other snake_case or
+# CamelCase identifiers (add_missing_fks, GameMarketplace).
+_PROTECTED = re.compile(
+    r'<font\b[^>]*(?:Courier|Mono|Code)[^>]*>.*?</font>'
+    r'|<[^>]*>|&\w+;|&#\d+;|\{[^}]*\}'
+    r'|\b(?:https?|wss?)://[^\s<>"]+'
+    r'|[\w@-]+(?:[./:]+[\w@-]+)+/?|(?<![\w.])/[\w@.-]+(?:/[\w@.-]+)*'
+    r'|\b(?:\w+_\w+|[A-Z][A-Z0-9]*(?==))\b(?:=[\w./:-]*)?'
+    r'|\b[A-Z]?[a-z0-9]+(?:[A-Z][a-z0-9]*)+\b',
+    re.DOTALL,
+)
+_ACCENTS = str.maketrans('aceinouyACEINOUY', 'åçéîñöüýÅÇÉÎÑÖÜÝ')
+_PAD_WORDS = ('one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten')
+
+
+def N_(message):
+    """Mark `message` for extraction without translating it (yet)."""
+    return message
+
+
+# ----------------------------------------------------------------
+# Catalogs
+# ----------------------------------------------------------------
+def catalog_path(locale):
+    return os.path.join(LOCALES_DIR, f'{locale}.po')
+
+
+def locales():
+    """Locales an edition can be built in: English, the pseudo-locale and every catalog."""
+    found = sorted(n[:-3] for n in os.listdir(LOCALES_DIR) if n.endswith('.po')) if os.path.isdir(LOCALES_DIR) else []
+    return [SOURCE_LOCALE, PSEUDO_LOCALE] + [l for l in found if l not in (SOURCE_LOCALE, PSEUDO_LOCALE)]
+
+
+def _quote(text):
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def _po_string(keyword, text):
+    """A PO field, continued over several lines when long."""
+    if len(text) <= 70:
+        return [f'{keyword} {_quote(text)}']
+    lines, chunk = [f'{keyword} ""'], ''
+    for word in re.split(r'(?<= )', text):
+        if chunk and len(chunk) + len(word) > 70:
+            lines.append(_quote(chunk))
+            chunk = ''
+        chunk += word
+    return lines + [_quote(chunk)]
+
+
+def read_po(path):
+    """{msgid: (msgstr, fuzzy)} for the PO file at `path`, without its header."""
+    entries = {}
+    entry, field = {}, None
+
+    def flush():
+        if 'msgid' in entry and entry['msgid']:
+            entries[entry['msgid']] = (entry.get('msgstr', ''), entry.get('fuzzy', False))
+        entry.clear()
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                flush()
+                field = None
+            elif line.startswith('#~'):
+                continue  # obsolete
+            elif line.startswith('#,'):
+                entry['fuzzy'] = 'fuzzy' in line
+            elif line.startswith('#'):
+                continue
+            elif line.startswith('"') and field:
+                entry[field] += ast.literal_eval(line)
+            else:
+                field, sep, value = line.partition(' ')
+                if field == 'msgid' and 'msgid' in entry:
+                    flush()
+                entry[field] = ast.literal_eval(value)
+    flush()
+    return entries
+
+
+def format_po(locale, entries):
+    """PO file text for `entries`, (msgid, msgstr, fuzzy, references, previous msgid) tuples."""
+    lines = [
+        f'# Moltblox testnet launch guide, {locale or "template"}.',
+        '# Update with: python -m moltblox_pdf.i18n update ' + (locale or 'LOCALE'),
+        'msgid ""',
+        'msgstr ""',
+        _quote(f'Language: {locale or ""}\n'),
+        _quote('Content-Type: text/plain; charset=UTF-8\n'),
+        '',
+    ]
+    for msgid, msgstr, fuzzy, refs, previous in entries:
+        lines += [f'#: {ref}' for ref in refs]
+        if fuzzy:
+            lines.append('#, fuzzy')
+            if previous:
+                lines += ['#| ' + line for line in _po_string('msgid', previous)]
+        lines += _po_string('msgid', msgid) + _po_string('msgstr', msgstr) + ['']
+    return '\n'.join(lines)
+
+
+_catalogs = {}
+
+
+def catalog(locale):
+    """{msgid: msgstr} of the translated entries of `locale`'s catalog, reloaded when the file changes."""
+    path = catalog_path(locale)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    if _catalogs.get(locale, (None,))[0] != mtime:
+        _catalogs[locale] = (mtime, {k: v for k, (v, fuzzy) in read_po(path).items() if v and not fuzzy})
+    return _catalogs[locale][1]
+
+
+# ----------------------------------------------------------------
+# Translating
+# ----------------------------------------------------------------
+_locale = SOURCE_LOCALE
+_active = {}
+
+
+def activate(locale):
+    """Translate this process's _() calls into `locale` from now on."""
+    global _locale, _active
+    if locale not in locales():
+        raise LookupError(f'no catalog for locale {locale!r} (try: python -m moltblox_pdf.i18n update {locale})')
+    _locale = locale
+    _active = {} if locale in (SOURCE_LOCALE, PSEUDO_LOCALE) else catalog(locale)
+
+
+def active():
+    return _locale
+
+
+def pseudo(message):
+    """`message` accented and, past one word, about a third longer, with code and markup intact.
+
+    Single words are only accented, so a pseudo-localized "step" still
+    matches the "step 11" cross-references in pseudo-localized bodies.
+    """
+    parts, last = [], 0
+    for m in _PROTECTED.finditer(message):
+        parts += [message[last:m.start()].translate(_ACCENTS), m.group(0)]
+        last = m.end()
+    parts.append(message[last:].translate(_ACCENTS))
+    text = ''.join(parts)
+    visible = _PROTECTED.sub('', message)
+    if ' ' not in visible.strip():
+        return text
+    pad, n = [], 0
+    while n < len(visible) // 3:
+        pad.append(_PAD_WORDS[len(pad) % len(_PAD_WORDS)])
+        n += len(pad[-1]) + 1
+    return f'[{text} {" ".join(pad)}]'
+
+
+def _(message):
+    """`message` in the active locale; English when it has no translation."""
+    if _locale == PSEUDO_LOCALE:
+        return pseudo(message)
+    return _active.get(message) or message
+
+
+# ----------------------------------------------------------------
+# Extracting and merging
+# ----------------------------------------------------------------
+def messages(source, filename=GUIDE_PATH):
+    """[(msgid, [reference, ...])] for the guide `source`, in source order.
+
+    Collects the literal arguments of _() and N_() calls and the title
+    and body of make_step() calls.
+    """
+    found = {}
+    calls = sorted((n for n in ast.walk(ast.parse(source)) if isinstance(n, ast.Call)),
+                   key=lambda n: (n.lineno, n.col_offset))
+    for call in calls:
+        name = getattr(call.func, 'id', None) or getattr(call.func, 'attr', None)
+        if name in ('_', 'N_'):
+            args = call.args[:1]
+        elif name == 'make_step':
+            args = call.args[1:3]
+        else:
+            continue
+        for arg in args:
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str) and arg.value:
+                found.setdefault(arg.value, []).append(f'{filename}:{arg.lineno}')
+    return list(found.items())
+
+
+def _guide_source():
+    with open(os.path.join(REPO_ROOT, GUIDE_PATH), encoding='utf-8') as f:
+        return f.read()
+
+
+def update(locale, source=None, memory_path=MEMORY_PATH):
+    """Merge the guide's current strings into `locale`'s catalog; returns counts by outcome."""
+    if locale in (SOURCE_LOCALE, PSEUDO_LOCALE):
+        raise ValueError(f'{locale} is built in and has no catalog')
+    path = catalog_path(locale)
+    current = read_po(path) if os.path.exists(path) else {}
+    # Everything translated in the catalog so far goes into the memory first.
+    translated = {k: v for k, (v, fuzzy) in current.items() if v and not fuzzy}
+    memory = store.update_json(memory_path, lambda m: dict(m, **{locale: dict(m.get(locale, {}), **translated)}))
+    memory = memory.get(locale, {})
+
+    counts = dict.fromkeys(('kept', 'memory', 'fuzzy', 'untranslated', 'dropped'), 0)
+    entries = []
+    msgs = messages(source or _guide_source())
+    for msgid, refs in msgs:
+        msgstr, fuzzy = current.get(msgid, ('', False))
+        previous = None
+        if msgstr:
+            counts['fuzzy' if fuzzy else 'kept'] += 1
+        elif msgid in memory:
+            msgstr = memory[msgid]
+            counts['memory'] += 1
+        else:
+            close = difflib.get_close_matches(msgid, memory, n=1, cutoff=FUZZY_CUTOFF)
+            if close:
+                msgstr, fuzzy, previous = memory[close[0]], True, close[0]
+                counts['fuzzy'] += 1
+            else:
+                counts['untranslated'] += 1
+        entries.append((msgid, msgstr, fuzzy, refs, previous))
+    counts['dropped'] = len(current.keys() - {msgid for msgid, refs in msgs})
+    store.write_atomic(path, format_po(locale, entries))
+    return counts
+
+
+def status(locale):
+    """(translated, fuzzy, total) for `locale` against the guide's current strings."""
+    current = read_po(catalog_path(locale))
+    msgids = [msgid for msgid, refs in messages(_guide_source())]
+    entries = [current.get(msgid, ('', False)) for msgid in msgids]
+    return (sum(1 for v, fuzzy in entries if v and not fuzzy), sum(1 for v, fuzzy in entries if v and fuzzy),
+            len(msgids))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Maintain the translation catalogs of the launch guide.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    extract = commands.add_parser('extract', help='write a PO template of every translatable string')
+    extract.add_argument('-o', '--output', default='-', help='file to write (default: stdout)')
+    upd = commands.add_parser('update', help='create or refresh catalogs from the guide and the translation memory')
+    upd.add_argument('locales', nargs='+', metavar='LOCALE')
+    commands.add_parser('status', help='translation progress per catalog')
+    args = parser.parse_args(argv)
+
+    if args.command == 'extract':
+        text = format_po(None, [(msgid, '', False, refs, None) for msgid, refs in messages(_guide_source())])
+        if args.output == '-':
+            sys.stdout.write(text)
+        else:
+            store.write_atomic(args.output, text)
+    elif args.command == 'update':
+        for locale in args.locales:
+            counts = update(locale)
+            print(f'{os.path.relpath(catalog_path(locale), REPO_ROOT)}: ' + ', '.join(f'{n} {k}' for k, n in counts.items()))
+    else:
+        found = locales()[2:]
+        for locale in found:
+            translated, fuzzy, total = status(locale)
+            print(f'{locale}: {translated}/{total} translated ({translated / total:.0%}), {fuzzy} fuzzy')
+        if not found:
+            print(f'No catalogs in {LOCALES_DIR}.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Flowables built on demand from compact records.
+
+A guide step is a handful of strings, but its flowable is a Table holding
+four Paragraphs and two Spacers. Stories keep a LazyFlowable per step
+instead: it builds the real flowable from its record only when the layout
+engine wraps or draws it, and drops it again once it has been measured or
+drawn. With the layout cache warm, pagination never builds a step at all,
+and a render holds at most one built step at a time.
+
+Records are plain __slots__ objects providing:
+
+    build()         -> the flowable to lay out and draw
+    anchors         persistent flowables the built one reuses (Bookmarks),
+                    so page assignment and outline entries survive rebuilds
+    describe()      plain data identifying the layout, for paginate's cache
+    resolve(pages)  fill in page references; True if the text changed
+"""
+
+from reportlab.platypus import Flowable
+
+
+class LazyFlowable(Flowable):
+    """Stand-in that materializes `record.build()` when it is reached."""
+
+    def __init__(self, record):
+        Flowable.__init__(self)
+        self.record = record
+        self._built = None
+
+    def __repr__(self):
+        return f'LazyFlowable({self.record!r})'
+
+    @property
+    def built(self):
+        if self._built is None:
+            self._built = self.record.build()
+        return self._built
+
+    def release(self):
+        self._built = None
+
+    def wrap(self, availWidth, availHeight):
+        return self.built.wrap(availWidth, availHeight)
+
+    def wrapOn(self, canv, aW, aH):
+        return self.built.wrapOn(canv, aW, aH)
+
+    def split(self, availWidth, availHeight):
+        return self.built.split(availWidth, availHeight)
+
+    def splitOn(self, canv, aW, aH):
+        return self.built.splitOn(canv, aW, aH)
+
+    def getSpaceBefore(self):
+        return self.built.getSpaceBefore()
+
+    def getSpaceAfter(self):
+        return self.built.getSpaceAfter()
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        self.built.drawOn(canvas, x, y, _sW)
+        self.release()
+
+    def resolve(self, pages):
+        return self.record.resolve(pages)
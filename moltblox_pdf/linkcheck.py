@@ -0,0 +1,240 @@
+"""
+External-link checker for the launch guide.
+
+URLs are pulled from the guide's step data and env table the same way
+guidediff reads them (from source, without rendering), including bare
+domains such as "render.com" in step text; placeholders like
+<from sentry.io> are skipped. Each distinct URL is requested with asyncio
+streams: HEAD first (GET when a server refuses HEAD), following
+redirects, with a per-host concurrency limit and a per-request timeout.
+
+Results go into an on-disk cache with a TTL (shorter for failures), so a
+repeat run only re-checks entries that went stale; concurrent runs merge
+their results into it under a lock (see moltblox_pdf.store). --resolve points a
+host (or '*', every host) at another origin, curl-style, which lets the
+whole check run offline against a local stub server:
+
+    python -m moltblox_pdf.linkcheck
+    python -m moltblox_pdf.linkcheck --resolve '*=http://127.0.0.1:8000'
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import ssl
+import sys
+import time
+from urllib.parse import urljoin, urlsplit
+
+from . import CACHE_DIR, guidediff, store
+
+LINK_CACHE_PATH = os.path.join(CACHE_DIR, 'links', 'results.json')
+TTL = 24 * 3600
+FAILURE_TTL = 3600
+TIMEOUT = 10
+PER_HOST = 2
+MAX_CONNECTIONS = 16
+MAX_REDIRECTS = 5
+USER_AGENT = 'moltblox-linkcheck/1'
+
+_URL = re.compile(r'\b(?:https?|wss?)://[^\s<>"\'&]+')
+_BARE = re.compile(r'(?<![\w./@-])(?:[a-z0-9-]+\.)+(?:com|org|io|net|xyz|app|dev|ai|co)(?![\w-])(?:/[^\s<>"\'&]*)?',
+                   re.IGNORECASE)
+_PLACEHOLDER = re.compile(r'<[^>]*>|&lt;.*?&gt;')
+_TRAILING = '.,;:)]\''
+
+
+def _normalize(url):
+    url = url.rstrip(_TRAILING)
+    if '://' not in url:
+        url = f'https://{url}'
+    # WebSocket endpoints are checked over the HTTP(S) origin that serves them.
+    if url.startswith('ws'):
+        url = 'http' + url[2:]
+    return url
+
+
+def find_urls(text):
+    """Normalized URLs in `text`, in order of first appearance."""
+    text = _PLACEHOLDER.sub(' ', text)
+    found = [m.group() for m in _URL.finditer(text)]
+    found += [m.group() for m in _BARE.finditer(_URL.sub(' ', text))]
+    return list(dict.fromkeys(_normalize(u) for u in found))
+
+
+def guide_urls(source=None):
+    """{url: [where it appears, ...]} for the guide's steps and env table."""
+    sections, env = guidediff.extract(source or guidediff.read_source(guidediff.WORKTREE))
+    out = {}
+    for steps in sections.values():
+        for step in steps:
+            text = ' '.join(str(step.get(f) or '') for f in guidediff.STEP_FIELDS)
+            for url in find_urls(text):
+                out.setdefault(url, []).append(f'step {step["num"]}')
+    for name, row in env.items():
+        for url in find_urls(' '.join(str(v) for v in row)):
+            out.setdefault(url, []).append(name)
+    return out
+
+
+def parse_resolve(specs):
+    """{host: origin} from HOST=ORIGIN strings; HOST '*' matches any other host."""
+    out = {}
+    for spec in specs or ():
+        host, sep, origin = spec.partition('=')
+        if not sep or '://' not in origin:
+            raise ValueError(f'--resolve expects HOST=SCHEME://ADDR[:PORT], got {spec!r}')
+        out[host.lower()] = origin.rstrip('/')
+    return out
+
+
+def _origin(host, resolve):
+    """Override origin for `host` (an exact entry, else '*'), or None."""
+    return resolve.get(host) or resolve.get('*')
+
+
+def cache_key(url, resolve):
+    # Results through an override never stand in for the real host.
+    origin = _origin(urlsplit(url).hostname, resolve)
+    return f'{url} via {origin}' if origin else url
+
+
+def is_fresh(entry, now, ttl=TTL, failure_ttl=FAILURE_TTL):
+    return now - entry['checked'] < (ttl if entry['ok'] else min(ttl, failure_ttl))
+
+
+async def _request(method, url, resolve, timeout):
+    """(status, Location header) for one request, without following redirects."""
+    parts = urlsplit(url)
+    origin = _origin(parts.hostname, resolve)
+    target = urlsplit(origin) if origin else parts
+    secure = target.scheme == 'https'
+    port = target.port or (443 if secure else 80)
+    context = ssl.create_default_context() if secure else None
+    path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(target.hostname, port, ssl=context,
+                                server_hostname=target.hostname if secure else None),
+        timeout,
+    )
+    try:
+        writer.write((
+            f'{method} {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nUser-Agent: {USER_AGENT}\r\n'
+            'Accept: */*\r\nConnection: close\r\n\r\n'
+        ).encode('latin-1'))
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        location = None
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'location':
+                location = value.strip()
+    finally:
+        writer.close()
+    fields = status_line.decode('latin-1').split()
+    if len(fields) < 2 or not fields[1].isdigit():
+        raise ConnectionError(f'bad status line {status_line[:40]!r}')
+    return int(fields[1]), location
+
+
+async def check_url(url, resolve=None, timeout=TIMEOUT):
+    """Result dict for `url`: ok, status, final url, error."""
+    resolve = resolve or {}
+    current, method = url, 'HEAD'
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, location = await _request(method, current, resolve, timeout)
+            if status in (405, 501) and method == 'HEAD':
+                method = 'GET'
+                continue
+            if 300 <= status < 400 and location:
+                current = urljoin(current, location)
+                continue
+            return {'ok': status < 400, 'status': status, 'final': current, 'error': None}
+        return {'ok': False, 'status': status, 'final': current, 'error': 'too many redirects'}
+    except (OSError, asyncio.TimeoutError, ssl.SSLError, ConnectionError) as e:
+        return {'ok': False, 'status': None, 'final': current,
+                'error': type(e).__name__ + (f': {e}' if str(e) else '')}
+
+
+async def check_all(urls, resolve=None, timeout=TIMEOUT, per_host=PER_HOST):
+    """{url: result} checking every URL concurrently within the limits."""
+    resolve = resolve or {}
+    overall = asyncio.Semaphore(MAX_CONNECTIONS)
+    hosts = {}
+
+    async def one(url):
+        host = urlsplit(url).hostname
+        limit = hosts.setdefault(host, asyncio.Semaphore(per_host))
+        async with limit, overall:
+            result = await check_url(url, resolve, timeout)
+        result['checked'] = time.time()
+        return url, result
+
+    return dict(await asyncio.gather(*(one(u) for u in urls)))
+
+
+def check(urls, resolve=None, timeout=TIMEOUT, per_host=PER_HOST, ttl=TTL,
+          cache_path=LINK_CACHE_PATH, refresh=False):
+    """{url: result} for `urls`, re-checking only entries missing or stale in the cache."""
+    resolve = resolve or {}
+    cache = store.load_json(cache_path)
+    now = time.time()
+    stale = [u for u in urls if refresh or cache_key(u, resolve) not in cache
+             or not is_fresh(cache[cache_key(u, resolve)], now, ttl)]
+    if stale:
+        results = asyncio.run(check_all(stale, resolve, timeout, per_host))
+        fresh = {cache_key(url, resolve): result for url, result in results.items()}
+
+        def merge(current):
+            # Keep what this run checked and anything else still fresh,
+            # including results a concurrent run saved meanwhile.
+            current.update(fresh)
+            return {k: v for k, v in current.items() if k in fresh or is_fresh(v, now, ttl)}
+
+        cache = dict(cache, **store.update_json(cache_path, merge))
+    return {u: dict(cache[cache_key(u, resolve)], cached=u not in stale) for u in urls}
+
+
+def report(results, where, out=sys.stdout):
+    """Print one line per URL; return the number of broken links."""
+    broken = 0
+    for url in sorted(results, key=lambda u: (results[u]['ok'], u)):
+        r = results[url]
+        broken += not r['ok']
+        status = r['status'] or r['error']
+        note = ' (cached)' if r['cached'] else ''
+        moved = f' -> {r["final"]}' if r['final'] != url else ''
+        out.write(f'{"ok  " if r["ok"] else "FAIL"} {status} {url}{moved}  [{", ".join(where[url])}]{note}\n')
+    out.write(f'{len(results)} links, {broken} broken\n')
+    return broken
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check the external links in the launch guide.')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help='seconds per request (default: %(default)s)')
+    parser.add_argument('--per-host', type=int, default=PER_HOST, help='concurrent requests per host')
+    parser.add_argument('--ttl', type=float, default=TTL, help='seconds a passing result stays cached')
+    parser.add_argument('--refresh', action='store_true', help='ignore cached results')
+    parser.add_argument('--resolve', action='append', metavar='HOST=ORIGIN',
+                        help='send requests for HOST to ORIGIN instead, e.g. render.com=http://127.0.0.1:8000')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON')
+    args = parser.parse_args(argv)
+
+    where = guide_urls()
+    results = check(list(where), parse_resolve(args.resolve), args.timeout, args.per_host, args.ttl,
+                    refresh=args.refresh)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({u: dict(r, where=where[u]) for u, r in results.items()}, f, indent=2)
+    return 1 if report(results, where) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
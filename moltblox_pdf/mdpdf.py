@@ -0,0 +1,407 @@
+"""
+Batch Markdown-to-PDF compiler in the launch guide's dark theme.
+
+Covers the docs we hand out as PDFs: the skill files, the MCP server's
+guides and the audit reports. Each file is parsed as a stream of lines
+into blocks (headings, paragraphs, list items, fenced code, tables,
+quotes, rules) that become Paragraphs in styles derived from the
+guide's, laid out on letter pages with the guide's margins and on_page
+chrome, captioned with the source path. H1-H3 headings become the PDF
+outline.
+
+Files are compiled on a process pool, largest first, so a full build
+takes about as long as the slowest file. Each PDF is kept in the shared
+artifact store (store.py) under a hash of the file, its path, the active
+fonts and the compiler and theme sources; unchanged files are copied
+from the store without rendering.
+
+    python -m moltblox_pdf.mdpdf                 # everything, into docs/pdf/
+    python -m moltblox_pdf.mdpdf skill/moltblox-economy.skill.md -o out/
+"""
+
+import argparse
+import functools
+import glob
+import hashlib
+import io
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import HRFlowable, Paragraph, Preformatted, SimpleDocTemplate, Spacer, Table, TableStyle
+
+import moltblox_testnet_launch as guide
+
+from . import REPO_ROOT, colsize, fonts, store
+from .outline import Bookmark
+
+SOURCES = ('skill/*.skill.md', 'packages/mcp-server/*.md', 'AUDIT_*.md')
+OUTPUT_DIR = os.path.join(REPO_ROOT, 'docs', 'pdf')
+ARTIFACTS = store.Store('markdown')
+COMPILER_VERSION = 1
+
+# ----------------------------------------------------------------
+# Styles (derived from the guide's)
+# ----------------------------------------------------------------
+body_style = ParagraphStyle('MdBody', parent=guide.step_body_style, textColor=guide.colors.HexColor('#c8c8c8'),
+                            spaceAfter=6)
+h3_style = ParagraphStyle('MdH3', parent=guide.step_title_style, spaceBefore=10, spaceAfter=4, keepWithNext=1)
+h4_style = ParagraphStyle('MdH4', parent=h3_style, fontSize=10, leading=13, textColor=guide.GREY)
+lead_style = ParagraphStyle('MdLead', parent=guide.subtitle_style, spaceAfter=10)
+quote_style = ParagraphStyle('MdQuote', parent=guide.note_style, fontSize=9, leading=13, leftIndent=10,
+                             spaceAfter=6, textColor=guide.GREY)
+item_style = ParagraphStyle('MdItem', parent=body_style, spaceAfter=2)
+code_block_style = ParagraphStyle('MdCode', parent=guide.code_style, fontSize=7, leading=9,
+                                  spaceBefore=4, spaceAfter=10)
+cell_style = ParagraphStyle('MdCell', parent=guide.step_body_style, fontSize=7.5, leading=10)
+header_cell_style = ParagraphStyle('MdHeaderCell', parent=cell_style, fontName='Helvetica-Bold',
+                                   textColor=guide.WHITE)
+STYLES = (body_style, h3_style, h4_style, lead_style, quote_style, item_style, code_block_style, cell_style,
+          header_cell_style)
+
+TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), guide.SECTION_BG),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ('LEFTPADDING', (0, 0), (-1, -1), 5),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+    ('LINEBELOW', (0, 0), (-1, -1), 0.5, guide.BORDER),
+    ('LINEBELOW', (0, 0), (-1, 0), 1, guide.TEAL_DIM),
+]
+_CELL_PADDING = 10
+_LIST_INDENT = 14
+
+# ----------------------------------------------------------------
+# Block parser
+# ----------------------------------------------------------------
+_HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_FENCE = re.compile(r'^\s*(```+|~~~+)\s*([\w+-]*)')
+_RULE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+_ITEM = re.compile(r'^(\s*)([-*+]|\d+[.)])\s+(.*)$')
+_TABLE_SEP = re.compile(r'^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$')
+
+
+def _cells(line):
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|') and not line.endswith('\\|'):
+        line = line[:-1]
+    return [c.strip().replace('\\|', '|') for c in re.split(r'(?<!\\)\|', line)]
+
+
+def parse(lines):
+    """Yield blocks from an iterable of Markdown lines, one block at a time.
+
+    Blocks: ('heading', level, text), ('paragraph', text),
+    ('item', depth, marker, text), ('code', lang, text),
+    ('table', rows), ('quote', text) and ('rule',).
+    """
+    para, quote, table, item = [], [], [], None
+    fence = None
+
+    def flush():
+        nonlocal item
+        if para:
+            yield ('paragraph', ' '.join(para))
+            para.clear()
+        if quote:
+            yield ('quote', ' '.join(quote))
+            quote.clear()
+        if table:
+            rows = [_cells(row) for row in table if not _TABLE_SEP.match(row)]
+            yield ('table', rows)
+            table.clear()
+        if item:
+            yield ('item', item[0], item[1], ' '.join(item[2]))
+            item = None
+
+    for raw in lines:
+        line = raw.rstrip('\n').expandtabs(4)
+        if fence is not None:
+            marker, lang, code = fence
+            if line.strip().startswith(marker):
+                yield ('code', lang, '\n'.join(code))
+                fence = None
+            else:
+                code.append(line)
+            continue
+
+        stripped = line.strip()
+        m = _FENCE.match(line)
+        if m:
+            yield from flush()
+            fence = (m.group(1), m.group(2), [])
+            continue
+        if not stripped:
+            yield from flush()
+            continue
+        if table and stripped.startswith('|'):
+            table.append(stripped)
+            continue
+        if stripped.startswith('|'):
+            yield from flush()
+            table.append(stripped)
+            continue
+        m = _HEADING.match(stripped)
+        if m:
+            yield from flush()
+            yield ('heading', len(m.group(1)), m.group(2))
+            continue
+        if _RULE.match(line):
+            yield from flush()
+            yield ('rule',)
+            continue
+        if stripped.startswith('>'):
+            if not quote:
+                yield from flush()
+            quote.append(stripped.lstrip('>').strip())
+            continue
+        m = _ITEM.match(line)
+        if m:
+            yield from flush()
+            item = (len(m.group(1)) // 2, m.group(2), [m.group(3)])
+            continue
+        if item and line[:1].isspace():
+            item[2].append(stripped)  # continuation of the list item
+            continue
+        if quote:
+            quote.append(stripped)
+            continue
+        if item or table:
+            yield from flush()
+        # Two trailing spaces are a hard line break.
+        para.append(stripped + ('<br>' if raw.rstrip('\n').endswith('  ') else ''))
+
+    if fence is not None:
+        yield ('code', fence[1], '\n'.join(fence[2]))
+    yield from flush()
+
+
+# ----------------------------------------------------------------
+# Inline markup
+# ----------------------------------------------------------------
+_CODE_SPAN = re.compile(r'(`+)(.+?)\1')
+_LINK = re.compile(r'!?\[([^\]]*)\]\(([^)\s]+)(?:\s+"[^"]*")?\)')
+_BOLD = re.compile(r'(\*\*|__)(?=\S)(.+?)(?<=\S)\1')
+_ITALIC = re.compile(r'(?<![\w*])([*_])(?=\S)(.+?)(?<=\S)\1(?![\w*])')
+_STRIKE = re.compile(r'~~(?=\S)(.+?)(?<=\S)~~')
+_BREAK = re.compile(r'&lt;br\s*/?&gt;', re.IGNORECASE)
+
+
+def inline(text):
+    """Paragraph markup for one line of Markdown inline syntax."""
+    spans = []
+
+    def stash(m):
+        spans.append(m.group(2).strip())
+        return f'\0{len(spans) - 1}\0'
+
+    text = escape(_CODE_SPAN.sub(stash, text))
+    text = _BREAK.sub('<br/>', text)
+
+    def link(m):
+        label, url = m.group(1), m.group(2)
+        if m.group(0).startswith('!'):
+            return f'[{label or "image"}]'
+        if re.match(r'https?://', url):
+            return f'<link href="{url}" color="#00D9A6">{label}</link>'
+        return label
+
+    text = _LINK.sub(link, text)
+    text = _BOLD.sub(r'<b>\2</b>', text)
+    text = _ITALIC.sub(r'<i>\2</i>', text)
+    text = _STRIKE.sub(r'<strike>\1</strike>', text)
+    code_font = fonts.face('Courier')
+    return re.sub(
+        r'\0(\d+)\0',
+        lambda m: f'<font face="{code_font}" color="#00D9A6">{escape(spans[int(m.group(1))])}</font>',
+        text,
+    )
+
+
+def plain(text):
+    """Text as it will read once inline markup is applied (for sizing)."""
+    text = _CODE_SPAN.sub(lambda m: m.group(2).strip(), text)
+    text = _LINK.sub(lambda m: m.group(1), text)
+    return re.sub(r'\*\*|__|~~|(?<![\w*])[*_]|[*_](?![\w*])', '', text)
+
+
+def _paragraph(text, style, **kw):
+    try:
+        return Paragraph(inline(text), style, **kw)
+    except ValueError:
+        # Markup the inline rules got wrong: show the source text instead.
+        return Paragraph(escape(text), style, **kw)
+
+
+# ----------------------------------------------------------------
+# Blocks to flowables
+# ----------------------------------------------------------------
+def _table(rows, width):
+    columns = max(len(row) for row in rows)
+    rows = [row + [''] * (columns - len(row)) for row in rows]
+    header, body = rows[0], rows[1:]
+    widths = colsize.auto_widths([
+        [([plain(header[i])] if header[i] else [], header_cell_style),
+         ([plain(row[i]) for row in body if row[i]], cell_style)]
+        for i in range(columns)
+    ], width, padding=_CELL_PADDING)
+    cells = [[_paragraph(c, header_cell_style) for c in header]]
+    cells += [[_paragraph(c, cell_style) for c in row] for row in body]
+    table = Table(cells, colWidths=widths, repeatRows=1, spaceBefore=4, spaceAfter=10)
+    table.setStyle(TableStyle(TABLE_STYLE))
+    return table
+
+
+def render(blocks, width=guide.FRAME_WIDTH):
+    """(story, title) for a stream of parsed blocks."""
+    story, title = [], None
+    level, anchors = -1, 0
+    code_chars = int((width - 12) / (0.6 * code_block_style.fontSize))
+    for block in blocks:
+        kind = block[0]
+        if kind == 'heading':
+            depth, text = block[1], block[2]
+            if depth <= 3:
+                # The outline cannot skip levels.
+                level = min(depth - 1, level + 1)
+                anchors += 1
+                story.append(Bookmark(f'h{anchors}', plain(text), level))
+            if depth == 1 and title is None:
+                title = plain(text)
+                story.append(_paragraph(text, guide.title_style))
+                story.append(Spacer(1, 8))
+            else:
+                style = {1: guide.section_style, 2: guide.section_style, 3: h3_style}.get(depth, h4_style)
+                story.append(_paragraph(text, style))
+        elif kind == 'paragraph':
+            story.append(_paragraph(block[1], body_style))
+        elif kind == 'quote':
+            # A quote right under the title is the document's lead.
+            lead = len(story) == 3 and title is not None
+            story.append(_paragraph(block[1], lead_style if lead else quote_style))
+        elif kind == 'item':
+            depth, marker, text = block[1:]
+            bullet = marker if marker[0].isdigit() else '•'
+            style = ParagraphStyle(f'MdItem{depth}', parent=item_style,
+                                   leftIndent=_LIST_INDENT * (depth + 1), bulletIndent=_LIST_INDENT * depth)
+            story.append(_paragraph(text, style, bulletText=bullet))
+        elif kind == 'code':
+            story.append(Preformatted(block[2] or ' ', code_block_style, maxLineLength=code_chars,
+                                      newLineChars='  '))
+        elif kind == 'table':
+            if block[1]:
+                story.append(_table(block[1], width))
+        elif kind == 'rule':
+            story.append(HRFlowable(width='100%', thickness=0.5, color=guide.BORDER, spaceBefore=6, spaceAfter=10))
+    return story, title
+
+
+def compile_file(path, output, caption=None):
+    """Render the Markdown file at `path` to the PDF `output` (a path or binary file)."""
+    with open(path, encoding='utf-8') as f:
+        story, title = render(parse(f))
+    on_page = functools.partial(guide.on_page, caption=caption or os.path.basename(path))
+    with store.publishing(output) as target:
+        doc = SimpleDocTemplate(target, pagesize=letter, title=title or os.path.basename(path),
+                                **guide.DOC_MARGINS)
+        doc.build(story or [Spacer(1, 1)], onFirstPage=on_page, onLaterPages=on_page)
+    return output
+
+
+def _compile(path, caption):
+    out = io.BytesIO()
+    compile_file(path, out, caption)
+    return out.getvalue()
+
+
+# ----------------------------------------------------------------
+# Batch build
+# ----------------------------------------------------------------
+def sources(patterns=SOURCES, root=REPO_ROOT):
+    return [path for pattern in patterns for path in sorted(glob.glob(os.path.join(root, pattern)))]
+
+
+def _theme_digest():
+    h = hashlib.sha256()
+    for path in (__file__, guide.__file__):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def cache_key(path, rel, theme):
+    h = hashlib.sha256(f'{COMPILER_VERSION}\0{theme}\0{fonts.signature()}\0{rel}\0'.encode())
+    with open(path, 'rb') as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+
+def _init_worker(brand_fonts):
+    if brand_fonts:
+        fonts.use_brand_fonts(brand_fonts)
+        fonts.restyle(v for v in vars(guide).values() if isinstance(v, ParagraphStyle))
+        fonts.restyle(STYLES)
+
+
+def build(paths=None, output_dir=OUTPUT_DIR, root=REPO_ROOT, jobs=None, brand_fonts=None):
+    """Compile `paths` (default: SOURCES) into `output_dir`, mirroring their paths.
+
+    Returns (outputs, number compiled); the rest came from the artifact store.
+    """
+    _init_worker(brand_fonts)  # fonts.signature() in the keys must match the workers'
+    paths = [os.path.abspath(p) for p in (paths or sources(root=root))]
+    theme = _theme_digest()
+    outputs, stale = [], []
+    for path in paths:
+        rel = os.path.relpath(path, root)
+        output = os.path.join(output_dir, os.path.splitext(rel)[0] + '.pdf')
+        key = cache_key(path, rel, theme)
+        outputs.append(output)
+        data = ARTIFACTS.get(key)
+        if data is not None:
+            store.write_atomic(output, data)
+        else:
+            stale.append((path, rel, key, output))
+
+    if stale:
+        # Largest first, so the slowest file starts straight away.
+        stale.sort(key=lambda s: os.path.getsize(s[0]), reverse=True)
+        with ProcessPoolExecutor(min(jobs or os.cpu_count() or 1, len(stale)), initializer=_init_worker,
+                                 initargs=(brand_fonts,)) as pool:
+            futures = {pool.submit(_compile, path, f'Moltblox | {rel}'): (key, output)
+                       for path, rel, key, output in stale}
+            for future in as_completed(futures):
+                key, output = futures[future]
+                data = future.result()
+                ARTIFACTS.put(key, data)
+                store.write_atomic(output, data)
+    ARTIFACTS.flush()
+    return outputs, len(stale)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile the Markdown docs to PDFs in the guide theme.')
+    parser.add_argument('paths', nargs='*', metavar='MD', help=f'files to compile (default: {", ".join(SOURCES)})')
+    parser.add_argument('-o', '--output-dir', default=OUTPUT_DIR, help='where PDFs go (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument(
+        '--brand-fonts', metavar='DIR',
+        help='directory of TTF brand fonts (*-Regular.ttf, *-Bold.ttf, ...) to use instead of Helvetica/Courier',
+    )
+    args = parser.parse_args(argv)
+
+    outputs, compiled = build(args.paths, args.output_dir, jobs=args.jobs, brand_fonts=args.brand_fonts)
+    for output in outputs:
+        print(f'Generated: {os.path.relpath(output)}')
+    print(f'{len(outputs)} PDFs, {compiled} compiled, {len(outputs) - compiled} from cache')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Bookmarks, PDF outline entries and page cross-references.
+
+reportlab's own TableOfContents needs multiBuild, which lays the whole
+document out until page numbers settle. Here page numbers come from the
+pagination plan instead (see paginate.py): the planner assigns a page to
+every Bookmark, then RefParagraphs substitute those pages into their text
+and only the blocks holding them are re-measured.
+"""
+
+import re
+
+from reportlab.platypus import Flowable, KeepTogether, Paragraph, Table
+
+from .lazy import LazyFlowable
+
+_PAGE_REF = re.compile(r'\{page:([\w.-]+)\}')
+
+# Stand-in while pages are unknown; as wide as any page number we print.
+_UNRESOLVED = '00'
+
+
+class Bookmark(Flowable):
+    """Zero-size anchor: a named destination plus an outline entry.
+
+    Extra keyword fields (owner, body, code, ...) are kept in `data` for
+    the search index.
+    """
+
+    _ZEROSIZE = 1
+
+    def __init__(self, key, title, level=0, **data):
+        Flowable.__init__(self)
+        self.key = key
+        self.title = title
+        self.level = level
+        self.data = data
+        self.page = None
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.page = self.canv.getPageNumber()  # the rendered page, whatever was planned
+        self.canv.bookmarkHorizontal(self.key, 0, 0)
+        self.canv.addOutlineEntry(self.title, self.key, level=self.level)
+        self.canv.showOutline()
+
+
+def fill_pages(template, pages):
+    """Substitute {page:key} placeholders; unknown keys get a stand-in."""
+    return _PAGE_REF.sub(lambda m: str(pages.get(m.group(1), _UNRESOLVED)), template)
+
+
+class RefParagraph(Paragraph):
+    """Paragraph whose text contains {page:<bookmark key>} placeholders."""
+
+    def __init__(self, template, style, **kw):
+        self.template = template
+        self._resolved = fill_pages(template, {})
+        Paragraph.__init__(self, self._resolved, style, **kw)
+
+    def resolve(self, pages):
+        """Substitute planned pages; returns True if the text changed."""
+        text = fill_pages(self.template, pages)
+        if text == self._resolved:
+            return False
+        self._resolved = text
+        Paragraph.__init__(self, text, self.style)
+        return True
+
+
+def walk(flowables):
+    """Yield flowables depth-first, descending into tables and KeepTogethers.
+
+    Lazy flowables are not built; only their record's anchors are yielded.
+    """
+    for f in flowables:
+        if isinstance(f, (list, tuple)):
+            yield from walk(f)
+            continue
+        if not isinstance(f, Flowable):
+            continue
+        yield f
+        if isinstance(f, Table):
+            for row in f._cellvalues:
+                yield from walk(row)
+        elif isinstance(f, KeepTogether):
+            yield from walk(f._content)
+        elif isinstance(f, LazyFlowable):
+            yield from walk(f.record.anchors)
+
+
+def bookmarks(flowables):
+    return [f for f in walk(flowables) if isinstance(f, Bookmark)]
+
+
+def drawn_pages(sections, marks):
+    """Search sections with each entry's page taken from its rendered Bookmark."""
+    pages = {m.key: m.page for m in marks}
+    return [(title, [dict(e, page=pages.get(e['id'], e['page'])) for e in entries])
+            for title, entries in sections]
+
+
+def link_steps(markup, color, steps=None, word='step', on_page='on p. {page}'):
+    """Turn "step 11" mentions into links with the step's planned page.
+
+    With `steps`, only mentions of those step numbers are linked; the rest
+    (steps left out of the edition) stay plain text. `word` is the
+    localized "step" and `on_page` the localized "on p. {page}", a whole
+    phrase so translations can put the page number where they need it.
+    """
+    def link(m):
+        if steps is not None and int(m.group(1)) not in steps:
+            return m.group(0)
+        page = on_page.format(page=f'{{page:step-{m.group(1)}}}')
+        return f'<a href="#step-{m.group(1)}" color="{color}">{word} {m.group(1)}</a> {page}'
+
+    return re.sub(rf'\b{re.escape(word)} (\d+)\b', link, markup)
@@ -0,0 +1,303 @@
+"""
+Pagination planner.
+
+Instead of fixed PageBreaks (or repeated trial builds), the story is grouped
+into unbreakable blocks, every block is measured once, and a dynamic
+program picks the page breaks that minimise total badness over the whole
+document. The planned story then goes through a single normal render.
+
+A block is one flowable plus everything glued in front of it: Spacers and
+flowables whose style sets keepWithNext (section headings and intros). So a
+heading always lands on the same page as its first step, and step tables
+are never split.
+
+Planned pages are also what resolves the table of contents and step
+cross-references (outline.py): after planning, each Bookmark learns its
+page, blocks holding RefParagraphs are re-measured, and the plan is only
+recomputed if one of those blocks changed height.
+
+Measured heights are cached on disk, keyed by a fingerprint of each
+block's layout-relevant content (text, styles, column widths, paddings),
+the active fonts and the frame size. Unchanged blocks are not measured
+again, by later builds or by other documents that embed the same story
+(the combined handbook). Builds running at the same time merge their new
+heights into the file under a lock (see store.py), keeping at most
+MAX_HEIGHTS of the most recently added.
+"""
+
+import hashlib
+import json
+import os
+
+from reportlab.platypus import HRFlowable, KeepTogether, PageBreak, Paragraph, Spacer, Table
+
+from . import CACHE_DIR, fonts, store
+from .lazy import LazyFlowable
+from .outline import Bookmark, RefParagraph, walk
+
+LAYOUT_CACHE_PATH = os.path.join(CACHE_DIR, 'layout', 'heights.json')
+LAYOUT_VERSION = 1
+MAX_HEIGHTS = 50_000
+
+# SimpleDocTemplate's frame keeps 6pt of padding on every side.
+FRAME_PADDING = 6
+
+# Cost of breaking inside a section rather than before a section heading,
+# on the same scale as badness() (a page left 30% empty costs ~9).
+MID_SECTION_PENALTY = 10.0
+
+# Re-plans allowed while resolved page references keep changing heights.
+MAX_RESOLVE_PASSES = 3
+
+
+class _Unknown(Exception):
+    """Flowable type whose layout we can't fingerprint; measure it every time."""
+
+
+def style_key(style):
+    """A ParagraphStyle's attributes as plain data, for layout cache keys."""
+    return sorted((k, repr(v)) for k, v in vars(style).items() if k not in ('name', 'parent'))
+
+
+_CELL_ATTRS = (
+    'fontname', 'fontsize', 'leading', 'valign', 'alignment',
+    'leftPadding', 'rightPadding', 'topPadding', 'bottomPadding',
+)
+
+
+def _describe(f):
+    """Layout-relevant state of a flowable (or cell value) as plain data."""
+    if f is None or isinstance(f, (str, int, float)):
+        return f
+    if isinstance(f, (list, tuple)):
+        return [_describe(x) for x in f]
+    if getattr(f, '_ZEROSIZE', False):
+        return [type(f).__name__]
+    if isinstance(f, Paragraph):
+        return ['P', f.text, style_key(f.style)]
+    if isinstance(f, Spacer):
+        return ['S', f.width, f.height]
+    if isinstance(f, HRFlowable):
+        return ['HR', f.width, f.lineWidth, f.spaceBefore, f.spaceAfter]
+    if isinstance(f, KeepTogether):
+        return ['K', _describe(f._content)]
+    if isinstance(f, LazyFlowable):
+        return ['L', type(f.record).__name__, f.record.describe()]  # already plain data
+    if isinstance(f, Table):
+        cells = [[[getattr(cs, a) for a in _CELL_ATTRS] for cs in row] for row in f._cellStyles]
+        return ['T', f._argW, f._argH, _describe(f._cellvalues), cells, repr(f._spanCmds)]
+    raise _Unknown(type(f).__name__)
+
+
+def layout_key(flowables, width, height):
+    """Cache key for a block's measured height, or None if not cacheable."""
+    try:
+        desc = json.dumps(_describe(flowables), default=repr)
+    except _Unknown:
+        return None
+    return hashlib.sha256(
+        f'{LAYOUT_VERSION}|{fonts.signature()}|{width}x{height}|{desc}'.encode()
+    ).hexdigest()
+
+
+def _load_heights(path=LAYOUT_CACHE_PATH):
+    return store.load_json(path)
+
+
+def _save_heights(new, path=LAYOUT_CACHE_PATH):
+    """Merge `new` heights into the shared cache, oldest entries dropped first."""
+    def merge(current):
+        merged = {k: v for k, v in current.items() if k not in new}
+        merged.update(new)
+        return dict(list(merged.items())[-MAX_HEIGHTS:])
+
+    store.update_json(path, merge)
+
+
+def _is_glue(f):
+    """Spacers and zero-size anchors always travel with the next flowable."""
+    return isinstance(f, Spacer) or getattr(f, '_ZEROSIZE', False)
+
+
+class Block:
+    """A run of flowables that must share a page."""
+
+    __slots__ = ('flowables', 'height', 'top_height', 'starts_section')
+
+    def __init__(self, flowables):
+        self.flowables = flowables
+        self.height = 0.0
+        self.top_height = 0.0
+        self.starts_section = any(
+            f.getKeepWithNext() for f in flowables if not _is_glue(f)
+        )
+
+    def measure(self, width, height, heights=None):
+        """Height when placed mid-page and when placed at the top of a page.
+
+        `heights` is the on-disk layout cache; a hit skips wrapping entirely.
+        """
+        key = layout_key(self.flowables, width, height) if heights is not None else None
+        if key is not None and key in heights:
+            self.height, self.top_height = heights[key]
+            return self
+        total = top = 0.0
+        leading = True
+        for f in self.flowables:
+            _, h = f.wrap(width, height)
+            before, after = f.getSpaceBefore(), f.getSpaceAfter()
+            if isinstance(f, LazyFlowable):
+                f.release()  # rebuilt when the render reaches it
+            total += before + h + after
+            if leading and isinstance(f, Spacer):
+                continue  # dropped when the block opens a page
+            # Frames ignore spaceBefore at the top of a page.
+            top += (0 if leading else before) + h + after
+            leading = False
+        self.height, self.top_height = total, top
+        if key:
+            heights[key] = [total, top]
+        return self
+
+    def resolve(self, pages, width, height, heights=None):
+        """Fill in page references; returns True if the block changed height."""
+        refs = [f for f in walk(self.flowables) if isinstance(f, (RefParagraph, LazyFlowable))]
+        if not any([ref.resolve(pages) for ref in refs]):
+            return False
+        before = self.height, self.top_height
+        self.measure(width, height, heights)
+        return (self.height, self.top_height) != before
+
+    def page_flowables(self, at_top):
+        flowables = self.flowables
+        if at_top:
+            while flowables and isinstance(flowables[0], Spacer):
+                flowables = flowables[1:]
+        if len(flowables) > 1:
+            return [KeepTogether(flowables)]
+        return list(flowables)
+
+
+def group_blocks(flowables):
+    """Split a story (without PageBreaks) into blocks."""
+    blocks, pending = [], []
+    for f in flowables:
+        pending.append(f)
+        if not _is_glue(f) and not f.getKeepWithNext():
+            blocks.append(Block(pending))
+            pending = []
+    if pending:
+        if blocks:
+            blocks[-1] = Block(blocks[-1].flowables + pending)
+        else:
+            blocks.append(Block(pending))
+    return blocks
+
+
+def badness(used, capacity):
+    slack = max(capacity - used, 0.0) / capacity
+    return 100.0 * slack * slack
+
+
+def plan_breaks(blocks, capacity):
+    """Return the indices of the blocks that should start a new page.
+
+    Minimises the sum of badness() over every page but the last, plus
+    MID_SECTION_PENALTY for each break that is not before a section.
+    """
+    n = len(blocks)
+    inf = float('inf')
+    cost = [0.0] + [inf] * n
+    start = [0] * (n + 1)
+
+    for j in range(1, n + 1):
+        # Try a page holding blocks i..j-1, growing it backwards.
+        rest = 0.0
+        for i in range(j - 1, -1, -1):
+            used = blocks[i].top_height + rest
+            if used > capacity and i < j - 1:
+                break
+            if j == n:
+                page_cost = 0.0
+            else:
+                page_cost = badness(used, capacity)
+                if not blocks[j].starts_section:
+                    page_cost += MID_SECTION_PENALTY
+            if cost[i] + page_cost < cost[j]:
+                cost[j] = cost[i] + page_cost
+                start[j] = i
+            rest += blocks[i].height
+
+    breaks = []
+    j = n
+    while j > 0:
+        j = start[j]
+        if j:
+            breaks.append(j)
+    return sorted(breaks)
+
+
+def _assign_pages(runs, breaks):
+    """Record each Bookmark's planned page; returns {key: page}."""
+    pages = {}
+    page = 0
+    for blocks, run_breaks in zip(runs, breaks):
+        page += 1
+        for i, block in enumerate(blocks):
+            if i in run_breaks:
+                page += 1
+            for f in walk(block.flowables):
+                if isinstance(f, Bookmark):
+                    f.page = pages[f.key] = page
+    return pages
+
+
+def paginate(story, doc, cache=True):
+    """Return `story` with page breaks chosen by plan_breaks().
+
+    PageBreaks already in the story are kept as forced breaks; the runs
+    between them are planned independently.
+    """
+    width = doc.width - 2 * FRAME_PADDING
+    height = doc.height - 2 * FRAME_PADDING
+    heights = _load_heights() if cache else None
+    known = len(heights) if cache else 0
+
+    runs = [[]]
+    for f in story:
+        if isinstance(f, PageBreak):
+            runs.append([])
+        else:
+            runs[-1].append(f)
+
+    runs = [[b.measure(width, height, heights) for b in group_blocks(run)] for run in runs]
+    if runs[0]:
+        # The document's opening spacer is deliberate; keep it.
+        runs[0][0].top_height = runs[0][0].height
+
+    for _ in range(MAX_RESOLVE_PASSES):
+        breaks = [set(plan_breaks(blocks, height)) for blocks in runs]
+        pages = _assign_pages(runs, breaks)
+        resized = [b.resolve(pages, width, height, heights) for blocks in runs for b in blocks]
+        if not any(resized):
+            break
+    else:
+        # The last pass changed heights: re-plan once more and make sure the
+        # references match the pages they end up on.
+        breaks = [set(plan_breaks(blocks, height)) for blocks in runs]
+        pages = _assign_pages(runs, breaks)
+        if any([b.resolve(pages, width, height, heights) for blocks in runs for b in blocks]):
+            raise RuntimeError(f'page references still move the page breaks after {MAX_RESOLVE_PASSES + 1} '
+                               'passes; the contents and cross-reference pages would be wrong')
+    if cache and len(heights) != known:
+        _save_heights(dict(list(heights.items())[known:]))  # measured by this build
+
+    planned = []
+    for r, (blocks, run_breaks) in enumerate(zip(runs, breaks)):
+        if r:
+            planned.append(PageBreak())
+        for i, block in enumerate(blocks):
+            if i in run_breaks:
+                planned.append(PageBreak())
+            planned.extend(block.page_flowables(at_top=i in run_breaks or (i == 0 and r > 0)))
+    return planned
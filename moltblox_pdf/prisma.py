@@ -0,0 +1,126 @@
+"""
+Incremental parser for the server's Prisma schema.
+
+Only what the diagrams need is parsed: models with their fields, the
+@relation foreign keys between them (with onDelete), @@map table names,
+and enums. The schema is split into its top-level blocks first and each
+block is parsed on its own, cached by the hash of its text, so editing
+one model re-parses one block rather than the whole file.
+"""
+
+import hashlib
+import os
+import re
+
+from . import CACHE_DIR, REPO_ROOT, store
+
+SCHEMA_PATH = os.path.join(REPO_ROOT, 'apps', 'server', 'prisma', 'schema.prisma')
+PRISMA_CACHE_PATH = os.path.join(CACHE_DIR, 'prisma', 'blocks.json')
+PARSER_VERSION = 1
+
+_BLOCK_START = re.compile(r'^(model|enum|view|type|generator|datasource)\s+(\w+)\s*\{\s*$')
+_FIELD = re.compile(r'^(\w+)\s+(\w+)(\[\])?(\?)?\s*(.*)$')
+_RELATION = re.compile(r'@relation\(([^)]*)\)')
+_LIST_ARG = re.compile(r'(\w+)\s*:\s*\[([^\]]*)\]')
+_NAMED_ARG = re.compile(r'(\w+)\s*:\s*(\w+)')
+_MAP = re.compile(r'^@@map\(\s*"([^"]+)"\s*\)')
+
+
+def _strip_comment(line):
+    # Schema strings never contain //, so the first one starts a comment.
+    return line.split('//', 1)[0].strip()
+
+
+def split_blocks(text):
+    """Yield (kind, name, block text) for every top-level block."""
+    kind = name = None
+    lines = []
+    for line in text.splitlines():
+        if kind is None:
+            m = _BLOCK_START.match(line.strip())
+            if m:
+                kind, name, lines = m.group(1), m.group(2), [line]
+            continue
+        lines.append(line)
+        if line.strip() == '}':
+            yield kind, name, '\n'.join(lines)
+            kind = None
+
+
+def _parse_relation(args):
+    rel = {'name': None, 'fields': [], 'references': [], 'onDelete': None}
+    m = re.match(r'\s*"([^"]+)"', args)
+    if m:
+        rel['name'] = m.group(1)
+    for key, values in _LIST_ARG.findall(args):
+        rel[key] = [v.strip() for v in values.split(',') if v.strip()]
+    for key, value in _NAMED_ARG.findall(_LIST_ARG.sub('', args)):
+        if key in ('onDelete', 'onUpdate'):
+            rel[key] = value
+    return rel
+
+
+def parse_block(kind, name, text):
+    """Parse one block into plain data."""
+    body = [_strip_comment(line) for line in text.splitlines()[1:-1]]
+    body = [line for line in body if line]
+    if kind == 'enum':
+        return {'kind': kind, 'name': name, 'values': [line.split()[0] for line in body if not line.startswith('@@')]}
+    if kind not in ('model', 'view', 'type'):
+        return {'kind': kind, 'name': name}
+
+    block = {'kind': kind, 'name': name, 'table': None, 'fields': [], 'relations': []}
+    for line in body:
+        if line.startswith('@@'):
+            m = _MAP.match(line)
+            if m:
+                block['table'] = m.group(1)
+            continue
+        m = _FIELD.match(line)
+        if not m:
+            continue
+        field, type_, is_list, optional, attrs = m.groups()
+        block['fields'].append({
+            'name': field, 'type': type_, 'list': bool(is_list), 'optional': bool(optional),
+            'id': '@id' in attrs, 'unique': '@unique' in attrs,
+        })
+        rel = _RELATION.search(attrs)
+        if rel and not is_list:
+            relation = _parse_relation(rel.group(1))
+            if relation['fields']:  # the side that owns the foreign key
+                relation.update(field=field, target=type_, optional=bool(optional))
+                block['relations'].append(relation)
+    return block
+
+
+def parse(path=SCHEMA_PATH, cache_path=PRISMA_CACHE_PATH):
+    """Return {'models': {name: model}, 'enums': {name: values}} for a schema file."""
+    with open(path) as f:
+        text = f.read()
+    cache = store.load_json(cache_path)
+    used = {}
+    models, enums = {}, {}
+    for kind, name, block_text in split_blocks(text):
+        key = hashlib.sha256(f'{PARSER_VERSION}\0{block_text}'.encode()).hexdigest()
+        block = cache.get(key)
+        if block is None:
+            block = parse_block(kind, name, block_text)
+        used[key] = block
+        if block['kind'] == 'enum':
+            enums[name] = block['values']
+        elif block['kind'] in ('model', 'view'):
+            models[name] = block
+    if used.keys() != cache.keys():
+        store.update_json(cache_path, lambda current: used)  # only the current schema's blocks
+    return {'models': models, 'enums': enums}
+
+
+def foreign_keys(schema):
+    """(child model, parent model, relation) for every FK between two models."""
+    models = schema['models']
+    return [
+        (name, rel['target'], rel)
+        for name, model in models.items()
+        for rel in model['relations']
+        if rel['target'] in models
+    ]
@@ -0,0 +1,163 @@
+"""
+Repository facts quoted in the guide, counted from the tree.
+
+Step text says {fact:migrations} rather than a number that goes stale, and
+fill() substitutes the current value when the guide is built:
+
+    migrations          Prisma migrations in apps/server/prisma/migrations
+    latest_migration    the newest migration's name
+    test_files          test files in apps/server/src/__tests__ and packages/
+    test_cases          it()/test() cases in those files
+    tests:<path>        cases in one test file, by its path under the test
+                        root (ws.test.ts, arena-sdk/__tests__/ArenaClient.test.ts)
+    contracts           contracts declared in contracts/src
+    contract_names      contracts the deploy script deploys, in its order
+                        (Moltbucks, GameMarketplace, ...)
+    contract_addresses  the env vars holding their addresses
+                        (MOLTBUCKS_ADDRESS, GAME_MARKETPLACE_ADDRESS, ...)
+
+Test and contract sources are scanned on a thread pool. Each file's counts
+are cached under a hash of its contents, so a rebuild only re-parses the
+files that changed.
+
+    python -m moltblox_pdf.repofacts
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from . import CACHE_DIR, REPO_ROOT, store
+
+MIGRATIONS_DIR = os.path.join('apps', 'server', 'prisma', 'migrations')
+TEST_ROOTS = (os.path.join('apps', 'server', 'src', '__tests__'), 'packages')
+CONTRACTS_DIR = os.path.join('contracts', 'src')
+DEPLOY_SCRIPT = os.path.join('contracts', 'scripts', 'deploy.ts')
+FACTS_CACHE_PATH = os.path.join(CACHE_DIR, 'repofacts', 'files.json')
+SCANNER_VERSION = 1
+
+_TEST_FILE = re.compile(r'\.(test|spec)\.tsx?$')
+_SKIP_DIRS = {'node_modules', 'dist', '.turbo', '.next'}
+_COMMENTS = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
+# A case is it(...)/test(...) at the start of a line, with modifiers such
+# as .skip, .only or .each([...]).
+_CASE = re.compile(r'^\s*(?:it|test)(?:\.\w+)*\s*[(`]', re.MULTILINE)
+_CONTRACT = re.compile(r'^\s*(?:abstract\s+)?contract\s+\w+', re.MULTILINE)
+_DEPLOYED = re.compile(r'getContractFactory\(\s*["\'](\w+)["\']')
+_FACT = re.compile(r'\{fact:([\w./:-]+)\}')
+
+
+def _walk(root, match, repo_root):
+    for dirpath, dirnames, filenames in os.walk(os.path.join(repo_root, root)):
+        dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+        for name in sorted(filenames):
+            if match(name):
+                yield os.path.relpath(os.path.join(dirpath, name), repo_root).replace(os.sep, '/')
+
+
+def migrations(repo_root=REPO_ROOT):
+    """Migration names in the order Prisma applies them."""
+    root = os.path.join(repo_root, MIGRATIONS_DIR)
+    names = [n for n in os.listdir(root) if os.path.isfile(os.path.join(root, n, 'migration.sql'))]
+    # Names start with a sequence number: 0_init, 1_..., 10_...
+    return sorted(names, key=lambda n: (int(n.split('_')[0]) if n.split('_')[0].isdigit() else 0, n))
+
+
+def deployed_contracts(repo_root=REPO_ROOT):
+    """Contract names in the order the deploy script deploys them."""
+    with open(os.path.join(repo_root, DEPLOY_SCRIPT), encoding='utf-8') as f:
+        return list(dict.fromkeys(_DEPLOYED.findall(_COMMENTS.sub('', f.read()))))
+
+
+def address_var(contract):
+    """Env var holding `contract`'s deployed address: GameMarketplace -> GAME_MARKETPLACE_ADDRESS."""
+    return re.sub(r'(?<=[a-z0-9])(?=[A-Z])', '_', contract).upper() + '_ADDRESS'
+
+
+def _count(kind, source):
+    source = _COMMENTS.sub('', source)
+    return len((_CASE if kind == 'tests' else _CONTRACT).findall(source))
+
+
+def _scan(args):
+    rel, kind, repo_root, cache = args
+    with open(os.path.join(repo_root, rel), 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    entry = cache.get(rel)
+    if entry and entry[0] == digest:
+        return rel, entry, False
+    return rel, [digest, kind, _count(kind, data.decode('utf-8', 'replace'))], True
+
+
+def _load_cache(path):
+    cache = store.load_json(path)
+    return cache.get('files', {}) if cache.get('version') == SCANNER_VERSION else {}
+
+
+def _save_cache(files, path):
+    store.update_json(path, lambda current: {'version': SCANNER_VERSION, 'files': files})
+
+
+def scan(repo_root=REPO_ROOT, cache_path=FACTS_CACHE_PATH, jobs=None):
+    """{fact: value} for the tree at `repo_root`."""
+    targets = [(rel, 'tests') for root in TEST_ROOTS for rel in _walk(root, _TEST_FILE.search, repo_root)]
+    targets += [(rel, 'contracts') for rel in _walk(CONTRACTS_DIR, lambda n: n.endswith('.sol'), repo_root)]
+    cache = _load_cache(cache_path)
+    with ThreadPoolExecutor(jobs) as pool:
+        results = list(pool.map(_scan, [(rel, kind, repo_root, cache) for rel, kind in targets]))
+    files = {rel: entry for rel, entry, _ in results}
+    if any(parsed for _, _, parsed in results) or files.keys() != cache.keys():
+        _save_cache(files, cache_path)
+
+    names = migrations(repo_root)
+    deployed = deployed_contracts(repo_root)
+    tests = {rel: count for rel, (_, kind, count) in files.items() if kind == 'tests'}
+    by_name = {}
+    for rel, count in tests.items():
+        root = next(r for r in TEST_ROOTS if rel.startswith(r.replace(os.sep, '/') + '/'))
+        by_name[rel[len(root) + 1:]] = count
+    facts = {
+        'migrations': len(names),
+        'latest_migration': names[-1] if names else 'none',
+        'test_files': len(tests),
+        'test_cases': sum(tests.values()),
+        'contracts': sum(count for _, kind, count in files.values() if kind == 'contracts'),
+        'contract_names': ', '.join(deployed),
+        'contract_addresses': ', '.join(address_var(name) for name in deployed),
+    }
+    facts.update({f'tests:{name}': count for name, count in by_name.items()})
+    return facts
+
+
+_facts = None
+
+
+def facts():
+    """The facts for this checkout, scanned once per process."""
+    global _facts
+    if _facts is None:
+        _facts = scan()
+    return _facts
+
+
+def fill(template):
+    """Substitute {fact:name} placeholders; an unknown name is an error, not a blank."""
+    if '{fact:' not in template:
+        return template
+    known = facts()
+
+    def value(m):
+        if m.group(1) not in known:
+            raise KeyError(f'unknown repository fact {m.group(1)!r} (see moltblox_pdf.repofacts)')
+        return str(known[m.group(1)])
+
+    return _FACT.sub(value, template)
+
+
+if __name__ == '__main__':
+    json.dump(scan(), sys.stdout, indent=2)
+    sys.stdout.write('\n')
@@ -0,0 +1,97 @@
+"""
+JSON search index written next to each generated PDF.
+
+The web viewer loads <name>.index.json instead of parsing the PDF: a list
+of entries (step number, title, owner, section, page) plus an inverted
+index from token to entry positions, so it can search instantly and jump
+straight to the right page.
+
+Tokenizing is done per section and cached by the section's content hash,
+so a rebuild only re-tokenizes the sections that changed. Pages are not
+part of that hash; they are attached when the sections are merged.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+
+from . import CACHE_DIR, store
+
+INDEX_VERSION = 1
+SEARCH_CACHE_DIR = os.path.join(CACHE_DIR, 'search')
+
+_TAG = re.compile(r'<[^>]+>')
+_WORD = re.compile(r'\w[\w.\-/]*\w|\w')  # letters in any language
+
+
+def plain_text(markup):
+    """Strip Paragraph markup and entities."""
+    return html.unescape(_TAG.sub(' ', markup or ''))
+
+
+def tokenize(text):
+    """Lowercase tokens; compound tokens (env vars, paths, hosts) also yield their parts."""
+    tokens = []
+    for word in _WORD.findall(plain_text(text).lower()):
+        tokens.append(word)
+        parts = [p for p in re.split(r'[_.\-/]+', word) if p]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def index_path(pdf_path):
+    return os.path.splitext(pdf_path)[0] + '.index.json'
+
+
+def _section_fragment(title, entries, cache_dir):
+    """Entries (without pages) and local postings for one section, cached."""
+    stored = [{k: v for k, v in e.items() if k not in ('page', 'text')} for e in entries]
+    for e in stored:
+        e['section'] = title
+    texts = [e.get('text', '') for e in entries]
+    key = hashlib.sha256(
+        json.dumps([INDEX_VERSION, title, stored, texts], sort_keys=True).encode()
+    ).hexdigest()
+    cache_path = os.path.join(cache_dir, key + '.json')
+    fragment = store.load_json(cache_path)
+    if fragment:
+        return fragment
+
+    postings = {}
+    for i, (entry, text) in enumerate(zip(stored, texts)):
+        for token in set(tokenize(f'{entry["title"]} {text}')):
+            postings.setdefault(token, []).append(i)
+    fragment = {'entries': stored, 'postings': postings}
+
+    store.write_atomic(cache_path, json.dumps(fragment, separators=(',', ':')))
+    return fragment
+
+
+def write_index(pdf_path, sections, cache_dir=SEARCH_CACHE_DIR):
+    """Write the sidecar index for `pdf_path`.
+
+    `sections` is a list of (section title, entries); each entry is a dict
+    with at least id, title and page, plus a 'text' field holding the
+    searchable body (not stored). Any other fields are stored as-is.
+    """
+    entries, index = [], {}
+    for title, section_entries in sections:
+        fragment = _section_fragment(title, section_entries, cache_dir)
+        offset = len(entries)
+        for stored, entry in zip(fragment['entries'], section_entries):
+            entries.append(dict(stored, page=entry['page']))
+        for token, positions in fragment['postings'].items():
+            index.setdefault(token, []).extend(p + offset for p in positions)
+
+    path = index_path(pdf_path)
+    data = {
+        'version': INDEX_VERSION,
+        'pdf': os.path.basename(pdf_path),
+        'entries': entries,
+        'index': dict(sorted(index.items())),
+    }
+    store.write_atomic(path, json.dumps(data, separators=(',', ':')))
+    return path
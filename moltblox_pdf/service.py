@@ -0,0 +1,367 @@
+"""
+Local HTTP service rendering guide editions and the flowcharts on demand.
+
+    GET /guide.pdf?chain=base-mainnet&owner=you&done=1,2,5&locale=de
+    GET /flowcharts.pdf
+    GET /metrics        throughput, latency and cache stats as JSON
+    GET /health
+
+Guide editions vary by target chain, owner filter, the steps already
+done (see moltblox_testnet_launch.apply_edition) and language (see
+moltblox_pdf.i18n). Parameters are
+normalized into a cache key (done steps sorted, unknown or filtered-out
+steps dropped), and rendered PDFs are kept in memory in an LRU bounded
+by total size; repeat requests are answered from it and concurrent
+requests for the same edition share one render.
+
+Misses render on a process pool. At most `jobs + queue` renders are in
+flight; past that a miss gets 503 with Retry-After instead of queueing
+without bound. If a worker dies (a crash, the OOM killer) the pool is
+replaced and the renders it took down are retried once. PDF bytes go
+straight from the cache to the socket, with no temporary files on either
+side.
+
+    python -m moltblox_pdf.service --port 8077 -j 2
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs, urlsplit
+
+from reportlab.lib.styles import ParagraphStyle
+
+from . import fonts, guidediff, handbook, i18n
+
+import moltblox_testnet_launch as guide
+
+HOST = '127.0.0.1'
+PORT = 8077
+CACHE_BYTES = 64 * 2 ** 20
+QUEUE = 8
+CHUNK = 64 * 1024
+TIMEOUT = 30
+# Latency samples kept for the percentiles; throughput is over WINDOW seconds.
+SAMPLES = 1024
+WINDOW = 60
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class Busy(Exception):
+    """Every render slot is taken; the client should retry."""
+
+
+# ----------------------------------------------------------------
+# Editions
+# ----------------------------------------------------------------
+def step_owners(source=None):
+    """{step number: owner} for the guide, read from its source."""
+    sections, _ = guidediff.extract(source or guidediff.read_source(guidediff.WORKTREE))
+    return {step['num']: step['owner'] for steps in sections.values() for step in steps}
+
+
+def edition_key(path, query, owners):
+    """Cache key for a request, or ValueError (bad parameters) / LookupError (no such PDF).
+
+    Equivalent requests map to the same key: 'done' is sorted and keeps only
+    steps that exist and are shown in the edition.
+    """
+    params = {k: v[-1] for k, v in parse_qs(query).items()}
+    if path == '/flowcharts.pdf':
+        return ('flowcharts',)
+    if path != '/guide.pdf':
+        raise LookupError(path)
+    chain = params.get('chain', guide.DEFAULT_CHAIN)
+    if chain not in guide.CHAINS:
+        raise ValueError(f'chain must be one of {", ".join(sorted(guide.CHAINS))}')
+    owner = params.get('owner') or None
+    if owner is not None and owner not in guide.OWNERS:
+        raise ValueError(f'owner must be one of {", ".join(guide.OWNERS)}')
+    try:
+        done = {int(n) for n in params.get('done', '').split(',') if n.strip()}
+    except ValueError:
+        raise ValueError('done must be comma-separated step numbers') from None
+    done = tuple(sorted(n for n in done if n in owners and owner in (None, owners[n])))
+    locale = params.get('locale', i18n.SOURCE_LOCALE)
+    if locale not in i18n.locales():
+        raise LookupError(f'no {locale} edition')
+    return ('guide', chain, owner, done, locale)
+
+
+_flowcharts = None
+
+
+def render(key):
+    """PDF bytes for a cache key (runs in a worker process)."""
+    global _flowcharts
+    out = io.BytesIO()
+    if key[0] == 'flowcharts':
+        if _flowcharts is None:
+            _flowcharts = handbook._load_flowcharts()
+        _flowcharts.render(out)
+    else:
+        _, chain, owner, done, locale = key
+        guide.render(out, chain=chain, owner=owner, done=set(done), locale=locale)
+    return out.getvalue()
+
+
+def _init_worker(brand_fonts):
+    global _flowcharts
+    if brand_fonts:
+        fonts.use_brand_fonts(brand_fonts)
+        _flowcharts = handbook._load_flowcharts()
+        for module in (guide, _flowcharts):
+            fonts.restyle(v for v in vars(module).values() if isinstance(v, ParagraphStyle))
+
+
+# ----------------------------------------------------------------
+# Cache and renderer
+# ----------------------------------------------------------------
+class LRUCache:
+    """Byte strings by key, evicting least recently used past `max_bytes`."""
+
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        data = self._items.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return  # would evict everything else and still not fit
+        if key in self._items:
+            self.size -= len(self._items.pop(key))
+        self._items[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, old = self._items.popitem(last=False)
+            self.size -= len(old)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'entries': len(self), 'bytes': self.size, 'max_bytes': self.max_bytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else None}
+
+
+def _percentiles(samples):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)  # noqa: E731
+    return {'p50_ms': pick(0.5), 'p95_ms': pick(0.95), 'max_ms': round(ordered[-1] * 1000, 1)}
+
+
+class Renderer:
+    """Serves PDFs from the cache, rendering misses on a bounded process pool."""
+
+    def __init__(self, jobs=None, queue=QUEUE, cache_bytes=CACHE_BYTES, brand_fonts=None):
+        self.brand_fonts = brand_fonts
+        self.pool = self._new_pool(jobs)
+        self.jobs = self.pool._max_workers
+        self.limit = self.jobs + queue
+        self.cache = LRUCache(cache_bytes)
+        self.inflight = {}  # key -> asyncio.Future of the render
+        self.renders = self.failures = self.rejected = self.restarts = 0
+        self.render_times = deque(maxlen=SAMPLES)
+
+    def _new_pool(self, jobs):
+        return ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(self.brand_fonts,))
+
+    async def _render(self, key):
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        try:
+            return await loop.run_in_executor(pool, render, key)
+        except BrokenProcessPool:
+            # A dead worker breaks the whole pool; the first render to notice
+            # replaces it, and every render it took down is retried once.
+            if self.pool is pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = self._new_pool(self.jobs)
+                self.restarts += 1
+            return await loop.run_in_executor(self.pool, render, key)
+
+    async def get(self, key):
+        """(PDF bytes, how it was served: 'cache', 'render' or 'shared')."""
+        data = self.cache.get(key)
+        if data is not None:
+            return data, 'cache'
+        if key in self.inflight:
+            return await asyncio.shield(self.inflight[key]), 'shared'
+        if len(self.inflight) >= self.limit:
+            self.rejected += 1
+            raise Busy()
+
+        future = self.inflight[key] = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        try:
+            data = await self._render(key)
+        except Exception as e:
+            self.failures += 1
+            future.set_exception(e)
+            future.exception()  # retrieved: joiners re-raise it themselves
+            raise
+        finally:
+            del self.inflight[key]
+        self.renders += 1
+        self.render_times.append(time.perf_counter() - start)
+        self.cache.put(key, data)
+        future.set_result(data)
+        return data, 'render'
+
+    def stats(self):
+        return {'renders': self.renders, 'failures': self.failures, 'rejected': self.rejected,
+                'pool_restarts': self.restarts, 'in_flight': len(self.inflight), 'limit': self.limit,
+                'latency': _percentiles(self.render_times), 'cache': self.cache.stats()}
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+# ----------------------------------------------------------------
+# HTTP
+# ----------------------------------------------------------------
+class Service:
+    """Minimal HTTP/1.1 front end (one request per connection) for a Renderer."""
+
+    def __init__(self, renderer, owners=None):
+        self.renderer = renderer
+        self.owners = owners or step_owners()
+        self.started = time.time()
+        self.requests = 0
+        self.status = {}
+        self.bytes_sent = 0
+        self.latency = deque(maxlen=SAMPLES)
+        self.recent = deque()  # completion times within WINDOW
+
+    def metrics(self):
+        now = time.time()
+        while self.recent and self.recent[0] < now - WINDOW:
+            self.recent.popleft()
+        uptime = now - self.started
+        return {
+            'uptime_s': round(uptime, 1),
+            'requests': self.requests,
+            'status': {str(k): v for k, v in sorted(self.status.items())},
+            'bytes_sent': self.bytes_sent,
+            'throughput': {'requests_per_s': round(self.requests / uptime, 3) if uptime else 0,
+                           f'last_{WINDOW}s_per_s': round(len(self.recent) / min(uptime, WINDOW), 3) if uptime else 0},
+            'latency': _percentiles(self.latency),
+            'render': self.renderer.stats(),
+        }
+
+    async def respond(self, method, target):
+        """(status, headers, body) for one request."""
+        parts = urlsplit(target)
+        if method not in ('GET', 'HEAD'):
+            return 405, {'Allow': 'GET, HEAD'}, b''
+        if parts.path == '/health':
+            return 200, {'Content-Type': 'text/plain'}, b'ok\n'
+        if parts.path == '/metrics':
+            return 200, {'Content-Type': 'application/json'}, json.dumps(self.metrics(), indent=2).encode()
+        try:
+            key = edition_key(parts.path, parts.query, self.owners)
+        except LookupError:
+            return 404, {'Content-Type': 'text/plain'}, b'not found\n'
+        except ValueError as e:
+            return 400, {'Content-Type': 'text/plain'}, f'{e}\n'.encode()
+        try:
+            data, served = await self.renderer.get(key)
+        except Busy:
+            return 503, {'Retry-After': '1', 'Content-Type': 'text/plain'}, b'all render slots busy\n'
+        except Exception as e:
+            return 500, {'Content-Type': 'text/plain'}, f'render failed: {type(e).__name__}: {e}\n'.encode()
+        return 200, {'Content-Type': 'application/pdf', 'X-Cache': served,
+                     'Content-Disposition': f'inline; filename="{parts.path.strip("/")}"'}, data
+
+    async def handle(self, reader, writer):
+        start = time.perf_counter()
+        status = None
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), TIMEOUT)
+            while (await asyncio.wait_for(reader.readline(), TIMEOUT)) not in (b'\r\n', b'\n', b''):
+                pass  # headers are not used
+            fields = request_line.decode('latin-1').split()
+            if len(fields) != 3:
+                return
+            method, target, _ = fields
+            status, headers, body = await self.respond(method, target)
+            head = [f'HTTP/1.1 {status} {_REASONS[status]}', f'Content-Length: {len(body)}', 'Connection: close']
+            head += [f'{k}: {v}' for k, v in headers.items()]
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+            if method != 'HEAD':
+                view = memoryview(body)
+                for i in range(0, len(view), CHUNK):
+                    writer.write(view[i:i + CHUNK])
+                    await writer.drain()
+                self.bytes_sent += len(body)
+            await writer.drain()
+        except (OSError, asyncio.TimeoutError, UnicodeDecodeError):
+            pass
+        finally:
+            writer.close()
+            if status is not None:
+                self.requests += 1
+                self.status[status] = self.status.get(status, 0) + 1
+                self.latency.append(time.perf_counter() - start)
+                self.recent.append(time.time())
+
+
+async def serve(host=HOST, port=PORT, jobs=None, queue=QUEUE, cache_bytes=CACHE_BYTES, brand_fonts=None):
+    renderer = Renderer(jobs, queue, cache_bytes, brand_fonts)
+    service = Service(renderer)
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f'Serving on http://{host}:{port}/ ({renderer.jobs} workers)')
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        renderer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve guide editions and the flowcharts as PDFs on demand.')
+    parser.add_argument('--host', default=HOST, help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=PORT, help='port to listen on (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, help='render processes (default: one per CPU)')
+    parser.add_argument('--queue', type=int, default=QUEUE,
+                        help='renders that may wait for a process before requests get 503 (default: %(default)s)')
+    parser.add_argument('--cache-mb', type=float, default=CACHE_BYTES / 2 ** 20,
+                        help='memory for cached PDFs in MiB (default: %(default)s)')
+    parser.add_argument(
+        '--brand-fonts', metavar='DIR',
+        help='directory of TTF brand fonts (*-Regular.ttf, *-Bold.ttf, ...) to use instead of Helvetica/Courier',
+    )
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.jobs, args.queue, int(args.cache_mb * 2 ** 20),
+                          args.brand_fonts))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Process-safe on-disk cache shared by concurrent builds.
+
+Builds running side by side (parallel CI jobs, the render service's
+workers, two terminals) share CACHE_DIR and the output paths:
+
+- Readers never lock. Files are written under a temporary name in the
+  same directory and renamed into place, so a reader sees the old file or
+  the new one, never a partial write. Generated PDFs are published the
+  same way (see publishing()).
+- Read-modify-write updates of a shared file (the layout heights, store
+  stats) hold an exclusive lock on a sidecar .lock file while they merge,
+  so concurrent builds add to each other's results instead of the last
+  writer winning.
+
+Store keeps finished artifacts by key in a directory bounded in bytes. A
+hit refreshes the file's mtime; when a put takes the directory past its
+limit, the least recently used files are evicted. Hits, misses and
+evictions are counted per process and merged into the store's stats.json
+by flush().
+
+    python -m moltblox_pdf.store            # stats for every store
+    python -m moltblox_pdf.store --clear
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from . import CACHE_DIR
+
+STORE_DIR = os.path.join(CACHE_DIR, 'store')
+MAX_BYTES = 256 * 2 ** 20
+STATS = 'stats.json'
+_COUNTERS = ('hits', 'misses', 'puts', 'evictions')
+
+
+def _tmp(path):
+    return f'{path}.{os.getpid()}.tmp'
+
+
+@contextmanager
+def locked(path):
+    """Hold an exclusive lock for `path` (on `path`.lock) across processes."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f'{path}.lock', 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_atomic(path, data):
+    """Write bytes or str to `path` via a temporary file and a rename."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = _tmp(path)
+    with open(tmp, 'wb' if isinstance(data, bytes) else 'w') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def publishing(output):
+    """Yield where to write `output`; a path is only replaced once the write succeeds.
+
+    File objects are passed through unchanged.
+    """
+    if not isinstance(output, str):
+        yield output
+        return
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    tmp = _tmp(output)
+    try:
+        yield tmp
+        os.replace(tmp, output)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_json(path, default=None):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {} if default is None else default
+
+
+def update_json(path, merge):
+    """Replace the JSON at `path` with merge(current) under the lock; returns the result."""
+    with locked(path):
+        data = merge(load_json(path))
+        write_atomic(path, json.dumps(data, separators=(',', ':')))
+    return data
+
+
+class Store:
+    """Artifacts by key under STORE_DIR/`name`, evicted least recently used past `max_bytes`."""
+
+    def __init__(self, name, max_bytes=MAX_BYTES, root=STORE_DIR):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.directory = os.path.join(root, name)
+        self.counts = dict.fromkeys(_COUNTERS, 0)
+
+    def path(self, key, suffix='.pdf'):
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key, suffix='.pdf'):
+        """Contents stored under `key`, or None. Never locks."""
+        path = self.path(key, suffix)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.counts['misses'] += 1
+            return None
+        self.counts['hits'] += 1
+        try:
+            os.utime(path)  # most recently used
+        except OSError:
+            pass  # evicted meanwhile; we already have the bytes
+        return data
+
+    def put(self, key, data, suffix='.pdf'):
+        """Store `data` under `key`, evicting old entries if the store is over its limit."""
+        write_atomic(self.path(key, suffix), data)
+        self.counts['puts'] += 1
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if e.name == STATS or e.name.endswith(('.tmp', '.lock')):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, e.path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        with locked(self.directory):
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue  # another process evicted it
+                total -= size
+                self.counts['evictions'] += 1
+
+    def flush(self):
+        """Add this process's counters to the store's shared stats."""
+        if not any(self.counts.values()):
+            return
+        counts, self.counts = self.counts, dict.fromkeys(_COUNTERS, 0)
+        update_json(os.path.join(self.directory, STATS),
+                    lambda stats: {k: stats.get(k, 0) + counts[k] for k in _COUNTERS})
+
+    def stats(self):
+        """Shared counters plus the store's current size."""
+        stats = load_json(os.path.join(self.directory, STATS))
+        stats = {k: stats.get(k, 0) for k in _COUNTERS}
+        lookups = stats['hits'] + stats['misses']
+        entries = self._entries() if os.path.isdir(self.directory) else []
+        stats.update(hit_rate=stats['hits'] / lookups if lookups else None, entries=len(entries),
+                     bytes=sum(size for _, size, _ in entries), max_bytes=self.max_bytes)
+        return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Show or clear the shared render stores.')
+    parser.add_argument('--clear', action='store_true', help='delete every store')
+    args = parser.parse_args(argv)
+
+    names = sorted(os.listdir(STORE_DIR)) if os.path.isdir(STORE_DIR) else []
+    for name in names:
+        if args.clear:
+            with locked(os.path.join(STORE_DIR, name)):
+                shutil.rmtree(os.path.join(STORE_DIR, name))
+            print(f'Cleared: {name}')
+            continue
+        s = Store(name).stats()
+        rate = f'{s["hit_rate"]:.0%}' if s['hit_rate'] is not None else '-'
+        print(f'{name}: {s["entries"]} files, {s["bytes"] / 2 ** 20:.1f} MiB, {s["hits"]} hits, '
+              f'{s["misses"]} misses ({rate}), {s["evictions"]} evicted')
+    if not names:
+        print('No stores yet.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
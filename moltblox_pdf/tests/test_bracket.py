@@ -0,0 +1,69 @@
+"""Bracket generation, tiling and continuation markers."""
+
+import io
+
+import pytest
+
+from moltblox_pdf import bracket
+
+
+# Like BracketGenerator, a lone round-1 match stays in the winners bracket.
+@pytest.mark.parametrize('entrants, matches, last', [
+    (2, 1, 'winners'), (5, 7, 'finals'), (8, 7, 'finals'), (1024, 1023, 'finals'),
+])
+def test_single_elimination_sizes(entrants, matches, last):
+    generated = bracket.single_elimination([f'p{i}' for i in range(entrants)])
+    assert len(generated) == matches
+    assert generated[-1]['bracket'] == last
+
+
+def test_double_elimination_sections():
+    generated = bracket.double_elimination([f'p{i}' for i in range(8)])
+    kinds = [kind for kind, _, _ in bracket.sections(generated)]
+    assert kinds == ['winners', 'losers', 'finals']
+    counts = {kind: sum(map(len, cols)) for kind, _, cols in bracket.sections(generated)}
+    assert counts == {'winners': 7, 'losers': 6, 'finals': 2}
+
+
+def test_too_few_players():
+    with pytest.raises(ValueError):
+        bracket.single_elimination(['p1'])
+
+
+def test_rounds_that_do_not_halve_are_rejected():
+    matches = [bracket._match(1, n, 'winners') for n in (1, 2, 3)] + [bracket._match(2, 4, 'winners')] * 2
+    with pytest.raises(ValueError, match='cannot follow one of 3'):
+        bracket._columns(matches, 'Bracket')
+
+
+def test_small_sections_are_one_tile():
+    (_, _, columns), = bracket.sections(bracket.sample(8))
+    tiling = bracket.Tiling(columns)
+    assert len(tiling.tiles) == 1
+    assert {tiling.tile_of(c, m) for c, col in enumerate(columns) for m in range(len(col))} == {0}
+
+
+def test_tile_of_a_256_entrant_bracket():
+    # 128 first-round matches: eight tiles of rounds 1-5 (16 rows each),
+    # then one tile for rounds 6-8.
+    (_, _, columns), = bracket.sections(bracket.sample(256))
+    tiling = bracket.Tiling(columns)
+    assert [(t.first, t.last, t.start, t.count) for t in tiling.tiles] == (
+        [(0, 4, i, 1) for i in range(8)] + [(5, 7, 0, 1)]
+    )
+    assert [tiling.tile_of(0, m) for m in (0, 15, 16, 127)] == [0, 0, 1, 7]
+    assert [tiling.tile_of(4, m) for m in range(8)] == list(range(8))
+    assert tiling.tile_of(5, 3) == tiling.tile_of(7, 0) == 8
+
+
+def test_markers_give_the_pages_of_the_other_tiles(monkeypatch):
+    markers = []
+    monkeypatch.setattr(bracket.BracketTile, '_marker',
+                        lambda self, text, font, x, y, target, align: markers.append((self.tile.index, text, target)))
+    bracket.render(bracket.sample(256), io.BytesIO())
+
+    forward = [(tile, text) for tile, text, _ in markers if text.endswith('»')]
+    assert forward == [(i, 'p. 9 »') for i in range(8)]  # every first-band winner continues on page 9
+    back = [text for tile, text, _ in markers if tile == 8]
+    assert back == [f'« p. {page}' for page in range(1, 9)]
+    assert {target for tile, _, target in markers if tile == 8} == {f'bracket-single-{i}' for i in range(8)}
@@ -0,0 +1,36 @@
+"""LTTB downsampling and the time series chart built on it."""
+
+import numpy as np
+import pytest
+
+from moltblox_pdf import charts
+
+
+def test_keeps_threshold_points_including_the_ends():
+    x = np.arange(10_000)
+    keep = charts.lttb(x, np.sin(x / 300), 300)
+    assert len(keep) == 300
+    assert keep[0] == 0 and keep[-1] == 9_999
+    assert (np.diff(keep) > 0).all()
+
+
+@pytest.mark.parametrize('n, threshold', [(50, 300), (300, 300), (1000, 2), (1000, 0)])
+def test_small_series_and_tiny_thresholds_pass_through(n, threshold):
+    assert charts.lttb(np.arange(n), np.zeros(n), threshold).tolist() == list(range(n))
+    assert charts.kept(n, threshold) == n
+
+
+def test_keeps_a_spike_a_stride_would_skip():
+    y = np.zeros(10_000)
+    y[4_321] = 1.0
+    assert 4_321 in charts.lttb(np.arange(10_000), y, 100)
+    assert 4_321 not in range(0, 10_000, 100)
+
+
+def test_time_series_chart_reports_what_it_draws():
+    x = np.arange(5_000)
+    chart = charts.TimeSeriesChart(
+        [dict(x=x, y=x % 97, color=None), dict(x=x[:40], y=x[:40], color=None)], 400, 120, 'Emission', points=200,
+    )
+    assert chart.drawn == [200, 40]
+    assert [len(s['x']) for s in chart.series] == chart.drawn
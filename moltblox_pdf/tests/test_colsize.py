@@ -0,0 +1,43 @@
+"""Column extents and width solving."""
+
+import pytest
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from moltblox_pdf import colsize
+
+STYLE = ParagraphStyle('Cell', fontName='Helvetica', fontSize=8)
+
+
+def test_extent_matches_string_width():
+    word, cell = colsize.extent(['deploy the contracts', 'BASE_RPC_URL'], 'Helvetica', 8)
+    assert word == pytest.approx(stringWidth('BASE_RPC_URL', 'Helvetica', 8))
+    assert cell == pytest.approx(stringWidth('deploy the contracts', 'Helvetica', 8))
+
+
+def test_newlines_inside_a_cell_are_spaces():
+    word, cell = colsize.extent(['two\nwords'], 'Helvetica', 8)
+    assert cell == pytest.approx(stringWidth('two words', 'Helvetica', 8))
+
+
+@pytest.mark.parametrize('texts', [[], [''], ['', ''], ['', '', '']])
+def test_empty_and_all_empty_groups(texts):
+    assert colsize.extent(texts, 'Helvetica', 8) == (0.0, 0.0)
+    assert colsize.column_extent([(texts, STYLE)]) == (colsize.CELL_PADDING, colsize.CELL_PADDING)
+
+
+def test_all_empty_column_still_gets_padding():
+    widths = colsize.auto_widths([[([''], STYLE)], [(['No step or env-var changes.'], STYLE)]], 400)
+    assert sum(widths) == pytest.approx(400)
+    assert widths[0] >= colsize.CELL_PADDING
+
+
+def test_solve_shares_slack_by_demand():
+    # Enough room for the minimums but not the maximums: each column gets
+    # its minimum plus slack in proportion to what it still wants.
+    assert colsize.solve([10, 10], [30, 70], 60) == pytest.approx([20, 40])
+
+
+def test_solve_scales_when_too_narrow_or_too_wide():
+    assert colsize.solve([20, 60], [40, 80], 40) == pytest.approx([10, 30])
+    assert colsize.solve([10, 10], [20, 60], 160) == pytest.approx([40, 120])
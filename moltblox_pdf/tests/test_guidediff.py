@@ -0,0 +1,70 @@
+"""Step extraction and Merkle diffs of the guide source."""
+
+from moltblox_pdf import guidediff
+
+GUIDE = '''
+story.append(Paragraph(_('A. Local Setup'), section_style))
+story.append(make_step(1, 'Clone the repo', 'Run git clone.'))
+story.append(make_step(2, 'Install', 'Run pnpm install.', owner='claude', code='pnpm install'))
+story.append(Paragraph(_('B. Deploy Contracts'), section_style))
+story.append(make_step(3, 'Deploy', 'Run the deploy script.'))
+story.append(make_step(4, 'Verify', 'Check the explorer.'))
+story.append(make_step(5, 'Verify', 'Check the server logs.'))
+env_data = [
+    env_header,
+    ['BASE_RPC_URL', 'server', 'https://sepolia.base.org'],
+    ['DATABASE_URL', 'server', 'postgres://...'],
+]
+'''
+
+
+def _diff(old, new):
+    return guidediff.diff_trees(
+        guidediff.merkle(*guidediff.extract(old)), guidediff.merkle(*guidediff.extract(new)),
+    )
+
+
+def test_extract_reads_sections_steps_and_env():
+    sections, env = guidediff.extract(GUIDE)
+    assert list(sections) == ['A. Local Setup', 'B. Deploy Contracts']
+    assert sections['A. Local Setup'][1] == {
+        'num': 2, 'title': 'Install', 'body': 'Run pnpm install.', 'owner': 'claude', 'code': 'pnpm install',
+    }
+    assert sections['B. Deploy Contracts'][0]['owner'] == 'you'
+    assert env == {'BASE_RPC_URL': ('server', 'https://sepolia.base.org'), 'DATABASE_URL': ('server', 'postgres://...')}
+
+
+def test_identical_sources_have_no_changes():
+    assert _diff(GUIDE, GUIDE) == {'sections': [], 'steps': [], 'env': []}
+
+
+def test_an_inserted_step_moves_the_ones_after_it():
+    new = GUIDE.replace(
+        "story.append(make_step(2, 'Install'",
+        "story.append(make_step(2, 'Check Node', 'Run node -v.'))\nstory.append(make_step(3, 'Install'",
+    )
+    for n in (5, 4, 3):
+        new = new.replace(f'make_step({n}, ', f'make_step({n + 1}, ')
+    steps = _diff(GUIDE, new)['steps']
+    assert {(s['title'], s['status']) for s in steps} == {
+        ('Check Node', 'added'), ('Install', 'moved'), ('Deploy', 'moved'), ('Verify', 'moved'),
+    }
+    assert {'title': 'Install', 'section': 'A. Local Setup', 'status': 'moved', 'step': 4, 'old_step': 2} in steps
+
+
+def test_steps_with_the_same_title_stay_apart():
+    new = GUIDE.replace('Check the server logs.', 'Check the worker logs.')
+    steps = _diff(GUIDE, new)['steps']
+    assert steps == [{
+        'section': 'B. Deploy Contracts', 'title': 'Verify', 'status': 'edited',
+        'step': 5, 'old_step': 5, 'fields': ['body'],
+    }]
+
+
+def test_env_changes():
+    new = GUIDE.replace("'postgres://...'", "'postgres://db'").replace(
+        "    ['BASE_RPC_URL', 'server', 'https://sepolia.base.org'],\n", "",
+    )
+    changes = _diff(GUIDE, new)
+    assert changes['sections'] == [] and changes['steps'] == []
+    assert [(e['name'], e['status']) for e in changes['env']] == [('DATABASE_URL', 'edited'), ('BASE_RPC_URL', 'removed')]
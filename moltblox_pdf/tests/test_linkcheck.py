@@ -0,0 +1,81 @@
+"""Offline link check against a local stub server."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from moltblox_pdf import linkcheck
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # path -> (status, Location)
+    routes = {
+        '/': (200, None),
+        '/docs': (301, '/docs/'),
+        '/docs/': (200, None),
+        '/gone': (404, None),
+    }
+
+    def do_HEAD(self):
+        self.server.requests.append((self.command, self.headers['Host'], self.path))
+        if self.path == '/no-head':
+            return self._reply(405, None)
+        self._reply(*self.routes.get(self.path, (404, None)))
+
+    def do_GET(self):
+        if self.path == '/no-head':
+            self.server.requests.append((self.command, self.headers['Host'], self.path))
+            return self._reply(200, None)
+        self.do_HEAD()
+
+    def _reply(self, status, location):
+        self.send_response(status)
+        if location:
+            self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_check_offline_then_cached(stub, tmp_path):
+    resolve = linkcheck.parse_resolve([f'*=http://127.0.0.1:{stub.server_port}'])
+    urls = ['https://render.com', 'https://docs.base.org/docs', 'https://sentry.io/gone',
+            'https://faucet.quicknode.com/no-head']
+    cache_path = str(tmp_path / 'results.json')
+
+    results = linkcheck.check(urls, resolve, timeout=5, cache_path=cache_path)
+    assert results['https://render.com']['ok'] and results['https://render.com']['status'] == 200
+    redirect = results['https://docs.base.org/docs']
+    assert redirect['ok'] and redirect['final'] == 'https://docs.base.org/docs/'
+    broken = results['https://sentry.io/gone']
+    assert not broken['ok'] and broken['status'] == 404
+    assert results['https://faucet.quicknode.com/no-head']['ok']
+    assert not any(r['cached'] for r in results.values())
+    # The Host header names the real host, not the stub.
+    assert ('HEAD', 'render.com', '/') in stub.requests
+
+    seen = len(stub.requests)
+    again = linkcheck.check(urls, resolve, timeout=5, cache_path=cache_path)
+    assert all(r['cached'] for r in again.values())
+    assert len(stub.requests) == seen
+    assert {u: r['ok'] for u, r in again.items()} == {u: r['ok'] for u, r in results.items()}
+
+
+def test_results_through_resolve_are_cached_apart():
+    resolve = linkcheck.parse_resolve(['render.com=http://127.0.0.1:8000'])
+    assert linkcheck.cache_key('https://render.com', resolve) != 'https://render.com'
+    assert linkcheck.cache_key('https://sentry.io', resolve) == 'https://sentry.io'
@@ -0,0 +1,75 @@
+"""Block grouping, break planning and planned page numbers."""
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer
+
+from moltblox_pdf import paginate
+from moltblox_pdf.outline import Bookmark
+
+BODY = ParagraphStyle('Body', fontName='Helvetica', fontSize=9, leading=11)
+HEADING = ParagraphStyle('Heading', parent=BODY, fontSize=14, leading=17, keepWithNext=1)
+
+
+def _block(height, section=False):
+    block = paginate.Block([Spacer(1, height)])
+    block.height = block.top_height = height
+    block.starts_section = section
+    return block
+
+
+def test_headings_and_spacers_travel_with_the_next_flowable():
+    heading, first, second = Paragraph('B. Deploy', HEADING), Paragraph('1', BODY), Paragraph('2', BODY)
+    blocks = paginate.group_blocks([Spacer(1, 8), heading, first, second, Spacer(1, 4)])
+    assert [len(b.flowables) for b in blocks] == [3, 2]
+    assert blocks[0].starts_section and not blocks[1].starts_section
+    assert blocks[1].flowables[-1].height == 4  # trailing glue joins the last block
+
+
+def test_every_block_fits_when_each_needs_a_page():
+    assert paginate.plan_breaks([_block(60), _block(60), _block(60)], 100) == [1, 2]
+
+
+def test_an_oversized_block_still_gets_a_page():
+    assert paginate.plan_breaks([_block(20), _block(150), _block(20)], 100) == [1, 2]
+
+
+def test_breaks_prefer_section_starts():
+    # Filling the first page costs less badness, but breaking mid-section
+    # costs MID_SECTION_PENALTY on top.
+    assert paginate.plan_breaks([_block(70), _block(20, section=True), _block(20)], 100) == [1]
+    assert paginate.plan_breaks([_block(70), _block(20), _block(20)], 100) == [2]
+
+
+def test_the_last_page_may_be_short():
+    assert paginate.plan_breaks([_block(90), _block(15)], 100) == [1]
+    assert paginate.plan_breaks([_block(30), _block(30)], 100) == []
+
+
+def test_top_height_decides_whether_a_block_fits():
+    # Its leading spacer is dropped when the block opens a page.
+    tall = _block(110)
+    tall.top_height = 95
+    assert paginate.plan_breaks([_block(50), tall], 100) == [1]
+
+
+def test_assign_pages_counts_breaks_across_runs():
+    marks = [Bookmark(f'step-{i}', f'Step {i}') for i in range(4)]
+    runs = [
+        [paginate.Block([marks[0]]), paginate.Block([marks[1]])],
+        [paginate.Block([marks[2]]), paginate.Block([marks[3]])],
+    ]
+    pages = paginate._assign_pages(runs, [{1}, set()])
+    assert pages == {'step-0': 1, 'step-1': 2, 'step-2': 3, 'step-3': 3}
+    assert [m.page for m in marks] == [1, 2, 3, 3]
+
+
+def test_paginate_keeps_forced_breaks_and_plans_the_rest():
+    doc = SimpleDocTemplate(None, pagesize=letter)
+    text = ' '.join(['Copy the contract addresses from the deployment output.'] * 12)
+    story = [Paragraph(text, BODY) for _ in range(12)] + [PageBreak(), Paragraph('Appendix', BODY)]
+    planned = paginate.paginate(story, doc, cache=False)
+    breaks = [i for i, f in enumerate(planned) if isinstance(f, PageBreak)]
+    assert len(breaks) >= 2  # at least one planned break, then the forced one
+    assert isinstance(planned[-1], Paragraph) and planned[breaks[-1] + 1] is planned[-1]
+    assert [f for f in planned if isinstance(f, Paragraph)] == story[:12] + story[-1:]
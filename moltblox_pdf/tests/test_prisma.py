@@ -0,0 +1,98 @@
+"""Prisma schema parsing and the layered layout of the data-model page."""
+
+from moltblox_pdf import graph, prisma
+
+SCHEMA = '''
+generator client {
+  provider = "prisma-client-js"
+}
+
+enum Role {
+  PLAYER
+  CREATOR // can publish games
+  @@map("roles")
+}
+
+model User {
+  id      String  @id @default(cuid())
+  email   String  @unique
+  games   Game[]
+  @@map("users")
+}
+
+model Game {
+  id        String  @id
+  creatorId String
+  creator   User    @relation("Created", fields: [creatorId], references: [id], onDelete: Cascade)
+  studioId  String?
+  studio    Studio? @relation(fields: [studioId], references: [id], onDelete: SetNull)
+}
+
+model Studio {
+  id    String @id
+  games Game[]
+}
+'''
+
+
+def test_parse_reads_models_relations_and_enums(tmp_path):
+    path = tmp_path / 'schema.prisma'
+    path.write_text(SCHEMA)
+    schema = prisma.parse(str(path), str(tmp_path / 'blocks.json'))
+    assert schema['enums'] == {'Role': ['PLAYER', 'CREATOR']}
+    assert list(schema['models']) == ['User', 'Game', 'Studio']
+    user = schema['models']['User']
+    assert user['table'] == 'users'
+    assert [(f['name'], f['id'], f['unique'], f['list']) for f in user['fields']] == [
+        ('id', True, False, False), ('email', False, True, False), ('games', False, False, True),
+    ]
+    assert [(child, parent, rel['name'], rel['fields'], rel['onDelete'], rel['optional'])
+            for child, parent, rel in prisma.foreign_keys(schema)] == [
+        ('Game', 'User', 'Created', ['creatorId'], 'Cascade', False),
+        ('Game', 'Studio', None, ['studioId'], 'SetNull', True),
+    ]
+
+
+def test_parse_reuses_cached_blocks(tmp_path, monkeypatch):
+    path, cache = tmp_path / 'schema.prisma', str(tmp_path / 'blocks.json')
+    path.write_text(SCHEMA)
+    prisma.parse(str(path), cache)
+    parsed = []
+    original = prisma.parse_block
+    monkeypatch.setattr(prisma, 'parse_block', lambda *args: parsed.append(args[1]) or original(*args))
+    path.write_text(SCHEMA.replace('  id    String @id\n  games', '  id    String @id\n  name  String\n  games'))
+    schema = prisma.parse(str(path), cache)
+    assert parsed == ['Studio']
+    assert [f['name'] for f in schema['models']['Studio']['fields']] == ['id', 'name', 'games']
+
+
+def test_cycles_are_broken_and_edges_point_down():
+    nodes = ['a', 'b', 'c']
+    edges = graph.acyclic(nodes, [('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'c')])
+    assert edges == [('a', 'b'), ('b', 'c'), ('a', 'c')]
+    layer = graph.assign_layers(nodes, edges)
+    assert all(layer[u] < layer[v] for u, v in edges)
+
+
+def test_max_width_pushes_nodes_down():
+    nodes = ['root', 'a', 'b', 'c', 'd']
+    edges = [('root', n) for n in 'abcd']
+    layer = graph.assign_layers(nodes, edges, max_width=2)
+    assert sorted(layer.values()) == [0, 1, 1, 2, 2]
+
+
+def test_layout_routes_long_edges_through_dummies():
+    layout = graph.layered_layout(['a', 'b', 'c'], [('a', 'b'), ('b', 'c'), ('a', 'c')], 300, 60)
+    assert [len(level) for level in layout.layers] == [1, 2, 1]
+    route = layout.routes[('a', 'c')]
+    assert route[0] == 'a' and route[-1] == 'c' and route[1][0] == 'dummy'
+    real = [n for level in layout.layers for n in level if n in ('a', 'b', 'c')]
+    assert all(30 <= layout.x[n] <= 270 for n in real)  # boxes stay inside the width
+
+
+def test_layout_avoids_crossings_when_it_can():
+    # Two parents whose children come in crossed input order.
+    nodes = ['p', 'q', 'x', 'y']
+    layout = graph.layered_layout(nodes, [('p', 'y'), ('q', 'x')], 400, 60)
+    top, bottom = layout.layers
+    assert graph._crossings(top, bottom, [('p', 'y'), ('q', 'x')]) == 0
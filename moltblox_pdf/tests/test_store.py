@@ -0,0 +1,67 @@
+"""Locked JSON merges, atomic publishing and the LRU artifact store."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from moltblox_pdf import store
+
+
+def _add_one(args):
+    path, times = args
+    for _ in range(times):
+        store.update_json(path, lambda counts: {'n': counts.get('n', 0) + 1})
+
+
+def test_concurrent_updates_all_land(tmp_path):
+    path = str(tmp_path / 'counts.json')
+    with ProcessPoolExecutor(4) as pool:
+        list(pool.map(_add_one, [(path, 25)] * 4))
+    assert store.load_json(path) == {'n': 100}
+
+
+def test_load_json_falls_back_on_missing_or_broken_files(tmp_path):
+    broken = tmp_path / 'broken.json'
+    broken.write_text('{"n": ')
+    assert store.load_json(str(tmp_path / 'missing.json')) == {}
+    assert store.load_json(str(broken), default=[]) == []
+
+
+def test_publishing_replaces_the_output_only_on_success(tmp_path):
+    output = str(tmp_path / 'guide.pdf')
+    store.write_atomic(output, b'old')
+    with pytest.raises(RuntimeError):
+        with store.publishing(output) as target:
+            store.write_atomic(target, b'half')
+            raise RuntimeError('render failed')
+    with store.publishing(output) as target:
+        store.write_atomic(target, 'new')
+    assert open(output).read() == 'new'
+    assert os.listdir(tmp_path) == ['guide.pdf']
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    s = store.Store('test', max_bytes=25, root=str(tmp_path))
+    s.put('a', b'x' * 10)
+    s.put('b', b'x' * 10)
+    os.utime(s.path('a'), (100, 100))
+    os.utime(s.path('b'), (200, 200))
+    assert s.get('a') == b'x' * 10  # now the most recently used
+    s.put('c', b'x' * 10)
+    assert s.get('b') is None
+    assert s.get('a') is not None and s.get('c') is not None
+    assert s.counts == {'hits': 3, 'misses': 1, 'puts': 3, 'evictions': 1}
+
+
+def test_flush_merges_counts_into_the_shared_stats(tmp_path):
+    first, second = (store.Store('test', root=str(tmp_path)) for _ in range(2))
+    first.put('a', b'pdf')
+    first.get('a')
+    second.get('missing')
+    first.flush()
+    second.flush()
+    stats = first.stats()
+    assert (stats['hits'], stats['misses'], stats['puts']) == (1, 1, 1)
+    assert stats['hit_rate'] == 0.5 and stats['entries'] == 1 and stats['bytes'] == 3
+    assert not any(first.counts.values())
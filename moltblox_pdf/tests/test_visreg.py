@@ -0,0 +1,48 @@
+"""Golden-page comparison catches one-glyph changes."""
+
+import numpy as np
+import pytest
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen.canvas import Canvas
+
+from moltblox_pdf import visreg
+
+pytestmark = pytest.mark.skipif(visreg.renderer() is None, reason='needs pypdfium2 or pdftoppm')
+
+
+def _pdf(path, text):
+    c = Canvas(str(path), pagesize=letter, invariant=1)
+    c.setFont('Helvetica', 9)
+    c.drawString(72, 700, 'Copy the contract addresses from the deployment output.')
+    c.drawString(72, 686, text)
+    c.showPage()
+    c.save()
+    return str(path)
+
+
+def test_identical_pages_pass():
+    page = np.full((40, 40, 3), 255, dtype=np.uint8)
+    noisy = page.copy()
+    noisy[5, 5] -= visreg.PIXEL_TOLERANCE  # anti-aliasing wobble
+    result, _ = visreg.compare(page, noisy)
+    assert result['ok'] and result['pixels'] == 0
+
+
+def test_size_change_fails():
+    result, changed = visreg.compare(np.zeros((40, 40, 3), np.uint8), np.zeros((41, 40, 3), np.uint8))
+    assert not result['ok'] and changed is None
+
+
+def test_one_glyph_change_fails(tmp_path):
+    golden = _pdf(tmp_path / 'golden.pdf', 'Saved to step 11 on page 3.')
+    visreg.update(golden, golden_root=str(tmp_path / 'g'), jobs=1)
+
+    same = _pdf(tmp_path / 'golden.pdf', 'Saved to step 11 on page 3.')
+    results = visreg.check(same, str(tmp_path / 'g'), str(tmp_path / 'd'), jobs=1)
+    assert [r['ok'] for r in results] == [True]
+
+    _pdf(tmp_path / 'golden.pdf', 'Saved to step 12 on page 3.')
+    results = visreg.check(same, str(tmp_path / 'g'), str(tmp_path / 'd'), jobs=1)
+    assert not results[0]['ok']
+    assert results[0]['reason'] == 'local change'
+    assert results[0]['pixels'] > visreg.MAX_CHANGED_PIXELS
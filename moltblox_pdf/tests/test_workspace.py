@@ -0,0 +1,69 @@
+"""Workspace manifests and the build graph derived from them."""
+
+import json
+
+import pytest
+
+from moltblox_pdf import workspace
+
+MANIFESTS = {
+    'packages/protocol': {'name': '@moltblox/protocol', 'scripts': {'build': 'tsc'}},
+    'packages/engine': {'name': '@moltblox/engine', 'scripts': {'build': 'tsc'},
+                        'dependencies': {'@moltblox/protocol': 'workspace:*', 'zod': '^3'}},
+    'packages/tournaments': {'name': '@moltblox/tournaments', 'scripts': {'build': 'tsc'},
+                             'devDependencies': {'@moltblox/engine': 'workspace:*'}},
+    'apps/web': {'name': 'web', 'scripts': {'dev': 'next dev'},
+                 'dependencies': {'@moltblox/engine': '1.0.0', '@moltblox/protocol': 'workspace:*'}},
+}
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / workspace.WORKSPACE_FILE).write_text(
+        "packages:\n  - 'packages/*'\n  - \"apps/*\"  # apps too\n  - '!apps/legacy'\nonlyBuiltDependencies:\n  - esbuild\n"
+    )
+    for path, manifest in MANIFESTS.items():
+        (tmp_path / path).mkdir(parents=True)
+        (tmp_path / path / 'package.json').write_text(json.dumps(manifest))
+    return tmp_path
+
+
+def test_package_globs_reads_only_the_packages_list(root):
+    assert workspace.package_globs(str(root)) == ['packages/*', 'apps/*', '!apps/legacy']
+
+
+def test_internal_dependencies(root):
+    pkgs = workspace.packages(str(root), str(root / 'cache.json'))
+    assert sorted(pkgs) == ['@moltblox/engine', '@moltblox/protocol', '@moltblox/tournaments', 'web']
+    assert pkgs['@moltblox/engine']['internal'] == ['@moltblox/protocol']
+    assert pkgs['web']['internal'] == ['@moltblox/engine', '@moltblox/protocol']
+    assert pkgs['web']['path'] == 'apps/web'
+
+
+def test_unchanged_manifests_are_not_read_again(root, monkeypatch):
+    cache = str(root / 'cache.json')
+    workspace.packages(str(root), cache)
+    read = []
+    original = workspace._read_manifest
+    monkeypatch.setattr(workspace, '_read_manifest', lambda path: read.append(path) or original(path))
+    manifest = dict(MANIFESTS['apps/web'], scripts={'build': 'next build'})
+    (root / 'apps/web/package.json').write_text(json.dumps(manifest, indent=2))
+    pkgs = workspace.packages(str(root), cache)
+    assert read == [str(root / 'apps/web/package.json')]
+    assert pkgs['web']['scripts'] == ['build']
+
+
+def test_layers_closure_and_critical_path(root):
+    pkgs = workspace.packages(str(root), str(root / 'cache.json'))
+    assert workspace.build_layers(pkgs) == [
+        ['@moltblox/protocol'], ['@moltblox/engine'], ['@moltblox/tournaments', 'web'],
+    ]
+    assert workspace.closure(pkgs)['@moltblox/tournaments'] == {'@moltblox/engine', '@moltblox/protocol'}
+    # web has no build script, so the longest chain of builds ends at tournaments.
+    assert workspace.critical_path(pkgs) == ['@moltblox/protocol', '@moltblox/engine', '@moltblox/tournaments']
+
+
+def test_cycles_are_reported():
+    pkgs = {'a': {'internal': ['b']}, 'b': {'internal': ['a']}}
+    with pytest.raises(ValueError, match='cycle'):
+        workspace.topological(pkgs)
@@ -0,0 +1,300 @@
+"""
+Visual regression check for the generated PDFs.
+
+Each page is rasterized (pypdfium2 when installed, else poppler's
+pdftoppm) and compared with a golden PNG: a NumPy pixel diff decides
+pass/fail (a handful of changed pixels on a page fails it, so one glyph
+or a ticked checkbox does), and a DCT perceptual hash tells a layout shift (the page looks
+different) from local changes (a few glyphs or a colour). Pages are
+compared in parallel, one process per page; a failing page also gets a
+heatmap of where it changed.
+
+Goldens live in one directory per PDF with a manifest of per-page content
+hashes (the page dictionary with its content stream and resources, read
+with pypdf). A page whose hash matches its golden's is skipped without
+rasterizing; without pypdf every page is rasterized. A page whose hash
+changed but whose pixels still match is passed with a warning, since
+the PDF did change.
+
+    python -m moltblox_pdf.visreg MOLTBLOX_TESTNET_LAUNCH.pdf --update
+    python -m moltblox_pdf.visreg MOLTBLOX_TESTNET_LAUNCH.pdf docs/moltblox-flowcharts.pdf
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+from . import CACHE_DIR, REPO_ROOT
+
+GOLDEN_DIR = os.path.join(REPO_ROOT, 'docs', 'golden')
+DIFF_DIR = os.path.join(CACHE_DIR, 'visreg')
+MANIFEST = 'manifest.json'
+DPI = 96
+
+# A pixel counts as changed when a channel moves more than this (of 255),
+# which absorbs anti-aliasing differences; a page fails when more than
+# MAX_CHANGED_PIXELS of its pixels changed. Rasterizing the same PDF is
+# deterministic, and a single glyph at 96 dpi moves a few dozen pixels.
+PIXEL_TOLERANCE = 24
+MAX_CHANGED_PIXELS = 4
+# Perceptual-hash bits that may differ before a change counts as a layout shift.
+PHASH_TOLERANCE = 6
+_PHASH_SIZE, _PHASH_BITS = 32, 8
+
+
+def renderer():
+    """'pypdfium2', 'pdftoppm', or None when neither is available."""
+    if pypdfium2 is not None:
+        return 'pypdfium2'
+    if shutil.which('pdftoppm'):
+        return 'pdftoppm'
+    return None
+
+
+def page_count(path):
+    if pypdfium2 is not None:
+        return len(pypdfium2.PdfDocument(path))
+    if pypdf is not None:
+        return len(pypdf.PdfReader(path).pages)
+    out = subprocess.run(['pdfinfo', path], capture_output=True, text=True, check=True).stdout
+    return int(next(line.split()[-1] for line in out.splitlines() if line.startswith('Pages:')))
+
+
+def rasterize(path, index, dpi=DPI):
+    """Page `index` (0-based) of `path` as an RGB uint8 array."""
+    if pypdfium2 is not None:
+        page = pypdfium2.PdfDocument(path)[index]
+        return np.asarray(page.render(scale=dpi / 72).to_pil().convert('RGB'))
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, 'page')
+        subprocess.run(
+            ['pdftoppm', '-f', str(index + 1), '-l', str(index + 1), '-r', str(dpi), '-png', '-singlefile',
+             path, prefix],
+            check=True,
+        )
+        with Image.open(prefix + '.png') as im:
+            return np.asarray(im.convert('RGB'))
+
+
+def _feed(h, obj, memo, root=False):
+    # Hash a PDF object graph, stopping at other pages (link destinations).
+    if isinstance(obj, pypdf.generic.IndirectObject):
+        key = (obj.idnum, obj.generation)
+        if key not in memo:
+            memo[key] = None  # cycle guard
+            sub = hashlib.sha256()
+            _feed(sub, obj.get_object(), memo)
+            memo[key] = sub.digest()
+        h.update(memo[key] or b'cycle')
+        return
+    if isinstance(obj, pypdf.generic.DictionaryObject):
+        if not root and obj.get('/Type') == '/Page':
+            h.update(b'page')
+            return
+        if isinstance(obj, pypdf.generic.StreamObject):
+            h.update(obj.get_data())
+        for key in sorted(obj):
+            if key in ('/Parent', '/Length', '/Filter'):
+                continue
+            h.update(key.encode())
+            _feed(h, obj[key], memo)
+        return
+    if isinstance(obj, pypdf.generic.ArrayObject):
+        for item in obj:
+            _feed(h, item, memo)
+        return
+    h.update(repr(obj).encode())
+
+
+def content_hashes(path):
+    """Per-page content hashes, or None without pypdf."""
+    if pypdf is None:
+        return None
+    memo = {}
+    hashes = []
+    for page in pypdf.PdfReader(path).pages:
+        h = hashlib.sha256()
+        _feed(h, page, memo, root=True)
+        hashes.append(h.hexdigest())
+    return hashes
+
+
+def _dct_matrix(n):
+    k = np.arange(n)
+    m = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n))
+    m[0] /= np.sqrt(2)
+    return m
+
+
+def phash(pixels):
+    """64-bit DCT perceptual hash of an RGB array, as a bool array."""
+    gray = Image.fromarray(pixels).convert('L').resize((_PHASH_SIZE, _PHASH_SIZE), Image.LANCZOS)
+    d = _dct_matrix(_PHASH_SIZE)
+    coeffs = d @ np.asarray(gray, dtype=float) @ d.T
+    low = coeffs[:_PHASH_BITS, :_PHASH_BITS].ravel()[1:]  # drop the DC term
+    return low > np.median(low)
+
+
+def heatmap(golden, actual, changed):
+    """Dimmed golden page with changed pixels in red, scaled by how much they moved."""
+    base = np.asarray(Image.fromarray(golden).convert('L'), dtype=float) * 0.35
+    out = np.repeat(base[:, :, None], 3, axis=2)
+    strength = np.abs(actual.astype(np.int16) - golden.astype(np.int16)).max(axis=2) / 255
+    out[changed, 0] = 255
+    out[changed, 1] = out[changed, 1] * (1 - strength[changed])
+    out[changed, 2] = out[changed, 2] * (1 - strength[changed])
+    return Image.fromarray(out.astype(np.uint8))
+
+
+def compare(golden, actual, max_pixels=MAX_CHANGED_PIXELS):
+    """Diff stats for two RGB arrays; `changed` is the per-pixel mask."""
+    if golden.shape != actual.shape:
+        return {'ok': False, 'reason': f'size {actual.shape[1]}x{actual.shape[0]}, '
+                                       f'golden {golden.shape[1]}x{golden.shape[0]}'}, None
+    delta = np.abs(actual.astype(np.int16) - golden.astype(np.int16)).max(axis=2)
+    changed = delta > PIXEL_TOLERANCE
+    pixels = int(np.count_nonzero(changed))
+    distance = int(np.count_nonzero(phash(golden) != phash(actual)))
+    ok = pixels <= max_pixels
+    reason = None if ok else ('layout shift' if distance > PHASH_TOLERANCE else 'local change')
+    return {'ok': ok, 'reason': reason, 'changed': float(changed.mean()), 'pixels': pixels,
+            'phash_distance': distance}, changed
+
+
+def _check_page(task):
+    path, index, golden_path, diff_path, dpi, max_pixels, hash_changed = task
+    if not os.path.exists(golden_path):
+        return {'page': index + 1, 'ok': False, 'reason': 'no golden'}
+    actual = rasterize(path, index, dpi)
+    with Image.open(golden_path) as im:
+        golden = np.asarray(im.convert('RGB'))
+    result, changed = compare(golden, actual, max_pixels)
+    result['page'] = index + 1
+    if result['ok'] and hash_changed:
+        result['warning'] = 'content changed but pixels match'
+    if not result['ok'] and changed is not None:
+        os.makedirs(os.path.dirname(diff_path), exist_ok=True)
+        heatmap(golden, actual, changed).save(diff_path)
+        result['heatmap'] = diff_path
+    return result
+
+
+def _render_page(task):
+    path, index, golden_path, dpi = task
+    Image.fromarray(rasterize(path, index, dpi)).save(golden_path, optimize=True)
+    return golden_path
+
+
+def _golden_dir(path, golden_root):
+    return os.path.join(golden_root, os.path.splitext(os.path.basename(path))[0])
+
+
+def _page_png(directory, index, suffix=''):
+    return os.path.join(directory, f'page-{index + 1:03d}{suffix}.png')
+
+
+def _load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def update(path, golden_root=GOLDEN_DIR, dpi=DPI, jobs=None):
+    """Record the pages of `path` as its goldens."""
+    directory = _golden_dir(path, golden_root)
+    os.makedirs(directory, exist_ok=True)
+    count = page_count(path)
+    for name in os.listdir(directory):
+        if name.startswith('page-') and name.endswith('.png'):
+            os.remove(os.path.join(directory, name))
+    with ProcessPoolExecutor(jobs) as pool:
+        list(pool.map(_render_page, [(path, i, _page_png(directory, i), dpi) for i in range(count)]))
+    manifest = {'dpi': dpi, 'pages': count, 'hashes': content_hashes(path)}
+    with open(os.path.join(directory, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return directory
+
+
+def check(path, golden_root=GOLDEN_DIR, diff_root=DIFF_DIR, jobs=None, max_pixels=MAX_CHANGED_PIXELS):
+    """Per-page results for `path` against its goldens."""
+    directory = _golden_dir(path, golden_root)
+    manifest = _load_manifest(directory)
+    dpi = manifest.get('dpi', DPI)
+    count = page_count(path)
+    hashes = content_hashes(path) or [None] * count
+    golden_hashes = manifest.get('hashes') or []
+    diffs = _golden_dir(path, diff_root)
+
+    results, tasks = [], []
+    for i in range(count):
+        if hashes[i] is not None and i < len(golden_hashes) and hashes[i] == golden_hashes[i]:
+            results.append({'page': i + 1, 'ok': True, 'reason': 'unchanged', 'skipped': True})
+        else:
+            hash_changed = hashes[i] is not None and i < len(golden_hashes)
+            tasks.append((path, i, _page_png(directory, i), _page_png(diffs, i, '.diff'), dpi, max_pixels,
+                          hash_changed))
+    if tasks:
+        with ProcessPoolExecutor(min(jobs or os.cpu_count() or 1, len(tasks))) as pool:
+            results.extend(pool.map(_check_page, tasks))
+    for i in range(count, manifest.get('pages', 0)):
+        results.append({'page': i + 1, 'ok': False, 'reason': 'page missing'})
+    return sorted(results, key=lambda r: r['page'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare generated PDFs with golden page images.')
+    parser.add_argument('pdfs', nargs='+', metavar='PDF')
+    parser.add_argument('--golden', default=GOLDEN_DIR, help='golden image root (default: %(default)s)')
+    parser.add_argument('--diffs', default=DIFF_DIR, help='where heatmaps of failing pages go')
+    parser.add_argument('--update', action='store_true', help='record the current pages as the goldens')
+    parser.add_argument('--dpi', type=int, default=DPI, help='rasterization resolution for --update')
+    parser.add_argument('--max-pixels', type=int, default=MAX_CHANGED_PIXELS,
+                        help='changed pixels a page may have and still pass (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: one per CPU)')
+    args = parser.parse_args(argv)
+
+    if renderer() is None:
+        parser.error('rasterizing needs pypdfium2 (pip install pypdfium2) or poppler-utils (pdftoppm)')
+    failed = 0
+    for path in args.pdfs:
+        if args.update:
+            print(f'Updated: {update(path, args.golden, args.dpi, args.jobs)}')
+            continue
+        results = check(path, args.golden, args.diffs, args.jobs, args.max_pixels)
+        bad = [r for r in results if not r['ok']]
+        skipped = sum(1 for r in results if r.get('skipped'))
+        warned = [r for r in results if r.get('warning')]
+        for r in bad:
+            detail = f" ({r['pixels']} pixels, phash {r['phash_distance']})" if 'pixels' in r else ''
+            where = f" -> {r['heatmap']}" if 'heatmap' in r else ''
+            print(f"FAIL {path} page {r['page']}: {r['reason']}{detail}{where}")
+        for r in warned:
+            print(f"WARN {path} page {r['page']}: {r['warning']} ({r['pixels']} pixels)")
+        print(f'{path}: {len(results)} pages, {skipped} unchanged, {len(warned)} warned, {len(bad)} failed')
+        failed += len(bad)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+pnpm workspace packages and their internal dependency graph.
+
+Package globs come from pnpm-workspace.yaml; every matching package.json
+is read on a thread pool, and the parsed summary (name, internal
+dependencies, scripts) is cached by file mtime and size, so a rebuild
+only re-reads manifests that changed.
+
+From the graph: the transitive closure (everything a package waits on),
+build layers (what `turbo build` with dependsOn ^build can run together)
+and the critical path, the longest chain of packages with a build step.
+"""
+
+import glob
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from . import CACHE_DIR, REPO_ROOT, store
+
+WORKSPACE_FILE = 'pnpm-workspace.yaml'
+MANIFEST_CACHE_PATH = os.path.join(CACHE_DIR, 'workspace', 'manifests.json')
+
+_DEP_FIELDS = ('dependencies', 'devDependencies', 'peerDependencies', 'optionalDependencies')
+
+
+def package_globs(root=REPO_ROOT):
+    """The `packages:` list of pnpm-workspace.yaml (a flat list of globs)."""
+    globs, in_packages = [], False
+    with open(os.path.join(root, WORKSPACE_FILE)) as f:
+        for line in f:
+            stripped = line.split('#', 1)[0].rstrip()
+            if not stripped:
+                continue
+            if not line[0].isspace():
+                in_packages = stripped == 'packages:'
+            elif in_packages and stripped.lstrip().startswith('- '):
+                globs.append(stripped.lstrip()[2:].strip().strip('"\''))
+    return globs
+
+
+def manifest_paths(root=REPO_ROOT):
+    paths = []
+    for pattern in package_globs(root):
+        if pattern.startswith('!'):
+            continue
+        for directory in sorted(glob.glob(os.path.join(root, pattern))):
+            path = os.path.join(directory, 'package.json')
+            if os.path.isfile(path):
+                paths.append(path)
+    return paths
+
+
+def _read_manifest(path):
+    with open(path) as f:
+        data = json.load(f)
+    deps = {}
+    for field in _DEP_FIELDS:
+        deps.update(data.get(field) or {})
+    return {
+        'name': data.get('name') or os.path.basename(os.path.dirname(path)),
+        'version': data.get('version'),
+        'private': bool(data.get('private')),
+        'scripts': sorted(data.get('scripts') or {}),
+        'deps': sorted(deps),
+    }
+
+
+def packages(root=REPO_ROOT, cache_path=MANIFEST_CACHE_PATH):
+    """{package name: manifest summary} for every workspace package.
+
+    Each summary's `internal` lists the workspace packages it depends on.
+    """
+    paths = manifest_paths(root)
+    cache = store.load_json(cache_path)
+    fresh, stale = {}, []
+    for path in paths:
+        st = os.stat(path)
+        stamp = [st.st_mtime_ns, st.st_size]
+        rel = os.path.relpath(path, root)
+        entry = cache.get(rel)
+        if entry and entry['stamp'] == stamp:
+            fresh[rel] = entry
+        else:
+            stale.append((rel, path, stamp))
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=min(8, len(stale))) as pool:
+            manifests = pool.map(_read_manifest, [path for _, path, _ in stale])
+            for (rel, _, stamp), manifest in zip(stale, manifests):
+                fresh[rel] = {'stamp': stamp, 'manifest': manifest}
+    if stale or fresh.keys() != cache.keys():
+        store.update_json(cache_path, lambda current: fresh)
+
+    pkgs = {}
+    for rel in sorted(fresh):
+        manifest = dict(fresh[rel]['manifest'], path=os.path.dirname(rel))
+        pkgs[manifest['name']] = manifest
+    # Internal edges: any dependency (workspace: or versioned) naming a package here.
+    for manifest in pkgs.values():
+        manifest['internal'] = [d for d in manifest['deps'] if d in pkgs and d != manifest['name']]
+    return pkgs
+
+
+def topological(pkgs):
+    """Package names with every dependency before its dependents."""
+    order, state = [], {}
+
+    def visit(name):
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f'workspace dependency cycle through {name}')
+        state[name] = 1
+        for dep in pkgs[name]['internal']:
+            visit(dep)
+        state[name] = 2
+        order.append(name)
+
+    for name in sorted(pkgs):
+        visit(name)
+    return order
+
+
+def closure(pkgs):
+    """{package: set of every package it transitively depends on}."""
+    upstream = {}
+    for name in topological(pkgs):
+        deps = set(pkgs[name]['internal'])
+        for dep in pkgs[name]['internal']:
+            deps |= upstream[dep]
+        upstream[name] = deps
+    return upstream
+
+
+def build_layers(pkgs):
+    """Lists of packages that can build in parallel, in build order."""
+    layer = {}
+    for name in topological(pkgs):
+        layer[name] = max((layer[d] + 1 for d in pkgs[name]['internal']), default=0)
+    layers = [[] for _ in range(max(layer.values(), default=-1) + 1)]
+    for name in sorted(layer):
+        layers[layer[name]].append(name)
+    return layers
+
+
+def critical_path(pkgs):
+    """Longest dependency chain, counting only packages with a build script."""
+    best = {}
+    for name in topological(pkgs):
+        cost = 1 if 'build' in pkgs[name]['scripts'] else 0
+        prev = max(pkgs[name]['internal'], key=lambda d: best[d][0], default=None)
+        best[name] = (cost + (best[prev][0] if prev else 0), prev)
+    if not best:
+        return []
+    name = max(sorted(best), key=lambda n: best[n][0])
+    path = []
+    while name:
+        path.append(name)
+        name = best[name][1]
+    return path[::-1]